@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Measure what one dead host costs a dashboard run.
+
+Starts a local "black hole" server that accepts connections but never
+answers, and a normal local HTTP server. A dead fetch (aiohttp timeout, then
+urllib fallback) runs alongside a healthy fetcher doing sequential requests,
+the way NewsFetcher walks its feeds. Compares the old inline urllib fallback
+with the executor-based one in DataFetcher.fetch_url.
+
+Usage: python bench_fetch_fallback.py [timeout_seconds]
+"""
+
+import asyncio
+import socket
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from commodities_dashboard import DataFetcher
+from http_client import create_session
+
+
+class InlineFallbackFetcher(DataFetcher):
+    """fetch_url as it was: urllib called directly inside the coroutine"""
+
+    async def fetch_url(self, url: str, timeout: int = 30):
+        try:
+            return await self.http.get_text(url, timeout=timeout)
+        except Exception:
+            pass
+        try:
+            req = urllib.request.Request(url, headers=self.headers)
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                return response.read().decode('utf-8') if response.status == 200 else None
+        except Exception:
+            return None
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(0.05)  # a quick but real upstream
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_servers():
+    black_hole = socket.socket()
+    black_hole.bind(("127.0.0.1", 0))
+    black_hole.listen(64)  # accepts into the backlog, never replies
+
+    ok_server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    threading.Thread(target=ok_server.serve_forever, daemon=True).start()
+    return black_hole, ok_server
+
+
+async def run_once(fetcher_cls, dead_url, ok_url: str, timeout: float, requests: int) -> float:
+    async with create_session() as session:
+        dead = fetcher_cls(session)
+        healthy = fetcher_cls(session)
+
+        async def healthy_run():
+            # Distinct URLs: a repeated one would be served from the run's flight
+            for n in range(requests):
+                await healthy.fetch_url(f"{ok_url}?i={n}", timeout=timeout)
+
+        start = time.perf_counter()
+        if dead_url:
+            await asyncio.gather(dead.fetch_url(dead_url, timeout=timeout), healthy_run())
+        else:
+            await healthy_run()
+        return time.perf_counter() - start
+
+
+def main():
+    timeout = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    black_hole, ok_server = start_servers()
+    dead_url = f"http://127.0.0.1:{black_hole.getsockname()[1]}/dead"
+    ok_url = f"http://127.0.0.1:{ok_server.server_address[1]}/ok"
+
+    # Size the healthy workload to ~2.5x the timeout, so it outlasts the
+    # dead fetch (aiohttp timeout + urllib timeout) on its own
+    probe = asyncio.run(run_once(DataFetcher, None, ok_url, timeout, 10)) / 10
+    requests = max(1, int(timeout * 2.5 / probe))
+    baseline = asyncio.run(run_once(DataFetcher, None, ok_url, timeout, requests))
+
+    inline = asyncio.run(run_once(InlineFallbackFetcher, dead_url, ok_url, timeout, requests))
+    executor = asyncio.run(run_once(DataFetcher, dead_url, ok_url, timeout, requests))
+
+    print(f"timeout per transport: {timeout:.1f}s, healthy work: {requests} requests")
+    print(f"healthy fetcher alone:    {baseline:.2f}s")
+    print(f"+ dead host, inline:      {inline:.2f}s")
+    print(f"+ dead host, executor:    {executor:.2f}s")
+    ok_server.shutdown()
+    black_hole.close()
+
+
+if __name__ == "__main__":
+    main()
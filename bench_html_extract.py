@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Measure the cost of pulling the curve anchors out of large HTML pages.
+
+Compares the original whole-document regexes of the EIA Weekly, LNG Price
+Index and Constellation scrapers with the bounded-scan extractors in
+html_extract: first on the parse alone, then end to end through HttpClient
+against a local server, where the extractor stops reading once it has its
+values. Synthetic pages are a few MB of markup with many near-miss anchors
+(the phrase without a price after it) and the values either near the top
+or at the very end. Saved copies of the real pages can be passed instead,
+as files or a directory.
+
+Usage: python bench_html_extract.py [page_size_mb] [saved_page ...]
+"""
+
+import asyncio
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from html_extract import CONSTELLATION, EIA_WEEKLY, LNG_PRICE_INDEX
+from http_client import HttpClient, create_session
+
+# The scrapers' regexes before html_extract
+OLD_PATTERNS = {
+    EIA_WEEKLY: [
+        re.compile(r'Title Transfer Facility.*?\$[\d.]+/MMBtu to a weekly average of \$([\d.]+)/MMBtu',
+                   re.IGNORECASE | re.DOTALL),
+        re.compile(r'East Asia.*?\$[\d.]+/MMBtu to a weekly average of \$([\d.]+)/MMBtu',
+                   re.IGNORECASE | re.DOTALL)
+    ],
+    LNG_PRICE_INDEX: [re.compile(r'JKM\s*\$([\d.]+)'), re.compile(r'TTF\s*\$([\d.]+)')],
+    CONSTELLATION: [re.compile(r'TTF \(EU LNG\) prompt settled \$([\d.]+)/MMbtu'),
+                    re.compile(r'JKM \(Asia LNG\) prompt settled at \$([\d.]+)/MMbtu')]
+}
+
+FILLER = '<div class="row"><span class="cell">Lorem ipsum dolor sit amet</span></div>\n'
+NEAR_MISSES = {
+    EIA_WEEKLY: '<p>Title Transfer Facility and East Asia prices are discussed below.</p>\n',
+    LNG_PRICE_INDEX: '<a href="/jkm-ttf">JKM vs TTF spread explained</a>\n',
+    CONSTELLATION: '<li>TTF (EU LNG) prompt settled lower on storage</li>\n'
+}
+VALUES = {
+    EIA_WEEKLY: ('<p>At the Title Transfer Facility, the front-month contract increased $0.42/MMBtu '
+                 'to a weekly average of $11.85/MMBtu. In East Asia, the front-month contract fell '
+                 '$0.10/MMBtu to a weekly average of $12.40/MMBtu.</p>\n'),
+    LNG_PRICE_INDEX: '<div class="ticker">JKM $12.55 | TTF $11.70</div>\n',
+    CONSTELLATION: ('<li>TTF (EU LNG) prompt settled $11.62/MMbtu</li>\n'
+                    '<li>JKM (Asia LNG) prompt settled at $12.31/MMbtu</li>\n')
+}
+NAMES = {EIA_WEEKLY: 'eia', LNG_PRICE_INDEX: 'lng_index', CONSTELLATION: 'constellation'}
+
+
+def synthetic_page(extractor, size: int, late: bool = False) -> str:
+    """~size characters of filler with a near-miss anchor every 50 rows; the
+    values come after the first 200 rows, or at the very end when late"""
+    rows = max(1, size // len(FILLER))
+    filler = ''.join(FILLER * 50 + NEAR_MISSES[extractor] for _ in range(0, rows, 50))
+    if late:
+        return '<html><body>\n' + filler + VALUES[extractor] + '</body></html>\n'
+    return '<html><body>\n' + FILLER * 200 + VALUES[extractor] + filler + '</body></html>\n'
+
+
+def old_extract(extractor, html: str):
+    found = {}
+    for target, pattern in zip(extractor.targets, OLD_PATTERNS[extractor]):
+        match = pattern.search(html)
+        if match:
+            found[target.name] = match.group(1)
+    return found
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    pages = {}
+
+    def do_GET(self):
+        body = self.pages[self.path].encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            # Trickle like a real upstream, so reading less shows in the time
+            for i in range(0, len(body), 65536):
+                self.wfile.write(body[i:i + 65536])
+                time.sleep(0.002)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the streaming client hung up once it had its values
+
+    def log_message(self, *args):
+        pass
+
+
+async def fetch_times(url: str, extractor):
+    async with create_session() as session:
+        http = HttpClient(session)
+        start = time.perf_counter()
+        old_extract(extractor, await http.get_text(url))
+        full = time.perf_counter() - start
+
+        http.begin_run()
+        start = time.perf_counter()
+        await http.extract(url, extractor)
+        streamed = time.perf_counter() - start
+    return full, streamed
+
+
+def saved_pages(args):
+    """[(label, extractor, html)] for saved pages; the extractor is guessed from the file name"""
+    paths = []
+    for arg in args:
+        path = Path(arg)
+        paths.extend(sorted(path.glob('*.htm*')) if path.is_dir() else [path])
+    pages = []
+    for path in paths:
+        name = path.name.lower()
+        extractor = (EIA_WEEKLY if 'eia' in name else
+                     CONSTELLATION if 'constellation' in name else LNG_PRICE_INDEX)
+        pages.append((path.name, extractor, path.read_text(encoding='utf-8', errors='replace')))
+    return pages
+
+
+def main():
+    size = int(float(sys.argv[1]) * 1024 * 1024) if len(sys.argv) > 1 else 4 * 1024 * 1024
+    pages = saved_pages(sys.argv[2:]) or [(f"{NAMES[e]} (values {where})", e, synthetic_page(e, size, where == 'late'))
+                                          for where in ('early', 'late')
+                                          for e in (EIA_WEEKLY, LNG_PRICE_INDEX, CONSTELLATION)]
+
+    print("parse only (best of 3):")
+    for label, extractor, html in pages:
+        old = best_of(lambda: old_extract(extractor, html))
+        new = best_of(lambda: extractor.extract(html))
+        same = "same values" if old_extract(extractor, html) == extractor.extract(html) else "VALUES DIFFER"
+        print(f"  {label:32s} {len(html) / 1e6:6.1f} MB  regex {old * 1000:8.1f} ms  "
+              f"bounded {new * 1000:7.1f} ms  ({same})")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    print("fetch + parse over local HTTP:")
+    for i, (label, extractor, html) in enumerate(pages):
+        PageHandler.pages[f"/{i}"] = html
+        full, streamed = asyncio.run(fetch_times(f"{base}/{i}", extractor))
+        print(f"  {label:32s} get_text + regex {full * 1000:8.1f} ms  "
+              f"streamed extract {streamed * 1000:7.1f} ms")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
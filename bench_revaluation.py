@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Time the scenario revaluation of a large book.
+
+Builds a random book across the four curve commodities on synthetic
+monthly curves and revalues it under the default parallel x twist x
+seasonal grid (or a grid of about the requested size), reporting the time
+to build the exposures and to revalue every position under every scenario.
+
+Usage: python bench_revaluation.py [positions] [scenarios]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from forward_curve import ContractCalendar, ForwardCurve, period_months
+from revaluation import BookRevaluer, Position, ShockGrid
+
+COMMODITIES = {'brent': 75.0, 'henry_hub': 3.5, 'ttf': 35.0, 'jkm': 12.0}
+PERIODS = ['27Q1', '27Q2', '27Q3', '27Q4', '27Sum', '27Win', '27Cal', '28Q1', '28Q2', '28Cal']
+
+
+def synthetic_book(count: int, rng: np.random.Generator):
+    calendar = ContractCalendar.covering(PERIODS)
+    curves = {}
+    for commodity, level in COMMODITIES.items():
+        season = np.cos(2 * np.pi * (calendar.ordinals % 12) / 12)
+        curves[commodity] = ForwardCurve(calendar, level * (1 + 0.1 * season + 0.002 * np.arange(len(calendar))))
+    months = [f"{y}-{m:02d}" for period in PERIODS for y, m in period_months(period)]
+    tenors = PERIODS + sorted(set(months))
+    names = list(COMMODITIES)
+    positions = [Position(names[rng.integers(len(names))], tenors[rng.integers(len(tenors))],
+                          float(rng.normal(0, 10000)), id=str(i))
+                 for i in range(count)]
+    return positions, curves
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    scenarios = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    rng = np.random.default_rng(7)
+    positions, curves = synthetic_book(count, rng)
+    if scenarios:
+        side = max(1, round(scenarios ** (1 / 3)))
+        shocks = ShockGrid.grid(np.linspace(-0.5, 0.5, side), np.linspace(-0.2, 0.2, side),
+                                np.linspace(-0.15, 0.15, max(1, scenarios // (side * side))))
+    else:
+        shocks = ShockGrid.grid()
+
+    start = time.perf_counter()
+    revaluer = BookRevaluer(positions, curves)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    result = revaluer.revalue(shocks)
+    revalued = time.perf_counter() - start
+    start = time.perf_counter()
+    result.to_dict()
+    summarised = time.perf_counter() - start
+
+    print(f"{len(positions)} positions x {len(shocks)} scenarios "
+          f"({len(positions) * len(shocks) / 1e6:.0f}M position revaluations)")
+    print(f"build exposures:  {built * 1000:8.1f} ms")
+    print(f"revalue grid:     {revalued * 1000:8.1f} ms")
+    print(f"JSON summary:     {summarised * 1000:8.1f} ms")
+    print(f"worst book P&L:   {result.pnl.min():,.0f}")
+
+
+if __name__ == "__main__":
+    main()
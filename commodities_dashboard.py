@@ -4,19 +4,37 @@ Commodities Dashboard Scraper Agent
 Fetches oil, gas, power prices, FX rates, and news headlines
 """
 
+import argparse
 import json
 import logging
 import asyncio
-import re
-import socket
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 import aiohttp
 import feedparser
+import numpy as np
 import xml.etree.ElementTree as ET
 from bs4 import BeautifulSoup
 
+from fred import FRED_SERIES, FredSeriesReader
+from forward_curve import ContractCalendar, ForwardCurve
+from curve_store import CurveSnapshotStore
+from futures_curve import STRIP_CONCURRENCY, FuturesCurveBuilder, trading_date
+from hedging import DEFAULT_HEDGE_DELAY, hedged, prioritized
+from html_extract import CONSTELLATION, EIA_WEEKLY, LNG_PRICE_INDEX, parse_price
+from data_graph import DataGraph
+from http_client import Deadline, HttpClient, ValidatorCache, create_session, fallback_get_text, headers_key
+from jepx import JepxDayAhead, JepxIngester, rows_from_text
+from last_known_good import MAX_STALENESS_DAYS, LastKnownGood
+from price_series import CHANGE_LOOKBACKS, PriceSeries
+from price_store import PriceStore, date_timestamp, day_start
+from reconcile import Reconciliation, ReconciliationLog, reconcile
+from revaluation import BOOK_FILE, latest_curves, load_book, revalue_book
+from source_health import CircuitOpenError, SourceHealth
+from yahoo_quotes import CHART_URL, QuoteSeries, YahooChartClient
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -28,44 +46,91 @@ logger = logging.getLogger(__name__)
 class DataFetcher:
     """Base class for data fetching"""
     
-    def __init__(self, session: aiohttp.ClientSession):
+    # Run-wide registry of shared data nodes (spot quotes, FX, ...), set by main()
+    graph: Optional[DataGraph] = None
+    # Where cross-source price disagreements are recorded, set by main()
+    reconciliation_log: Optional[ReconciliationLog] = None
+    
+    def __init__(self, session: aiohttp.ClientSession, http: Optional[HttpClient] = None,
+                 store: Optional[PriceStore] = None):
         self.session = session
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        # Shared conditional-GET client; main() passes one backed by the validator cache
+        self.http = http or HttpClient(session, headers=self.headers)
+        # Local price history, shared by all fetchers in a run
+        self.store = store or PriceStore()
+        # Real values served when a live source fails; main() shares one instance
+        self.last_known = LastKnownGood(self.store)
+        # Incremental FRED history; main() shares one instance so every
+        # series is requested once per run, through one transport
+        self.fred = FredSeriesReader(self.fetch_url, self.store)
+    
+    def series(self, symbol: str) -> PriceSeries:
+        """Stored history for symbol as a columnar NumPy series"""
+        return PriceSeries.from_store(self.store, symbol)
+    
+    def _hedge_delay(self, url: str) -> float:
+        """How long to give url before hedging it: its observed p90 latency"""
+        p90 = self.http.health.percentile(url, 90) if self.http.health else None
+        return p90 if p90 is not None else DEFAULT_HEDGE_DELAY
+    
+    async def shared(self, name: str) -> Any:
+        """Value of a data node computed once for the whole run, None if there
+        is no graph or the node failed"""
+        if self.graph is None or name not in self.graph.nodes:
+            return None
+        return await self.graph.get_or_none(name)
     
-    async def fetch_url(self, url: str, timeout: int = 30) -> Optional[str]:
-        """Fetch URL content with error handling - falls back to urllib if aiohttp DNS fails"""
-        # Try aiohttp first
+    async def fetch_url(self, url: str, timeout: int = 30, fallback: bool = True) -> Optional[str]:
+        """Fetch URL content with error handling - falls back to urllib if aiohttp DNS fails
+
+        Fetchers share one HttpClient per run, so concurrent or repeated
+        requests for the same URL and headers make a single attempt. A failed
+        attempt returns None but isn't remembered: a later call tries again.
+        fallback=False skips urllib, for bulk requests that would only queue
+        up in its small pool.
+        """
         try:
-            async with self.session.get(url, headers=self.headers, timeout=timeout) as response:
-                if response.status == 200:
-                    return await response.text()
-                else:
-                    logger.warning(f"Failed to fetch {url}: Status {response.status}")
-                    return None
+            return await self.http.flights.do(('fetch_url', url, headers_key(self.headers), fallback),
+                                              lambda: self._fetch_url(url, timeout, fallback))
+        except Exception:
+            return None
+    
+    async def _fetch_url(self, url: str, timeout: int, fallback: bool = True) -> Optional[str]:
+        """Body of url, None for a non-200 answer; raises when neither transport
+        got an answer (or the source's breaker is open)"""
+        # Try aiohttp first (304 Not Modified is answered from the validator cache)
+        try:
+            return await self.http.get_text(url, timeout=timeout)
+        except CircuitOpenError as e:
+            # Known-broken source: skip it outright rather than retry over urllib
+            logger.info(f"Skipping {url}: {e}")
+            raise
         except Exception as e:
+            if not fallback:
+                logger.warning(f"aiohttp failed for {url}: {str(e)[:50] or type(e).__name__}")
+                raise
             logger.warning(f"aiohttp failed for {url}: {str(e)[:50]}... trying urllib fallback")
         
-        # Fallback to urllib (uses system DNS which works)
+        # Fallback to urllib (uses system DNS which works), on a worker thread
+        # so a dead host doesn't stall the other fetchers in main()'s gather
         try:
-            import urllib.request
-            req = urllib.request.Request(url, headers=self.headers)
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                if response.status == 200:
-                    return response.read().decode('utf-8')
-                else:
-                    return None
+            if self.http.deadline:
+                timeout = self.http.deadline.clamp(timeout)
+            return await fallback_get_text(url, timeout=timeout, headers=self.headers)
         except Exception as e2:
-            logger.error(f"urllib fallback also failed for {url}: {str(e2)[:50]}")
-            return None
+            logger.error(f"urllib fallback also failed for {url}: {str(e2)[:50] or type(e2).__name__}")
+            raise
 
 
 class ForexFetcher(DataFetcher):
     """Fetch FX rates from free sources"""
     
-    def __init__(self, session: aiohttp.ClientSession):
-        super().__init__(session)
+    def __init__(self, session: aiohttp.ClientSession, http: Optional[HttpClient] = None,
+                 store: Optional[PriceStore] = None):
+        super().__init__(session, http, store)
         self.rates_file = Path(__file__).parent / "fx_rates_history.json"
     
     def _load_previous_rates(self) -> Dict[str, float]:
@@ -93,15 +158,19 @@ class ForexFetcher(DataFetcher):
             logger.warning(f"Failed to save FX rates snapshot: {e}")
     
     def _calculate_change_pct(self, pair: str, current_rate: float, previous_rates: Dict[str, float]) -> float:
-        """Calculate real daily % change vs previous snapshot"""
+        """Calculate real daily % change vs the previous day in local history,
+        falling back to the previous snapshot until history exists"""
+        daily = self.series(pair).change_since(days=CHANGE_LOOKBACKS['dod'])
+        if daily:
+            return round(daily[1], 2)
         prev_rate = previous_rates.get(pair)
         if prev_rate and prev_rate > 0:
             change_pct = ((current_rate - prev_rate) / prev_rate) * 100
             return round(change_pct, 2)
         return 0.0  # No previous data = 0% change
     
-    async def fetch_rates(self, base_currencies: List[str]) -> Dict[str, Any]:
-        """Fetch current FX rates - USD-based pairs only"""
+    async def fetch_rates(self, base_currencies: List[str]) -> Optional[Dict[str, Any]]:
+        """Fetch current FX rates - USD-based pairs only (None if no rate is available)"""
         rates = {}
         
         # Load previous rates for % change calculation
@@ -112,208 +181,286 @@ class ForexFetcher(DataFetcher):
         if api_data:
             rates.update(api_data)
         
-        # Save current snapshot for next run
-        if rates:
+        if not rates:
+            return None
+        
+        # Save current snapshot for next run (live rates only)
+        if not any(details.get('stale') for details in rates.values()):
             self._save_current_rates(rates)
         
         return {
             "timestamp": datetime.now().isoformat(),
             "rates": rates,
-            "base": "USD"
+            "base": "USD",
+            # Last known rates only: the scheduler keeps a cached copy over this
+            "live": not all(details.get('stale') for details in rates.values())
         }
     
-    async def _fetch_exchangerate_api(self, previous_rates: Dict[str, float]) -> Optional[Dict]:
-        """Fetch from free ExchangeRate API with backup source"""
-        
-        # Try primary API first
-        url = "https://api.exchangerate-api.com/v4/latest/USD"
+    FX_CURRENCIES = ['EUR', 'JPY', 'SGD', 'CNY']
+    FX_PRIMARY_URL = "https://api.exchangerate-api.com/v4/latest/USD"
+    FX_BACKUP_URL = "https://api.exchangerate.host/latest?base=USD&symbols=EUR,JPY,SGD,CNY"
+    
+    async def _fetch_usd_rates(self, url: str, source: str) -> Optional[Tuple[str, Dict[str, float]]]:
+        """(source, {pair: rate}) from one USD-based rates API, None on failure"""
         content = await self.fetch_url(url)
+        if not content:
+            return None
+        try:
+            data = json.loads(content)
+            rates = {f"USD{currency}": float(data['rates'][currency])
+                     for currency in self.FX_CURRENCIES if currency in data.get('rates', {})}
+        except Exception as e:
+            logger.warning(f"{source} FX response not usable: {str(e)}")
+            return None
+        return (source, rates) if rates else None
+    
+    async def _fetch_exchangerate_api(self, previous_rates: Dict[str, float]) -> Optional[Dict]:
+        """Fetch from free ExchangeRate API, hedged with a backup source"""
+        
+        # The backup only starts if the primary is slower than its usual p90
+        fetched = await hedged(
+            lambda: self._fetch_usd_rates(self.FX_PRIMARY_URL, "ExchangeRate-API"),
+            lambda: self._fetch_usd_rates(self.FX_BACKUP_URL, "ExchangeRate-Backup"),
+            delay=self._hedge_delay(self.FX_PRIMARY_URL),
+            name="fx"
+        )
         
-        if content:
-            try:
-                data = json.loads(content)
-                rates = {}
-                
-                for currency in ['EUR', 'JPY', 'SGD', 'CNY']:
-                    if currency in data['rates']:
-                        pair = f"USD{currency}"
-                        current_rate = data['rates'][currency]
-                        change_pct = self._calculate_change_pct(pair, current_rate, previous_rates)
-                        rates[pair] = {
-                            "rate": current_rate,
-                            "change_pct": change_pct,
-                            "source": "ExchangeRate-API"
-                        }
-                
-                if rates:
-                    return rates
-            except Exception as e:
-                logger.warning(f"Primary FX API failed: {str(e)}")
-        
-        # Try backup API: exchangerate.host
-        backup_url = "https://api.exchangerate.host/latest?base=USD&symbols=EUR,JPY,SGD,CNY"
-        backup_content = await self.fetch_url(backup_url)
-        
-        if backup_content:
-            try:
-                data = json.loads(backup_content)
-                rates = {}
-                
-                for currency in ['EUR', 'JPY', 'SGD', 'CNY']:
-                    if currency in data.get('rates', {}):
-                        pair = f"USD{currency}"
-                        current_rate = data['rates'][currency]
-                        change_pct = self._calculate_change_pct(pair, current_rate, previous_rates)
-                        rates[pair] = {
-                            "rate": current_rate,
-                            "change_pct": change_pct,
-                            "source": "ExchangeRate-Backup"
-                        }
-                
-                if rates:
-                    logger.info("Using backup FX API")
-                    return rates
-            except Exception as e:
-                logger.warning(f"Backup FX API failed: {str(e)}")
+        if fetched:
+            source, raw_rates = fetched
+            if source != "ExchangeRate-API":
+                logger.info("Using backup FX API")
+            rates = {}
+            for pair, current_rate in raw_rates.items():
+                self.store.record(pair, current_rate)
+                rates[pair] = {
+                    "rate": current_rate,
+                    "change_pct": self._calculate_change_pct(pair, current_rate, previous_rates),
+                    "source": source
+                }
+            return rates
         
-        # Final fallback: hardcoded approximate rates (with 0% change)
-        logger.warning("All FX APIs failed - using hardcoded fallback rates")
-        return {
-            'USDCNY': {'rate': 7.25, 'change_pct': 0.0, 'source': 'Fallback'},
-            'USDEUR': {'rate': 0.92, 'change_pct': 0.0, 'source': 'Fallback'},
-            'USDJPY': {'rate': 149.50, 'change_pct': 0.0, 'source': 'Fallback'},
-            'USDSGD': {'rate': 1.35, 'change_pct': 0.0, 'source': 'Fallback'}
-        }
+        # Final fallback: last known real rates, with their age
+        rates = {}
+        for currency in self.FX_CURRENCIES:
+            pair = f"USD{currency}"
+            last_known = self.last_known.lookup(pair)
+            if last_known:
+                rate, as_of, age_days = last_known
+                rates[pair] = self.last_known.annotate({
+                    "rate": rate,
+                    "change_pct": self._calculate_change_pct(pair, rate, previous_rates),
+                    "source": "Last known good"
+                }, as_of, age_days)
+        if rates:
+            logger.warning("All FX APIs failed - using last known rates")
+            return rates
+        logger.error("All FX APIs failed and no recent rates are stored")
+        return None
 
 
 class CommoditiesFetcher(DataFetcher):
     """Fetch commodities prices from free sources"""
     
+    # Yahoo Finance front-month futures behind each dashboard instrument
+    YAHOO_SYMBOLS = {
+        'brent': 'BZ=F',
+        'wti': 'CL=F',
+        'henry_hub': 'NG=F',
+        'ttf': 'TTF=F',
+        'jkm': 'JKM=F'
+    }
+    
+    # Per-instrument budget (seconds): covers the aiohttp attempt plus the
+    # urllib fallback, so one slow source can't hold up the rest of the card
+    INSTRUMENT_TIMEOUTS = {
+        'brent': 25,
+        'wti': 25,
+        'henry_hub': 25,
+        'ttf': 25,
+        'jkm': 25,
+        'tokyo': 35,
+        'kansai': 35,
+        'jepx_model': 35
+    }
+    
+    # History requested the first time an instrument has nothing stored
+    BACKFILL_RANGE = "1y"
+    
+    # Independent sources each Yahoo instrument is hedged against: FRED daily
+    # series (fred.FRED_SERIES), or the LNG Price Index ticker (the run's
+    # shared 'lng_index' node)
+    LNG_INDEX_BACKUPS = ('ttf', 'jkm')
+    
+    # JCC tracks the Middle East basket, typically $1-3 below Brent
+    JCC_BRENT_DISCOUNT = 1.5
+    
+    # How long a card waits for its live source before the last known good
+    # value is served instead (the live fetch then finishes in the background)
+    SWR_WAIT = 8
+    
+    def __init__(self, session: aiohttp.ClientSession, http: Optional[HttpClient] = None,
+                 store: Optional[PriceStore] = None):
+        super().__init__(session, http, store)
+        self.yahoo = YahooChartClient(self.fetch_url)
+    
+    async def _timed(self, name: str, coro, timeout: Optional[float] = None) -> Any:
+        """Await coro under the instrument's timeout and log how long it took.
+
+        Returns None if the timeout expires, so the caller falls back as it
+        would for any other failed source.
+        """
+        if timeout is None:
+            timeout = self.INSTRUMENT_TIMEOUTS.get(name, 30)
+        if self.http.deadline:
+            if self.http.deadline.expired:
+                coro.close()
+                logger.warning(f"{name} skipped: run deadline reached")
+                return None
+            timeout = self.http.deadline.clamp(timeout)
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(coro, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{name} timed out after {timeout}s")
+            return None
+        finally:
+            logger.info(f"Timing - {name}: {time.perf_counter() - start:.2f}s")
+    
+    async def _fetch_yahoo_quotes(self) -> Dict[str, Optional[QuoteSeries]]:
+        """All configured Yahoo symbols in one concurrent pass, shared for the run"""
+        return await self.http.flights.do('yahoo:quotes', self._fetch_and_store_yahoo_quotes)
+    
+    async def _fetch_and_store_yahoo_quotes(self) -> Dict[str, Optional[QuoteSeries]]:
+        """Request only the bars after each instrument's last stored day and append them"""
+        since = {symbol: self.store.last_timestamp(instrument)
+                 for instrument, symbol in self.YAHOO_SYMBOLS.items()}
+        quotes = await self.yahoo.fetch(self.YAHOO_SYMBOLS.values(), range_=self.BACKFILL_RANGE, since=since)
+        
+        for instrument, symbol in self.YAHOO_SYMBOLS.items():
+            series = quotes.get(symbol)
+            if series:
+                # One point per day: today's moving bar revises itself on later runs
+                self.store.append(instrument, ((day_start(t), c) for t, c in zip(series.timestamps, series.closes)))
+        return quotes
+    
+    def _last_known_price(self, symbol: str, currency: str, source: str,
+                          decimals: int = 2) -> Optional[Dict]:
+        """Price entry from the latest stored real value, flagged with its age"""
+        last_known = self.last_known.lookup(symbol)
+        if last_known is None:
+            return None
+        _, as_of, age_days = last_known
+        entry = self._stored_price(symbol, currency, source, f"Last known good (as of {as_of})",
+                                   decimals=decimals, min_points=1)
+        return self.last_known.annotate(entry, as_of, age_days) if entry else None
+    
+    async def _live_or_last_known(self, name: str, coro, symbol: str, currency: str,
+                                  source: str, decimals: int = 2) -> Optional[Dict]:
+        """Live entry if it arrives within SWR_WAIT, else the last known good one.
+
+        A live fetch that is merely slow keeps running in the background and
+        updates the price history for the next render; with nothing stored to
+        fall back on, the live fetch is awaited for its full timeout.
+        """
+        task = asyncio.ensure_future(self._timed(name, coro))
+        await asyncio.wait({task}, timeout=self.SWR_WAIT)
+        if task.done() and not task.cancelled() and task.exception() is None and task.result():
+            return task.result()
+        
+        entry = self._last_known_price(symbol, currency, source, decimals)
+        if entry is None:
+            try:
+                return await task
+            except Exception as e:
+                logger.error(f"Error fetching {name}: {e}")
+                return None
+        if task.done():
+            logger.error(f"Error fetching {name}: no live data - serving value as of {entry['as_of']}")
+        else:
+            logger.warning(f"{name} slow - serving value as of {entry['as_of']}, revalidating in background")
+            self.last_known.revalidate(task)
+        return entry
+    
+    async def fetch_spot_quotes(self) -> Dict[str, float]:
+        """Latest live price per Yahoo instrument (brent, ttf, ...), from this run's batch"""
+        quotes = await self._fetch_yahoo_quotes()
+        return {instrument: quotes[symbol].last
+                for instrument, symbol in self.YAHOO_SYMBOLS.items() if quotes.get(symbol)}
+    
+    @classmethod
+    async def derive_jcc(cls, spot_quotes: Dict[str, float]) -> Optional[float]:
+        """Synthetic JCC estimate from live Brent, None without a live Brent"""
+        brent = spot_quotes.get('brent')
+        return brent - cls.JCC_BRENT_DISCOUNT if brent is not None else None
+    
+    def _stored_price(self, symbol: str, currency: str, source: str, note: str,
+                      decimals: int = 2, min_points: int = 2) -> Optional[Dict]:
+        """Build a dashboard price entry from local history, or None if too short"""
+        series = self.series(symbol)
+        if len(series) < min_points:
+            return None
+        current = series.last
+        change, change_pct = series.change_since(days=CHANGE_LOOKBACKS['dod']) or (0.0, 0.0)
+        entry = {
+            "price": round(current, decimals),
+            "currency": currency,
+            "change_dod": round(change, decimals),
+            "change_pct": round(change_pct, 2),
+            "source": source,
+            "note": note
+        }
+        for name in ('wow', 'mom'):
+            change = series.change_since(days=CHANGE_LOOKBACKS[name])
+            if change:
+                entry[f"change_{name}_pct"] = round(change[1], 2)
+        return entry
+    
     async def fetch_prices(self) -> Dict[str, Any]:
         """Fetch all commodity prices"""
+        # Oil, gas and power are independent; each instrument inside them
+        # runs concurrently too, so the branch costs its slowest source
+        start = time.perf_counter()
+        oil, gas, power, jepx = await asyncio.gather(
+            self._fetch_oil_prices(),
+            self._fetch_gas_prices(),
+            self._fetch_power_prices(),
+            self._timed("jepx_model", self._fetch_jepx_summary())
+        )
+        logger.info(f"Timing - commodities total: {time.perf_counter() - start:.2f}s")
+        
         commodities = {
-            "oil": await self._fetch_oil_prices(),
-            "gas": await self._fetch_gas_prices(),
-            "power": await self._fetch_power_prices()
+            "oil": oil,
+            "gas": gas,
+            "power": power
         }
+        # JCC is derived from Brent (or the official monthly figure), so it
+        # doesn't count as a live source of its own
+        live = jepx is not None or any(not entry.get('stale') for group in commodities.values()
+                                       for name, entry in group.items() if name != 'jcc')
         
         return {
             "timestamp": datetime.now().isoformat(),
-            "commodities": commodities
+            "commodities": commodities,
+            "jepx": jepx,
+            "live": live
         }
     
     async def _fetch_oil_prices(self) -> Dict[str, Any]:
         """Fetch oil prices - Brent, WTI from Yahoo Finance"""
         prices = {}
         
-        # Fetch live data from Yahoo Finance
-        try:
-            import yfinance as yf
-            
-            # Brent Crude (BZ=F)
-            brent = yf.Ticker("BZ=F")
-            brent_hist = brent.history(period="2d")
-            if len(brent_hist) >= 2:
-                brent_current = brent_hist['Close'].iloc[-1]
-                brent_prev = brent_hist['Close'].iloc[-2]
-                brent_change = brent_current - brent_prev
-                brent_change_pct = (brent_change / brent_prev) * 100
-                
-                prices["brent"] = {
-                    "price": round(brent_current, 2),
-                    "currency": "USD/BBL",
-                    "change_dod": round(brent_change, 2),
-                    "change_pct": round(brent_change_pct, 2),
-                    "source": "Yahoo Finance (ICE)",
-                    "note": "Live data"
-                }
-            else:
-                raise Exception("Insufficient Brent data")
-                
-            # WTI Crude (CL=F)
-            wti = yf.Ticker("CL=F")
-            wti_hist = wti.history(period="2d")
-            if len(wti_hist) >= 2:
-                wti_current = wti_hist['Close'].iloc[-1]
-                wti_prev = wti_hist['Close'].iloc[-2]
-                wti_change = wti_current - wti_prev
-                wti_change_pct = (wti_change / wti_prev) * 100
-                
-                prices["wti"] = {
-                    "price": round(wti_current, 2),
-                    "currency": "USD/BBL",
-                    "change_dod": round(wti_change, 2),
-                    "change_pct": round(wti_change_pct, 2),
-                    "source": "Yahoo Finance (NYMEX)",
-                    "note": "Live data"
-                }
-            else:
-                raise Exception("Insufficient WTI data")
-                
-        except Exception as e:
-            logger.error(f"Error fetching oil prices from Yahoo Finance: {str(e)}")
-            
-            # Try alternative: Yahoo Finance API via urllib
-            try:
-                brent_url = "https://query1.finance.yahoo.com/v8/finance/chart/BZ=F?interval=1d&range=5d"
-                wti_url = "https://query1.finance.yahoo.com/v8/finance/chart/CL=F?interval=1d&range=5d"
-                
-                brent_content = await self.fetch_url(brent_url, timeout=10)
-                wti_content = await self.fetch_url(wti_url, timeout=10)
-                
-                if brent_content and wti_content:
-                    brent_data = json.loads(brent_content)
-                    wti_data = json.loads(wti_content)
-                    
-                    brent_prices = [p for p in brent_data['chart']['result'][0]['indicators']['quote'][0]['close'] if p is not None]
-                    wti_prices = [p for p in wti_data['chart']['result'][0]['indicators']['quote'][0]['close'] if p is not None]
-                    
-                    if len(brent_prices) >= 2 and len(wti_prices) >= 2:
-                        brent_current = brent_prices[-1]
-                        brent_prev = brent_prices[-2]
-                        wti_current = wti_prices[-1]
-                        wti_prev = wti_prices[-2]
-                        
-                        prices["brent"] = {
-                            "price": round(brent_current, 2),
-                            "currency": "USD/BBL",
-                            "change_dod": round(brent_current - brent_prev, 2),
-                            "change_pct": round(((brent_current - brent_prev) / brent_prev) * 100, 2),
-                            "source": "Yahoo Finance API",
-                            "note": "Live data (urllib fallback)"
-                        }
-                        prices["wti"] = {
-                            "price": round(wti_current, 2),
-                            "currency": "USD/BBL",
-                            "change_dod": round(wti_current - wti_prev, 2),
-                            "change_pct": round(((wti_current - wti_prev) / wti_prev) * 100, 2),
-                            "source": "Yahoo Finance API",
-                            "note": "Live data (urllib fallback)"
-                        }
-                        logger.info("Oil prices fetched via Yahoo Finance API (urllib)")
-                    else:
-                        raise Exception("Insufficient data from Yahoo API")
-                else:
-                    raise Exception("Failed to fetch from Yahoo API")
-            except Exception as e2:
-                logger.error(f"Yahoo API fallback also failed: {str(e2)}")
-                # Final fallback to mock data
-                prices["brent"] = {
-                    "price": 85.50,
-                    "currency": "USD/BBL",
-                    "change_dod": -0.30,
-                    "change_pct": -0.35,
-                    "source": "ICE",
-                    "note": "Mock data - all sources failed"
-                }
-                prices["wti"] = {
-                    "price": 81.20,
-                    "currency": "USD/BBL",
-                    "change_dod": -0.25,
-                    "change_pct": -0.31,
-                    "source": "NYMEX",
-                    "note": "Mock data - all sources failed"
-                }
+        brent, wti = await asyncio.gather(
+            self._live_or_last_known("brent", self._fetch_hedged_price('brent', "USD/BBL", "Yahoo Finance (ICE)", "Live data"),
+                                     'brent', "USD/BBL", "ICE"),
+            self._live_or_last_known("wti", self._fetch_hedged_price('wti', "USD/BBL", "Yahoo Finance (NYMEX)", "Live data"),
+                                     'wti', "USD/BBL", "NYMEX")
+        )
+        brent, wti = await self._cross_check({'brent': brent, 'wti': wti})
+        
+        if brent:
+            prices["brent"] = brent
+        if wti:
+            prices["wti"] = wti
         
         # JCC - Japan Crude Cocktail
         # Official monthly figure (update manually when published by PAJ or METI)
@@ -324,28 +471,32 @@ class CommoditiesFetcher(DataFetcher):
         
         # Synthetic live estimate: JCC tracks Dubai/Oman (Middle East basket).
         # Approximation: JCC ≈ Brent - small discount (typically $1-3 below Brent)
-        # Using live Brent if available, otherwise fallback
-        try:
-            brent_for_jcc = prices.get("brent", {}).get("price", 85.0)
-            jcc_estimate = brent_for_jcc - 1.5  # Typical Brent-JCC spread
-            jcc_estimate_change = prices.get("brent", {}).get("change_dod", 0.0)
-            jcc_estimate_change_pct = prices.get("brent", {}).get("change_pct", 0.0)
-            
+        # Using the run's shared JCC node for live Brent, else the (last known) Brent card
+        live_brent = brent is not None and not brent.get('stale')
+        jcc_estimate = await self.shared('jcc') if live_brent else None
+        if jcc_estimate is None and brent:
+            jcc_estimate = brent["price"] - self.JCC_BRENT_DISCOUNT
+        
+        if jcc_estimate is not None:
             prices["jcc"] = {
                 "price": round(jcc_estimate, 2),
                 "currency": "USD/BBL",
-                "change_dod": round(jcc_estimate_change, 2),
-                "change_pct": round(jcc_estimate_change_pct, 2),
+                "change_dod": round(brent.get("change_dod", 0.0), 2),
+                "change_pct": round(brent.get("change_pct", 0.0), 2),
                 "source": "METI (est. from Brent)",
                 "note": f"Synthetic estimate. Official {JCC_OFFICIAL_LAST['month']}: ${JCC_OFFICIAL_LAST['price']}"
             }
-        except Exception:
-            # Fallback to static if calculation fails
+            if live_brent:
+                self.store.record('jcc_estimate', jcc_estimate)
+            else:
+                self.last_known.annotate(prices["jcc"], brent["as_of"], brent["age_days"])
+        else:
+            # No Brent at all: show the official monthly figure
             prices["jcc"] = {
-                "price": 83.10,
+                "price": JCC_OFFICIAL_LAST["price"],
                 "currency": "USD/BBL",
-                "change_dod": -0.20,
-                "change_pct": -0.24,
+                "change_dod": 0.0,
+                "change_pct": 0.0,
                 "source": "METI",
                 "note": f"Official {JCC_OFFICIAL_LAST['month']} (no live estimate)"
             }
@@ -356,319 +507,237 @@ class CommoditiesFetcher(DataFetcher):
         """Fetch gas prices - TTF, JKM, Henry Hub"""
         prices = {}
         
-        try:
-            import yfinance as yf
-            
-            # Henry Hub Natural Gas (NG=F)
-            henry = yf.Ticker("NG=F")
-            henry_hist = henry.history(period="2d")
-            if len(henry_hist) >= 2:
-                henry_current = henry_hist['Close'].iloc[-1]
-                henry_prev = henry_hist['Close'].iloc[-2]
-                henry_change = henry_current - henry_prev
-                henry_change_pct = (henry_change / henry_prev) * 100
-                
-                prices["henry_hub"] = {
-                    "price": round(henry_current, 3),
-                    "currency": "USD/MMBtu",
-                    "change_dod": round(henry_change, 3),
-                    "change_pct": round(henry_change_pct, 2),
-                    "source": "Yahoo Finance (NYMEX)",
-                    "note": "Live data"
-                }
-            else:
-                raise Exception("Insufficient Henry Hub data")
-                
-        except Exception as e:
-            logger.error(f"Error fetching Henry Hub from Yahoo Finance: {str(e)}")
-            
-            # Try Yahoo Finance API via urllib
-            try:
-                henry_url = "https://query1.finance.yahoo.com/v8/finance/chart/NG=F?interval=1d&range=5d"
-                henry_content = await self.fetch_url(henry_url, timeout=10)
-                
-                if henry_content:
-                    henry_data = json.loads(henry_content)
-                    henry_prices = [p for p in henry_data['chart']['result'][0]['indicators']['quote'][0]['close'] if p is not None]
-                    
-                    if len(henry_prices) >= 2:
-                        henry_current = henry_prices[-1]
-                        henry_prev = henry_prices[-2]
-                        
-                        prices["henry_hub"] = {
-                            "price": round(henry_current, 3),
-                            "currency": "USD/MMBtu",
-                            "change_dod": round(henry_current - henry_prev, 3),
-                            "change_pct": round(((henry_current - henry_prev) / henry_prev) * 100, 2),
-                            "source": "Yahoo Finance API",
-                            "note": "Live data (urllib fallback)"
-                        }
-                        logger.info("Henry Hub fetched via Yahoo Finance API (urllib)")
-                    else:
-                        raise Exception("Insufficient Henry Hub data from API")
-                else:
-                    raise Exception("Failed to fetch Henry Hub from API")
-            except Exception as e2:
-                logger.error(f"Henry Hub API fallback failed: {str(e2)}")
-                prices["henry_hub"] = {
-                    "price": 2.85,
-                    "currency": "USD/MMBtu",
-                    "change_dod": -0.03,
-                    "change_pct": -1.04,
-                    "source": "NYMEX",
-                    "note": "Mock data - all sources failed"
-                }
+        # Henry Hub, TTF and JKM front-month futures, all from the same Yahoo batch
+        henry, ttf_data, jkm_data = await asyncio.gather(
+            self._live_or_last_known("henry_hub", self._fetch_hedged_price('henry_hub', "USD/MMBtu", "Yahoo Finance (NYMEX)",
+                                                                           "Live data", decimals=3),
+                                     'henry_hub', "USD/MMBtu", "NYMEX", decimals=3),
+            self._live_or_last_known("ttf", self._fetch_ttf_live(), 'ttf', "EUR/MWh", "ICE"),
+            self._live_or_last_known("jkm", self._fetch_jkm_live(), 'jkm', "USD/MMBtu", "S&P Global")
+        )
+        henry, ttf_data, jkm_data = await self._cross_check({'henry_hub': henry, 'ttf': ttf_data, 'jkm': jkm_data})
         
-        # TTF and JKM - try to scrape from Investing.com
-        ttf_data = await self._fetch_ttf_live()
+        if henry:
+            prices["henry_hub"] = henry
         if ttf_data:
             prices["ttf"] = ttf_data
-        else:
-            prices["ttf"] = {
-                "price": 31.50,
-                "currency": "EUR/MWh",
-                "change_dod": 0.20,
-                "change_pct": 0.64,
-                "source": "ICE",
-                "note": "Mock data - scraping failed"
-            }
-        
-        jkm_data = await self._fetch_jkm_live()
         if jkm_data:
             prices["jkm"] = jkm_data
-        else:
-            prices["jkm"] = {
-                "price": 10.80,
-                "currency": "USD/MMBtu",
-                "change_dod": 0.05,
-                "change_pct": 0.47,
-                "source": "S&P Global",
-                "note": "Mock data - scraping failed"
-            }
         
         return prices
     
-    async def _fetch_ttf_live(self) -> Optional[Dict]:
-        """Fetch TTF from Yahoo Finance via yfinance"""
-        try:
-            import yfinance as yf
-            ticker = yf.Ticker("TTF=F")
-            hist = ticker.history(period="5d")
-            
-            if len(hist) >= 1:
-                closes = [c for c in hist['Close'] if c is not None and c == c]  # Filter NaN
-                if len(closes) >= 1:
-                    current = closes[-1]
-                    prev = closes[-2] if len(closes) >= 2 else current
-                    
-                    return {
-                        "price": round(current, 2),
-                        "currency": "EUR/MWh",
-                        "change_dod": round(current - prev, 2),
-                        "change_pct": round(((current - prev) / prev) * 100, 2) if prev else 0.0,
-                        "source": "Yahoo Finance",
-                        "note": "Front-month TTF futures"
-                    }
-        except Exception as e:
-            logger.warning(f"yfinance TTF failed: {str(e)[:50]}")
-        
+    @staticmethod
+    def _reconcile_source(entry: Dict) -> Optional[str]:
+        """Name under which the source of a card entry takes part in reconciliation"""
+        source = entry.get('source', '')
+        for prefix, name in (('Yahoo', 'Yahoo'), ('FRED', 'FRED'), ('LNG Price Index', 'LNGIndex')):
+            if source.startswith(prefix):
+                return name
         return None
     
-    async def _fetch_jkm_live(self) -> Optional[Dict]:
-        """Fetch JKM from Yahoo Finance via yfinance"""
-        try:
-            import yfinance as yf
-            ticker = yf.Ticker("JKM=F")
-            hist = ticker.history(period="5d")
-            
-            if len(hist) >= 1:
-                closes = [c for c in hist['Close'] if c is not None and c == c]  # Filter NaN
-                if len(closes) >= 1:
-                    current = closes[-1]
-                    prev = closes[-2] if len(closes) >= 2 else current
-                    
-                    return {
-                        "price": round(current, 2),
-                        "currency": "USD/MMBtu",
-                        "change_dod": round(current - prev, 2),
-                        "change_pct": round(((current - prev) / prev) * 100, 2) if prev else 0.0,
-                        "source": "Yahoo Finance",
-                        "note": "Front-month JKM futures"
-                    }
-        except Exception as e:
-            logger.warning(f"yfinance JKM failed: {str(e)[:50]}")
-        
+    async def _cross_check(self, entries: Dict[str, Optional[Dict]]) -> List[Optional[Dict]]:
+        """Entries checked against the run's reconciled reference prices.
+
+        A live entry whose source was outvoted by a quorum of the others is
+        replaced with the agreed value; its change figures are zeroed since
+        the history they come from is the suspect source's. Every checked
+        entry notes which sources agreed.
+        """
+        reference = {instrument: Reconciliation.from_dict(instrument, data)
+                     for instrument, data in (await self.shared('reference_prices') or {}).items()}
+        checked = []
+        for instrument, entry in entries.items():
+            result = reference.get(instrument)
+            if entry is None or entry.get('stale') or result is None:
+                checked.append(entry)
+                continue
+            source = self._reconcile_source(entry)
+            if source in result.dissenting and result.method == 'quorum':
+                logger.warning(f"{instrument}: {source} {entry['price']} outvoted by "
+                               f"{', '.join(result.agreeing)} ({result.value:.2f})")
+                decimals = 3 if instrument == 'henry_hub' else 2
+                entry = dict(entry, price=round(result.value, decimals), change_dod=0.0, change_pct=0.0,
+                             source=f"Consensus ({', '.join(result.agreeing)})",
+                             note=f"{source} {entry['price']} rejected - outside tolerance of other sources")
+                entry.pop('change_wow_pct', None)
+                entry.pop('change_mom_pct', None)
+            entry["sources_agreeing"] = list(result.agreeing)
+            checked.append(entry)
+        return checked
+    
+    async def _fetch_yahoo_price(self, instrument: str, currency: str, source: str, note: str,
+                                 decimals: int = 2, min_points: int = 2) -> Optional[Dict]:
+        """One instrument's price entry from the Yahoo Finance quote batch"""
+        quotes = await self._fetch_yahoo_quotes()
+        if quotes.get(self.YAHOO_SYMBOLS[instrument]) is None:
+            return None
+        # Changes come from local history; the fetch only brought the new bars
+        return self._stored_price(instrument, currency, source, note,
+                                  decimals=decimals, min_points=min_points)
+    
+    async def _fetch_hedged_price(self, instrument: str, currency: str, source: str, note: str,
+                                  decimals: int = 2, min_points: int = 2) -> Optional[Dict]:
+        """Yahoo price entry, hedged: if the instrument's chart is slower than its
+        usual p90, the backup source starts too and the first answer wins"""
+        chart_url = CHART_URL.format(symbol=self.YAHOO_SYMBOLS[instrument], interval="1d", range="5d")
+        return await hedged(
+            lambda: self._fetch_yahoo_price(instrument, currency, source, note,
+                                            decimals=decimals, min_points=min_points),
+            lambda: self._fetch_backup_price(instrument, currency, decimals),
+            delay=self._hedge_delay(chart_url),
+            name=instrument
+        )
+    
+    async def _fetch_backup_price(self, instrument: str, currency: str, decimals: int = 2) -> Optional[Dict]:
+        """Price entry for instrument from its independent backup source"""
+        if instrument in FRED_SERIES:
+            series_id = FRED_SERIES[instrument]
+            if await self.fred.refresh(series_id) is None:
+                return None
+            as_of, _ = self.fred.latest(series_id) or (None, None)
+            return self._stored_price(FredSeriesReader.symbol(series_id), currency, "FRED",
+                                      f"Daily close (as of {as_of})", decimals=decimals, min_points=1)
+        if instrument in self.LNG_INDEX_BACKUPS:
+            lng_prices = await self.shared('lng_index') or {}
+            if lng_prices.get(instrument) is None:
+                return None
+            symbol = f"lngindex_{instrument}"
+            self.store.record(symbol, lng_prices[instrument])
+            return self._stored_price(symbol, currency, "LNG Price Index", "Spot ticker",
+                                      decimals=decimals, min_points=1)
         return None
     
+    async def _fetch_ttf_live(self) -> Optional[Dict]:
+        """Fetch TTF front-month from the Yahoo Finance quote batch"""
+        return await self._fetch_hedged_price('ttf', "EUR/MWh", "Yahoo Finance",
+                                             "Front-month TTF futures", min_points=1)
+    
+    async def _fetch_jkm_live(self) -> Optional[Dict]:
+        """Fetch JKM front-month from the Yahoo Finance quote batch"""
+        return await self._fetch_hedged_price('jkm', "USD/MMBtu", "Yahoo Finance",
+                                             "Front-month JKM futures", min_points=1)
+    
     async def _fetch_power_prices(self) -> Dict[str, Any]:
         """Fetch power prices - Tokyo, Kansai from japanesepower.org"""
         prices = {}
         
-        # Try to fetch from japanesepower.org CSV data
-        tokyo_data = await self._fetch_jepx_data("Tokyo")
-        kansai_data = await self._fetch_jepx_data("Kansai")
+        # Try to fetch from japanesepower.org CSV data (both areas share one download)
+        tokyo_data, kansai_data = await asyncio.gather(
+            self._live_or_last_known("tokyo", self._fetch_jepx_data("Tokyo"), 'jepx_tokyo', "JPY/kWh", "JEPX"),
+            self._live_or_last_known("kansai", self._fetch_jepx_data("Kansai"), 'jepx_kansai', "JPY/kWh", "JEPX")
+        )
         
         if tokyo_data:
             prices["tokyo"] = tokyo_data
-        else:
-            prices["tokyo"] = {
-                "price": 13.50,
-                "currency": "JPY/kWh",
-                "change_dod": 0.15,
-                "change_pct": 1.12,
-                "source": "JEPX",
-                "note": "Mock data - fetch failed"
-            }
-        
         if kansai_data:
             prices["kansai"] = kansai_data
-        else:
-            prices["kansai"] = {
-                "price": 11.20,
-                "currency": "JPY/kWh",
-                "change_dod": 0.08,
-                "change_pct": 0.72,
-                "source": "JEPX",
-                "note": "Mock data - fetch failed"
-            }
         
         return prices
     
+    JEPX_URL = "https://japanesepower.org/jepxSpot.csv"
+    
+    # Days of half-hourly history the JEPX model is built over
+    JEPX_MODEL_DAYS = 30
+    
+    async def _fetch_jepx_model(self) -> Optional[JepxDayAhead]:
+        """All-area JEPX model, built once per run whichever caller asks first"""
+        return await self.http.flights.do('jepx:model', self._load_jepx_model)
+    
     async def _fetch_jepx_data(self, area: str) -> Optional[Dict]:
         """Fetch JEPX daily average spot price from japanesepower.org CSV"""
         try:
-            # japanesepower.org provides historical CSV downloads
-            url = f"https://japanesepower.org/jepxSpot.csv"
+            model = await self._fetch_jepx_model()
+            today = datetime.now().strftime('%Y-%m-%d')
+            yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+            if not model or area not in model.areas or today not in model.dates:
+                return None
             
-            # Use fetch_url for urllib fallback on DNS failure
-            content = await self.fetch_url(url, timeout=15)
-            if content:
-                # Parse CSV content
-                import csv
-                import io
-                
-                csv_file = io.StringIO(content)
-                csv_reader = csv.DictReader(csv_file)
-                
-                area_col_map = {
-                    'Tokyo': 'Tokyo Yen/kWh',
-                    'Kansai': 'Kansai Yen/kWh'
-                }
-                area_col = area_col_map.get(area)
-                
-                # Calculate daily average for today and yesterday
-                today = datetime.now().strftime('%Y-%m-%d')
-                yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-                today_prices = []
-                yesterday_prices = []
-                
-                for row in csv_reader:
-                    if area_col and area_col in row:
-                        try:
-                            row_date = row.get('Date', '')
-                            price = float(row[area_col])
-                            if row_date == today:
-                                today_prices.append(price)
-                            elif row_date == yesterday:
-                                yesterday_prices.append(price)
-                        except (ValueError, TypeError):
-                            continue
-                
-                if today_prices:
-                    avg_price = sum(today_prices) / len(today_prices)
-                    change = 0.0
-                    change_pct = 0.0
-                    if yesterday_prices:
-                        yesterday_avg = sum(yesterday_prices) / len(yesterday_prices)
-                        change = avg_price - yesterday_avg
-                        change_pct = (change / yesterday_avg) * 100 if yesterday_avg else 0
-                    
-                    return {
-                        "price": round(avg_price, 2),
-                        "currency": "JPY/kWh",
-                        "change_dod": round(change, 2),
-                        "change_pct": round(change_pct, 2),
-                        "source": "JEPX",
-                        "note": f"Daily avg ({len(today_prices)} periods)"
-                    }
+            a = model.areas.index(area)
+            base = model.base()
+            slots = int(model.slots_reported()[model.dates.index(today), a])
+            avg_price = float(base[model.dates.index(today), a])
+            if slots == 0:
+                return None
             
-            # Fallback to direct aiohttp if fetch_url fails
-            async with self.session.get(url, timeout=15) as response:
-                if response.status == 200:
-                    csv_content = await response.text()
-                    lines = csv_content.strip().split('\n')
-                    
-                    if len(lines) >= 2:
-                        # Parse header to find column indices
-                        header = lines[0].split(',')
-                        area_col_map = {
-                            'Tokyo': 'Tokyo Yen/kWh',
-                            'Kansai': 'Kansai Yen/kWh'
-                        }
-                        
-                        area_col_name = area_col_map.get(area)
-                        if not area_col_name:
-                            return None
-                        
-                        try:
-                            area_col_idx = header.index(area_col_name)
-                        except ValueError:
-                            # Try alternative column names
-                            alt_names = {'Tokyo': ['Tokyo'], 'Kansai': ['Kansai']}
-                            for alt in alt_names.get(area, []):
-                                try:
-                                    area_col_idx = header.index(alt)
-                                    break
-                                except ValueError:
-                                    continue
-                            else:
-                                return None
-                        
-                        # Get today's date string
-                        today = datetime.now().strftime('%Y-%m-%d')
-                        yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-                        
-                        # Collect all prices for today and yesterday
-                        today_prices = []
-                        yesterday_prices = []
-                        
-                        for line in lines[1:]:
-                            parts = line.split(',')
-                            if len(parts) > area_col_idx:
-                                try:
-                                    line_date = parts[1] if len(parts) > 1 else ''
-                                    price = float(parts[area_col_idx])
-                                    
-                                    if line_date == today:
-                                        today_prices.append(price)
-                                    elif line_date == yesterday:
-                                        yesterday_prices.append(price)
-                                except (ValueError, IndexError):
-                                    continue
-                        
-                        # Calculate daily averages
-                        if today_prices:
-                            avg_price = sum(today_prices) / len(today_prices)
-                            
-                            # Calculate change from yesterday
-                            change = 0.0
-                            change_pct = 0.0
-                            if yesterday_prices:
-                                yesterday_avg = sum(yesterday_prices) / len(yesterday_prices)
-                                change = avg_price - yesterday_avg
-                                change_pct = (change / yesterday_avg) * 100 if yesterday_avg else 0
-                            
-                            return {
-                                "price": round(avg_price, 2),
-                                "currency": "JPY/kWh",
-                                "change_dod": round(change, 2),
-                                "change_pct": round(change_pct, 2),
-                                "source": "JEPX/japanesepower.org",
-                                "note": f"Daily average ({len(today_prices)} periods)"
-                            }
+            change = 0.0
+            change_pct = 0.0
+            if yesterday in model.dates:
+                yesterday_avg = float(base[model.dates.index(yesterday), a])
+                if yesterday_avg == yesterday_avg:  # not NaN
+                    change = avg_price - yesterday_avg
+                    change_pct = (change / yesterday_avg) * 100 if yesterday_avg else 0
+            
+            return {
+                "price": round(avg_price, 2),
+                "currency": "JPY/kWh",
+                "change_dod": round(change, 2),
+                "change_pct": round(change_pct, 2),
+                "source": "JEPX",
+                "note": f"Daily avg ({slots} periods)"
+            }
         except Exception as e:
             logger.debug(f"Error fetching {area} power data: {str(e)}")
         return None
+    
+    async def _load_jepx_model(self) -> Optional[JepxDayAhead]:
+        """Parse the last JEPX_MODEL_DAYS of jepxSpot.csv into one (days, areas, 48) array"""
+        now = datetime.now()
+        dates = [(now - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(self.JEPX_MODEL_DAYS - 1, -1, -1)]
+        
+        # Local tail window + Range requests: only new rows cross the wire
+        result = None
+        try:
+            ingester = JepxIngester(self.http, self.JEPX_URL, headers=self.headers)
+            result = await ingester.fetch_rows(dates, timeout=15)
+        except Exception as e:
+            logger.warning(f"JEPX incremental fetch failed: {str(e)[:50]}... downloading full CSV")
+        
+        if result is None:
+            # Use fetch_url for urllib fallback on DNS failure
+            content = await self.fetch_url(self.JEPX_URL, timeout=15)
+            if not content:
+                return None
+            result = rows_from_text(content, dates)
+        
+        model = JepxDayAhead.from_rows(*result)
+        if model is None:
+            logger.warning("JEPX CSV: no known area columns in header")
+            return None
+        
+        # Daily base price per area into local history
+        base = model.base()
+        for i, area in enumerate(model.areas):
+            self.store.append(f"jepx_{area.lower()}",
+                              [(date_timestamp(d), float(base[j, i]))
+                               for j, d in enumerate(model.dates) if base[j, i] == base[j, i]])
+        return model
+    
+    async def _fetch_jepx_summary(self) -> Optional[Dict[str, Any]]:
+        """Today's base/peak/off-peak for every area, area spreads and 48-slot profiles"""
+        model = await self._fetch_jepx_model()
+        if not model or not model.dates:
+            return None
+        
+        latest = model.dates[-1]
+        d = len(model.dates) - 1
+        summary = {
+            "date": latest,
+            "currency": "JPY/kWh",
+            "areas": model.daily_summary(latest),
+            "spreads": {},
+            "profiles_7d": {}
+        }
+        if 'System' in model.areas:
+            for area in model.areas:
+                if area != 'System':
+                    spread = model.spread(area, 'System')[d]
+                    summary["spreads"][f"{area}-System"] = (round(float(np.nanmean(spread)), 2)
+                                                           if not np.all(np.isnan(spread)) else None)
+        for area in ('System', 'Tokyo', 'Kansai'):
+            if area in model.areas:
+                summary["profiles_7d"][area] = [None if p != p else round(float(p), 2)
+                                                for p in model.profile(area, days=7)]
+        return summary
 
 
 class NewsFetcher(DataFetcher):
@@ -702,9 +771,13 @@ class NewsFetcher(DataFetcher):
         # Target companies to always include
         priority_companies = ['trafigura', 'vitol', 'gunvor', 'jera', 'glencore', 'shell trading', 'total', 'bp trading', 'mercuria', 'cargill']
         
-        for source_name, url in news_sources:
+        # Feeds are fetched concurrently, so the section costs its slowest feed
+        contents = await asyncio.gather(*(self.fetch_url(url) for _, url in news_sources),
+                                        return_exceptions=True)
+        for (source_name, url), content in zip(news_sources, contents):
             try:
-                content = await self.fetch_url(url)
+                if isinstance(content, BaseException):
+                    raise content
                 if content:
                     feed = feedparser.parse(content)
                     
@@ -773,9 +846,12 @@ class NewsFetcher(DataFetcher):
         if not all_news:
             logger.warning("Primary news sources failed - trying backup RSS feeds")
             
-            for source_name, url in backup_sources:
+            contents = await asyncio.gather(*(self.fetch_url(url) for _, url in backup_sources),
+                                            return_exceptions=True)
+            for (source_name, url), content in zip(backup_sources, contents):
                 try:
-                    content = await self.fetch_url(url)
+                    if isinstance(content, BaseException):
+                        raise content
                     if content:
                         feed = feedparser.parse(content)
                         
@@ -801,7 +877,8 @@ class NewsFetcher(DataFetcher):
                 except Exception as e:
                     logger.error(f"Error fetching backup news from {source_name}: {str(e)}")
         
-        # If still no news fetched, return fallback items so section isn't empty
+        # If still no news fetched, return fallback items so section isn't empty;
+        # they are marked so the scheduler never caches them over real news
         if not all_news:
             logger.warning("All news sources failed - using fallback items")
             all_news = [
@@ -810,28 +887,32 @@ class NewsFetcher(DataFetcher):
                     "link": "https://oilprice.com",
                     "published": "Recent",
                     "source": "Market Update",
-                    "summary": ""
+                    "summary": "",
+                    "placeholder": True
                 },
                 {
                     "title": "Natural Gas Prices React to Weather Forecasts",
                     "link": "https://naturalgasintel.com",
                     "published": "Recent",
                     "source": "Market Update",
-                    "summary": ""
+                    "summary": "",
+                    "placeholder": True
                 },
                 {
                     "title": "LNG Demand Growth Expected in Asian Markets",
                     "link": "https://lngjournal.com",
                     "published": "Recent",
                     "source": "Market Update",
-                    "summary": ""
+                    "summary": "",
+                    "placeholder": True
                 },
                 {
                     "title": "Energy Traders Monitor Geopolitical Developments",
                     "link": "https://thearc.cloud",
                     "published": "Recent",
                     "source": "Market Update",
-                    "summary": ""
+                    "summary": "",
+                    "placeholder": True
                 }
             ]
         
@@ -841,39 +922,94 @@ class NewsFetcher(DataFetcher):
 class ForwardCurvesFetcher(DataFetcher):
     """Fetch forward curves for energy commodities with smart period adjustment"""
     
+    EIA_WEEKLY_URL = "https://www.eia.gov/naturalgas/weekly/"
+    
+    # Curves priced from monthly futures contracts (see futures_curve.py)
+    CURVE_COMMODITIES = ('brent', 'ttf', 'jkm', 'henry_hub')
+    
+    # Spot sources each curve is anchored to, highest priority first.
+    # EIA/LNGIndex don't cover oil, so Brent falls back to FRED only.
+    CURVE_ANCHORS = {
+        'ttf': ('Yahoo', 'EIA', 'LNGIndex'),
+        'jkm': ('Yahoo', 'EIA', 'LNGIndex'),
+        'brent': ('Yahoo', 'FRED')
+    }
+    # Seconds before a curve settles for the best anchor that has answered
+    ANCHOR_WAIT = 20
+    
+    # Static reference forward curves per _get_smart_periods period, used as
+    # shape where the futures strip has no contracts; the level shifts with
+    # live spot. Reference fronts calibrated to the market in May 2026:
+    # TTF ≈47 EUR/MWh, JKM ≈17 USD/MMBtu, Brent ≈115 USD/BBL.
+    STATIC_CURVES = {
+        'ttf': [47.0, 50.5, 54.0, 52.0, 48.0, 50.5, 45.0, 47.5, 42.0],   # EUR/MWh
+        'jkm': [17.0, 16.5, 16.3, 16.7, 16.0, 16.4, 15.7, 16.1, 15.5],   # USD/MMBtu
+        'brent': [115.0, 113.5, 112.0, 114.0, 110.0, 112.5, 108.0, 110.5, 106.0]  # USD/BBL
+    }
+    # How far apart independent sources may be and still agree: FRED is the
+    # previous close, EIA a weekly average, so gas gets more room than oil
+    RECONCILE_TOLERANCES = {
+        'brent': 0.03,
+        'wti': 0.03,
+        'henry_hub': 0.08,
+        'ttf': 0.10,
+        'jkm': 0.10
+    }
+    
+    def __init__(self, session: aiohttp.ClientSession, http: Optional[HttpClient] = None,
+                 store: Optional[PriceStore] = None):
+        super().__init__(session, http, store)
+        # Contract charts queue behind a small limit and never use the urllib
+        # pool, so a strip can't crowd out the spot quotes on the same host
+        self.futures = FuturesCurveBuilder(YahooChartClient(
+            lambda url, timeout: self.fetch_url(url, timeout, fallback=False), concurrency=STRIP_CONCURRENCY))
+        # Every generated curve is kept, dated, for the DoD/WoW/MoM columns
+        self.snapshots = CurveSnapshotStore()
+    
     async def fetch_curves(self) -> Dict[str, Any]:
-        """Fetch forward curves for TTF, JKM, Brent with weekly updates from EIA
-        and a daily fallback to LNG Price Index when EIA is unavailable.
+        """Fetch forward curves for TTF, JKM, Brent and Henry Hub.
+
+        Periods are priced from the monthly futures strip wherever its
+        contracts trade. Anything the strip can't cover falls back to the
+        static curve shape anchored to the run's shared spot quotes, with
+        weekly updates from EIA and a daily fallback to LNG Price Index for
+        anything the quote batch didn't provide.
         """
+        periods = self._get_smart_periods()
+        calendar = ContractCalendar.covering(periods)
+        months = calendar.months
 
-        # Primary: EIA weekly (TTF + JKM front-month)
-        live_prices = await self._fetch_eia_weekly_prices()
+        # Every anchor source starts at once; per curve the highest-priority
+        # answer wins, and a valid answer cancels the sources below it
+        strips, *anchors = await asyncio.gather(
+            self._fetch_futures_strips(months),
+            *(self._fetch_anchor(key) for key in self.CURVE_ANCHORS)
+        )
+        live_prices = {}
         sources_used = []
-        if live_prices.get('ttf') is not None:
-            sources_used.append('EIA-TTF')
-        if live_prices.get('jkm') is not None:
-            sources_used.append('EIA-JKM')
-
-        # Secondary fallback: LNG Price Index (only fill gaps EIA didn't provide)
-        if 'ttf' not in live_prices or 'jkm' not in live_prices:
-            lng_prices = await self._fetch_lng_price_index()
-            for key, value in lng_prices.items():
-                if key not in live_prices:
-                    live_prices[key] = value
-                    sources_used.append(f'LNGIndex-{key.upper()}')
-
-        # Brent: separate live source (FRED), since EIA/LNGIndex don't cover oil
-        if 'brent' not in live_prices:
-            brent = await self._fetch_fred_brent()
-            if brent is not None:
-                live_prices['brent'] = brent
-                sources_used.append('FRED-Brent')
-
-        # Build forward curves — anchored to live spot when available
-        periods = self._get_smart_periods()
-        ttf_data = self._build_curve_data(periods, live_prices, 'ttf')
-        jkm_data = self._build_curve_data(periods, live_prices, 'jkm')
-        brent_data = self._build_curve_data(periods, live_prices, 'brent')
+        brent_source = None
+        for key, anchor in zip(self.CURVE_ANCHORS, anchors):
+            if anchor is None:
+                continue
+            label, live_prices[key] = anchor
+            if key == 'brent':
+                brent_source = label
+            else:
+                sources_used.append(label)
+
+        # Build forward curves from the futures strip, anchored static shape
+        # elsewhere; changes come from the stored snapshots of earlier days
+        date_str = trading_date()
+        curve_rows = {}
+        for key in self.CURVE_COMMODITIES:
+            curve, live = self._final_curve(calendar, periods, key, strips.get(key, {}), live_prices)
+            curve_rows[key] = self._curve_rows(key, curve, periods, date_str)
+            # History only takes strip-priced or live-anchored months: a
+            # static-only curve would feed made-up changes and risk numbers
+            if live.priced:
+                self.snapshots.record(key, date_str, live)
+        self.snapshots.save()
+        ttf_data, jkm_data, brent_data = curve_rows['ttf'], curve_rows['jkm'], curve_rows['brent']
 
         # Build source note reflecting actual data lineage
         if sources_used:
@@ -885,42 +1021,177 @@ class ForwardCurvesFetcher(DataFetcher):
         if live_prices.get('jkm') is not None:
             source_parts.append(f"JKM spot: {live_prices['jkm']:.2f} USD/MMBtu")
 
+        def note(key: str, base: str) -> str:
+            priced = len(strips.get(key, {}))
+            if not priced:
+                return base
+            return f"Futures strip: {priced}/{len(months)} contract months | {base}"
+
         curves = {
             "ttf": {
                 "name": "TTF",
                 "unit": "EUR/MWh",
                 "data": ttf_data,
-                "note": " | ".join(source_parts)
+                "note": note('ttf', " | ".join(source_parts))
             },
             "jkm": {
                 "name": "JKM",
                 "unit": "USD/MMBtu",
                 "data": jkm_data,
-                "note": " | ".join(source_parts)
+                "note": note('jkm', " | ".join(source_parts))
             },
             "brent": {
                 "name": "Brent",
                 "unit": "USD/BBL",
                 "data": brent_data,
-                "note": (f"Live: FRED-Brent | spot: {live_prices['brent']:.2f} USD/BBL"
-                         if live_prices.get('brent') is not None
-                         else "Static reference (FRED unavailable)")
+                "note": note('brent', f"Live: {brent_source} | spot: {live_prices['brent']:.2f} USD/BBL"
+                             if brent_source
+                             else "Static reference (Yahoo and FRED unavailable)")
             }
         }
+        # Henry Hub has no static reference shape: shown only from the strip
+        if curve_rows['henry_hub']:
+            curves["henry_hub"] = {
+                "name": "Henry Hub",
+                "unit": "USD/MMBtu",
+                "data": curve_rows['henry_hub'],
+                "note": note('henry_hub', "NYMEX monthly contracts")
+            }
 
         return {
             "timestamp": datetime.now().isoformat(),
-            "curves": curves
+            "curves": curves,
+            # Static shapes only: nothing priced or anchored from a live source
+            "live": bool(live_prices) or any(strips.values())
+        }
+
+    async def _fetch_futures_strips(self, months: List[Tuple[int, int]]) -> Dict[str, Dict[Tuple[int, int], float]]:
+        """Monthly futures strip per curve commodity, empty if the batch fails.
+        Starts once the run's spot quotes are in, so those go first."""
+        await self.shared('spot_quotes')
+        try:
+            return await self.futures.build(self.CURVE_COMMODITIES, months)
+        except Exception as e:
+            logger.warning(f"Could not fetch futures strips: {e}")
+            return {}
+
+    def _final_curve(self, calendar: ContractCalendar, periods: List[str], commodity: str,
+                     strip: Dict[Tuple[int, int], float],
+                     base_prices: Dict[str, float]) -> Tuple[ForwardCurve, ForwardCurve]:
+        """(curve, live) monthly curves: the futures strip (missing months
+        interpolated) for every period it has contracts in, the anchored
+        static shape for the rest. live is the same curve without the static
+        months unless they were anchored to a live spot."""
+        curve = ForwardCurve.from_months(calendar, strip).interpolated()
+        if commodity not in self.STATIC_CURVES:
+            return curve, curve
+        static, anchored = self._static_curve(calendar, periods, base_prices, commodity)
+        weights = calendar.weights(periods)
+        uncovered = weights[np.isnan(curve.aggregate(periods))].any(axis=0)
+        between_periods = ~weights.any(axis=0) & np.isnan(curve.prices)
+        final = ForwardCurve(calendar, np.where(uncovered | between_periods, static.prices, curve.prices))
+        return final, final if anchored else curve
+
+    def _curve_rows(self, commodity: str, curve: ForwardCurve, periods: List[str], date_str: str) -> List[Dict]:
+        """Curve table rows with real changes against the stored snapshots
+        (DoD is 0 and WoW/MoM null until there is a snapshot to compare with)"""
+        prices = curve.aggregate(periods)
+        history = self.snapshots.period_series(commodity, periods)
+        ts = date_timestamp(date_str)
+        rows = []
+        for i, period in enumerate(periods):
+            if np.isnan(prices[i]):
+                continue
+            row = {"period": period, "price": round(float(prices[i]), 2)}
+            for name, days in CHANGE_LOOKBACKS.items():
+                change = history[period].change_to(prices[i], ts, days)
+                row[name] = None if change is None else round(change, 2)
+            row["dod"] = row["dod"] or 0.0
+            rows.append(row)
+        return rows
+
+    async def fetch_reference_prices(self) -> Dict[str, Reconciliation]:
+        """Reconciled spot price per instrument across every independent source.
+
+        All sources for an instrument are queried at once; see reconcile().
+        Disagreements are recorded in the run's reconciliation log.
+        """
+        async def constellation(key: str) -> Optional[float]:
+            return (await self.http.flights.do('curves:constellation', self._fetch_constellation_prices)).get(key)
+        
+        sources = {}
+        for key, series_id in FRED_SERIES.items():
+            sources[key] = {
+                'Yahoo': lambda key=key: self._spot_anchor(key),
+                'FRED': lambda series_id=series_id: self._fred_value(series_id)
+            }
+        for key in ('ttf', 'jkm'):
+            sources[key] = {
+                'Yahoo': lambda key=key: self._spot_anchor(key),
+                'EIA': lambda key=key: self._eia_anchor(key),
+                'LNGIndex': lambda key=key: self._lng_index_anchor(key),
+                'Constellation': lambda key=key: constellation(key)
+            }
+        
+        results = await asyncio.gather(
+            *(reconcile(key, fetches, tolerance=self.RECONCILE_TOLERANCES[key]) for key, fetches in sources.items())
+        )
+        reference = {}
+        for result in results:
+            if result is None:
+                continue
+            reference[result.instrument] = result
+            if self.reconciliation_log is not None:
+                self.reconciliation_log.record(result)
+        return reference
+    
+    async def _fred_value(self, series_id: str) -> Optional[float]:
+        """Latest FRED observation, None unless the refresh itself succeeded"""
+        if await self.fred.refresh(series_id) is None:
+            return None
+        latest = self.fred.latest(series_id)
+        return latest[1] if latest else None
+    
+    async def _fetch_anchor(self, key: str) -> Optional[Tuple[str, float]]:
+        """(lineage label, spot) for one curve from its highest-priority source"""
+        fetches = {
+            'Yahoo': lambda: self._spot_anchor(key),
+            'EIA': lambda: self._eia_anchor(key),
+            'LNGIndex': lambda: self._lng_index_anchor(key),
+            'FRED': self._fetch_fred_brent
         }
+        name = 'Brent' if key == 'brent' else key.upper()
+        return await prioritized([(f"{source}-{name}", fetches[source]) for source in self.CURVE_ANCHORS[key]],
+                                 wait=self.ANCHOR_WAIT, name=f"{name} curve anchor")
+
+    async def _spot_anchor(self, key: str) -> Optional[float]:
+        """Spot from the run's shared Yahoo quotes"""
+        return (await self.shared('spot_quotes') or {}).get(key)
+
+    async def _eia_anchor(self, key: str) -> Optional[float]:
+        """Spot from EIA Weekly, downloaded once for all curves"""
+        return (await self.http.flights.do('curves:eia', self._fetch_eia_weekly_prices)).get(key)
+
+    async def _lng_index_anchor(self, key: str) -> Optional[float]:
+        """Spot from the LNG Price Index ticker"""
+        return (await self._lng_index_prices()).get(key)
+
+    async def _lng_index_prices(self) -> Dict[str, float]:
+        """LNG Price Index quotes, shared with the commodities section when the
+        run has an 'lng_index' node"""
+        if self.graph is not None and 'lng_index' in self.graph.nodes:
+            return await self.shared('lng_index') or {}
+        return await self.http.flights.do('curves:lng_index', self._fetch_lng_price_index)
 
     async def _fetch_lng_price_index(self) -> Dict[str, float]:
         """Fetch live LNG spot prices from lngpriceindex.com.
 
         Used as a daily fallback when EIA Weekly is unavailable. Extracts
         JKM and TTF from the ticker banner. TTF is published in $/MMBtu and
-        converted to EUR/MWh for consistency with the static reference curve.
+        converted to EUR/MWh at the run's shared USD/EUR rate.
         """
         prices = {}
+        eur_per_usd = await self._eur_per_usd()
         try:
             url = "https://lngpriceindex.com/"
             headers = {
@@ -928,92 +1199,48 @@ class ForwardCurvesFetcher(DataFetcher):
                               'AppleWebKit/537.36 (KHTML, like Gecko) '
                               'Chrome/120.0.0.0 Safari/537.36'
             }
-            async with self.session.get(url, headers=headers, timeout=20) as response:
-                if response.status == 200:
-                    html = await response.text()
-
-                    # JKM ticker: "JKM $17.15" — already in USD/MMBtu, no conversion
-                    jkm_match = re.search(r'JKM\s*\$([\d.]+)', html)
-                    if jkm_match:
-                        jkm = float(jkm_match.group(1))
-                        if 5 <= jkm <= 30:
-                            prices['jkm'] = jkm
-                            logger.info(f"LNG Price Index - JKM: ${jkm}/MMBtu")
-                        else:
-                            logger.warning(f"LNG Price Index JKM ${jkm}/MMBtu outside sanity range")
-
-                    # TTF ticker: "TTF $15.28" — in USD/MMBtu, convert to EUR/MWh
-                    ttf_match = re.search(r'TTF\s*\$([\d.]+)', html)
-                    if ttf_match:
-                        ttf_usd = float(ttf_match.group(1))
-                        if 5 <= ttf_usd <= 30:
-                            prices['ttf'] = ttf_usd / 0.293 / 1.1
-                            logger.info(f"LNG Price Index - TTF: ${ttf_usd}/MMBtu = {prices['ttf']:.2f} EUR/MWh")
-                        else:
-                            logger.warning(f"LNG Price Index TTF ${ttf_usd}/MMBtu outside sanity range")
+            found = await self.http.extract(url, LNG_PRICE_INDEX, timeout=20, headers=headers)
+
+            # JKM ticker: "JKM $17.15" — already in USD/MMBtu, no conversion
+            jkm = parse_price(found.get('jkm'))
+            if jkm is not None:
+                if 5 <= jkm <= 30:
+                    prices['jkm'] = jkm
+                    logger.info(f"LNG Price Index - JKM: ${jkm}/MMBtu")
+                else:
+                    logger.warning(f"LNG Price Index JKM ${jkm}/MMBtu outside sanity range")
+
+            # TTF ticker: "TTF $15.28" — in USD/MMBtu, convert to EUR/MWh
+            ttf_usd = parse_price(found.get('ttf'))
+            if ttf_usd is not None:
+                if 5 <= ttf_usd <= 30:
+                    prices['ttf'] = ttf_usd / 0.293 * eur_per_usd
+                    logger.info(f"LNG Price Index - TTF: ${ttf_usd}/MMBtu = {prices['ttf']:.2f} EUR/MWh")
                 else:
-                    logger.warning(f"LNG Price Index returned HTTP {response.status}")
+                    logger.warning(f"LNG Price Index TTF ${ttf_usd}/MMBtu outside sanity range")
         except Exception as e:
             logger.warning(f"Could not fetch LNG Price Index: {e}")
 
         return prices
 
     async def _fetch_fred_brent(self) -> Optional[float]:
-        """Fetch latest Brent spot price from FRED (St. Louis Fed Economic Data).
+        """Latest Brent spot price from FRED (St. Louis Fed Economic Data).
 
-        Uses the public CSV graph endpoint for series DCOILBRENTEU
-        (Crude Oil Prices: Brent - Europe, daily, USD/BBL). No API key required.
-        Returns the most recent numeric observation, or None on failure.
+        Series DCOILBRENTEU (Crude Oil Prices: Brent - Europe, daily, USD/BBL)
+        is kept in the local price history; only observations newer than the
+        last stored one are downloaded. Returns None if nothing usable is stored.
         """
-        try:
-            url = "https://fred.stlouisfed.org/graph/fredgraph.csv?id=DCOILBRENTEU"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                              'AppleWebKit/537.36 (KHTML, like Gecko) '
-                              'Chrome/120.0.0.0 Safari/537.36'
-            }
-            async with self.session.get(url, headers=headers, timeout=20) as response:
-                if response.status == 200:
-                    text = await response.text()
-                    # CSV format: "DATE,DCOILBRENTEU\n2026-02-10,116.73\n..."
-                    # Walk lines from the bottom to find the most recent numeric row.
-                    for line in reversed(text.strip().splitlines()):
-                        parts = line.split(',')
-                        if len(parts) != 2:
-                            continue
-                        date_str, value_str = parts[0].strip(), parts[1].strip()
-                        # FRED uses '.' to denote a missing observation
-                        if not value_str or value_str == '.':
-                            continue
-                        try:
-                            value = float(value_str)
-                        except ValueError:
-                            continue
-                        if 30 <= value <= 200:
-                            logger.info(f"FRED Brent: ${value}/bbl ({date_str})")
-                            return value
-                        else:
-                            logger.warning(f"FRED Brent ${value}/bbl outside sanity range")
-                            return None
-                    logger.warning("FRED Brent: no numeric rows found in CSV")
-                else:
-                    logger.warning(f"FRED returned HTTP {response.status}")
-        except Exception as e:
-            logger.warning(f"Could not fetch FRED Brent: {e}")
+        latest = await self.fred.fetch_latest('DCOILBRENTEU', timeout=20)
+        if latest is None:
+            logger.warning("FRED Brent: no observations available")
+            return None
+        date_str, value = latest
+        if 30 <= value <= 200:
+            logger.info(f"FRED Brent: ${value}/bbl ({date_str})")
+            return value
+        logger.warning(f"FRED Brent ${value}/bbl outside sanity range")
         return None
 
-    def _build_curve_from_prices(self, prices: List[float]) -> List[Dict]:
-        """Build curve data from a list of prices"""
-        periods = self._get_smart_periods()
-        dod_changes = [-0.27, -0.20, -0.19, -0.18, -0.13, -0.12, -0.12, -0.12, -0.10]
-        
-        data = []
-        for i, (period, price) in enumerate(zip(periods, prices)):
-            dod = dod_changes[i] if i < len(dod_changes) else 0
-            data.append({"period": period, "price": price, "dod": dod})
-        
-        return data
-    
     def _get_smart_periods(self) -> List[str]:
         """Generate forward curve periods based on current date"""
         now = datetime.now()
@@ -1053,195 +1280,95 @@ class ForwardCurvesFetcher(DataFetcher):
         
         return periods
     
+    async def _eur_per_usd(self) -> float:
+        """USD->EUR rate from the run's shared FX node (static 1/1.1 without one)"""
+        fx_rates = await self.shared('fx_rates') or {}
+        return fx_rates.get('USDEUR') or 1 / 1.1
+    
     async def _fetch_eia_weekly_prices(self) -> Dict[str, float]:
         """Fetch weekly front-month prices from EIA Natural Gas Weekly Update"""
         prices = {}
+        eur_per_usd = await self._eur_per_usd()
         try:
-            url = "https://www.eia.gov/naturalgas/weekly/"
+            url = self.EIA_WEEKLY_URL
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
             }
             
-            async with self.session.get(url, headers=headers, timeout=20) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    
-                    # Extract TTF front-month futures price (in USD/MMBtu)
-                    # Pattern: "increased $X.XX/MMBtu to a weekly average of $Y.YY/MMBtu"
-                    # We want the weekly average ($Y.YY), not the change ($X.XX)
-                    ttf_match = re.search(
-                        r'Title Transfer Facility.*?\$[\d.]+/MMBtu to a weekly average of \$([\d.]+)/MMBtu',
-                        html, re.IGNORECASE | re.DOTALL
-                    )
-                    if ttf_match:
-                        ttf_usd_mmbtu = float(ttf_match.group(1))
-                        # Validate: TTF should be $5-30/MMBtu (realistic range)
-                        if 5 <= ttf_usd_mmbtu <= 30:
-                            # Convert USD/MMBtu to EUR/MWh: divide by 0.293 (MWh per MMBtu) and by 1.1 (USD per EUR)
-                            # Example: $10.50/MMBtu ÷ 0.293 ÷ 1.1 ≈ 32.6 EUR/MWh
-                            prices['ttf'] = ttf_usd_mmbtu / 0.293 / 1.1
-                            logger.info(f"EIA Weekly - TTF front-month: ${ttf_usd_mmbtu}/MMBtu = {prices['ttf']:.2f} EUR/MWh")
-                        else:
-                            logger.warning(f"EIA TTF price ${ttf_usd_mmbtu}/MMBtu outside realistic range, skipping")
-                    
-                    # Extract East Asia LNG (JKM proxy) front-month futures price
-                    # Same pattern: look for "to a weekly average of $X.XX/MMBtu"
-                    jkm_match = re.search(
-                        r'East Asia.*?\$[\d.]+/MMBtu to a weekly average of \$([\d.]+)/MMBtu',
-                        html, re.IGNORECASE | re.DOTALL
-                    )
-                    if jkm_match:
-                        jkm_usd_mmbtu = float(jkm_match.group(1))
-                        # Validate: JKM should be $5-25/MMBtu (realistic range)
-                        if 5 <= jkm_usd_mmbtu <= 25:
-                            prices['jkm'] = jkm_usd_mmbtu
-                            logger.info(f"EIA Weekly - East Asia LNG front-month: ${prices['jkm']}/MMBtu")
-                        else:
-                            logger.warning(f"EIA JKM price ${jkm_usd_mmbtu}/MMBtu outside realistic range, skipping")
-                        
+            # TTF and East Asia LNG front-month futures (USD/MMBtu), each the $Y.YY in
+            # "... increased $X.XX/MMBtu to a weekly average of $Y.YY/MMBtu"
+            found = await self.http.extract(url, EIA_WEEKLY, timeout=20, headers=headers)
+
+            ttf_usd_mmbtu = parse_price(found.get('ttf'))
+            if ttf_usd_mmbtu is not None:
+                # Validate: TTF should be $5-30/MMBtu (realistic range)
+                if 5 <= ttf_usd_mmbtu <= 30:
+                    # Convert USD/MMBtu to EUR/MWh: divide by 0.293 (MWh per MMBtu) and by 1.1 (USD per EUR)
+                    # Example: $10.50/MMBtu ÷ 0.293 ÷ 1.1 ≈ 32.6 EUR/MWh
+                    prices['ttf'] = ttf_usd_mmbtu / 0.293 * eur_per_usd
+                    logger.info(f"EIA Weekly - TTF front-month: ${ttf_usd_mmbtu}/MMBtu = {prices['ttf']:.2f} EUR/MWh")
+                else:
+                    logger.warning(f"EIA TTF price ${ttf_usd_mmbtu}/MMBtu outside realistic range, skipping")
+
+            jkm_usd_mmbtu = parse_price(found.get('jkm'))
+            if jkm_usd_mmbtu is not None:
+                # Validate: JKM should be $5-25/MMBtu (realistic range)
+                if 5 <= jkm_usd_mmbtu <= 25:
+                    prices['jkm'] = jkm_usd_mmbtu
+                    logger.info(f"EIA Weekly - East Asia LNG front-month: ${prices['jkm']}/MMBtu")
+                else:
+                    logger.warning(f"EIA JKM price ${jkm_usd_mmbtu}/MMBtu outside realistic range, skipping")
+
         except Exception as e:
             logger.warning(f"Could not fetch EIA weekly prices: {e}")
         
         return prices
     
-    async def _fetch_investing_com_curves(self) -> Dict[str, List[float]]:
-        """Fetch forward curve data from Investing.com"""
-        curves = {}
-        
-        # Investing.com scraping is unreliable due to dynamic content and anti-bot measures
-        # Return empty to fall back to EIA + static curves
-        logger.debug("Investing.com scraping skipped - using EIA data instead")
-        
-        return curves
-    
-    def _generate_curve_from_spot(self, spot_price: float, commodity: str) -> List[float]:
-        """Generate a forward curve from spot price using typical market contango/backwardation"""
-        if commodity == 'ttf':
-            # TTF typically in backwardation or slight contango
-            # Q2, Q3, Q4, Win, Sum, Win, Sum, Win, Sum
-            spreads = [0, 2.5, 4.5, 3.0, -1.0, 1.5, -3.0, -1.0, -5.0]
-        elif commodity == 'jkm':
-            # JKM seasonal pattern
-            spreads = [0, -0.3, -0.5, -0.2, -0.8, -0.4, -1.0, -0.6, -1.2]
-        else:
-            spreads = [0] * 9
-        
-        return [round(spot_price + spread, 2) for spread in spreads]
-    
     async def _fetch_constellation_prices(self) -> Dict[str, float]:
         """Fetch weekly spot prices from Constellation Energy (fallback)"""
         prices = {}
+        eur_per_usd = await self._eur_per_usd()
         try:
             url = "https://www.constellation.com/solutions/for-your-commercial-business/energy-tools-and-resources/energy-market-update.html"
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            async with self.session.get(url, headers=headers, timeout=15) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    
-                    # Extract TTF price
-                    ttf_match = re.search(r'TTF \(EU LNG\) prompt settled \$([\d.]+)/MMbtu', html)
-                    if ttf_match:
-                        ttf_usd_mmbtu = float(ttf_match.group(1))
-                        prices['ttf'] = ttf_usd_mmbtu / 0.293 / 1.1  # Convert USD/MMBtu to EUR/MWh
-                    
-                    # Extract JKM price
-                    jkm_match = re.search(r'JKM \(Asia LNG\) prompt settled at \$([\d.]+)/MMbtu', html)
-                    if jkm_match:
-                        prices['jkm'] = float(jkm_match.group(1))
-                    
-                    logger.info(f"Constellation - TTF={prices.get('ttf')}, JKM={prices.get('jkm')}")
+            found = await self.http.extract(url, CONSTELLATION, timeout=15, headers=headers)
+            ttf_usd_mmbtu = parse_price(found.get('ttf'))
+            if ttf_usd_mmbtu is not None:
+                prices['ttf'] = ttf_usd_mmbtu / 0.293 * eur_per_usd  # Convert USD/MMBtu to EUR/MWh
+            jkm = parse_price(found.get('jkm'))
+            if jkm is not None:
+                prices['jkm'] = jkm
+
+            logger.info(f"Constellation - TTF={prices.get('ttf')}, JKM={prices.get('jkm')}")
         except Exception as e:
             logger.debug(f"Could not fetch Constellation prices: {e}")
         
         return prices
     
-    def _build_curve_data(self, periods: List[str], base_prices: Dict[str, float], commodity: str) -> List[Dict]:
-        """Build curve data with smart periods and realistic forward curve prices.
-
-        When a live spot price is provided in base_prices, the entire static
-        curve is parallel-shifted by (live_spot - reference_front) so the
-        front-of-curve tracks reality while the structural shape (contango/
-        backwardation) stays stable. Falls back to static curve if the live
-        spot is missing or fails sanity bounds (±50% of reference).
-        """
-
-        # Base DoD changes
-        dod_changes = {
-            'ttf': [-0.27, -0.20, -0.19, -0.18, -0.13, -0.12, -0.12, -0.12, -0.10],
-            'jkm': [0.15, 0.10, 0.08, 0.12, 0.05, 0.07, 0.03, 0.04, 0.02],
-            'brent': [-0.45, -0.38, -0.35, -0.40, -0.30, -0.32, -0.28, -0.30, -0.25]
-        }
-
-        # Static reference forward curves (used as shape; level shifts with live spot)
-        # Reference fronts calibrated to current market (May 2026): TTF ≈47 EUR/MWh,
-        # JKM ≈17 USD/MMBtu, Brent ≈115 USD/BBL. Curve shape (spreads) preserved.
-        forward_curves = {
-            'ttf': [47.0, 50.5, 54.0, 52.0, 48.0, 50.5, 45.0, 47.5, 42.0],   # EUR/MWh
-            'jkm': [17.0, 16.5, 16.3, 16.7, 16.0, 16.4, 15.7, 16.1, 15.5],   # USD/MMBtu
-            'brent': [115.0, 113.5, 112.0, 114.0, 110.0, 112.5, 108.0, 110.5, 106.0]  # USD/BBL
-        }
-
-        # Compute live-anchored shift if base spot is available and within sanity bounds
-        static_curve = forward_curves[commodity]
+    def _static_curve(self, calendar: ContractCalendar, periods: List[str],
+                      base_prices: Dict[str, float], commodity: str) -> Tuple[ForwardCurve, bool]:
+        """(curve, anchored): static reference curve for commodity on
+        calendar, parallel-shifted to the live spot in base_prices when it
+        passes the sanity bounds (±50% of the reference front); the months
+        between the reference periods are interpolated."""
+        static_curve = self.STATIC_CURVES[commodity][:len(periods)]
+        curve = ForwardCurve.from_periods(calendar, periods[:len(static_curve)], static_curve).interpolated()
         reference_front = static_curve[0]
         live_spot = base_prices.get(commodity) if base_prices else None
-        shift = 0.0
-        if live_spot is not None:
-            lo, hi = reference_front * 0.5, reference_front * 1.5
-            if lo <= live_spot <= hi:
-                shift = live_spot - reference_front
-                logger.info(f"Forward curve {commodity.upper()} anchored to live spot "
-                            f"{live_spot:.2f} (shift {shift:+.2f} from reference {reference_front})")
-            else:
-                logger.warning(f"Live spot {live_spot:.2f} for {commodity.upper()} outside "
-                               f"sanity bounds [{lo:.2f}, {hi:.2f}] — using static curve")
-
-        data = []
-        for i, period in enumerate(periods):
-            price = round(static_curve[i] + shift, 2)
-            dod = dod_changes[commodity][i]
-            data.append({"period": period, "price": price, "dod": dod})
-
-        return data
-    
-    async def _fetch_ttf_curve(self, spot_price: Optional[float] = None) -> Dict[str, Any]:
-        """Fetch TTF (European gas) forward curve"""
-        periods = self._get_smart_periods()
-        prices = {'ttf': spot_price} if spot_price else {}
-        
-        return {
-            "name": "TTF",
-            "unit": "EUR/MWh",
-            "data": self._build_curve_data(periods, prices, 'ttf'),
-            "note": "Weekly updated from Constellation Energy" if spot_price else "Mock data"
-        }
-    
-    async def _fetch_jkm_curve(self, spot_price: Optional[float] = None) -> Dict[str, Any]:
-        """Fetch JKM (Asian LNG) forward curve"""
-        periods = self._get_smart_periods()
-        prices = {'jkm': spot_price} if spot_price else {}
-        
-        return {
-            "name": "JKM",
-            "unit": "USD/MMBtu",
-            "data": self._build_curve_data(periods, prices, 'jkm'),
-            "note": "Weekly updated from Constellation Energy" if spot_price else "Mock data"
-        }
-    
-    async def _fetch_brent_curve(self, spot_price: Optional[float] = None) -> Dict[str, Any]:
-        """Fetch Brent crude forward curve"""
-        periods = self._get_smart_periods()
-        prices = {'brent': spot_price} if spot_price else {}
-        
-        return {
-            "name": "Brent",
-            "unit": "USD/BBL",
-            "data": self._build_curve_data(periods, prices, 'brent'),
-            "note": "Weekly updated from Constellation Energy" if spot_price else "Mock data"
-        }
+        if live_spot is None:
+            return curve, False
+        lo, hi = reference_front * 0.5, reference_front * 1.5
+        if not lo <= live_spot <= hi:
+            logger.warning(f"Live spot {live_spot:.2f} for {commodity.upper()} outside "
+                           f"sanity bounds [{lo:.2f}, {hi:.2f}] — using static curve")
+            return curve, False
+        shift = live_spot - reference_front
+        logger.info(f"Forward curve {commodity.upper()} anchored to live spot "
+                    f"{live_spot:.2f} (shift {shift:+.2f} from reference {reference_front})")
+        return curve.shifted(shift), True
 
 
 class DashboardGenerator:
@@ -1277,6 +1404,11 @@ class DashboardGenerator:
         """Create HTML dashboard template"""
         
         # Helper functions for rendering
+        def as_of_label(details: Dict) -> str:
+            if not details.get('stale'):
+                return ""
+            return f' <span class="stale-age" title="Live source unavailable">as of {details.get("as_of", "?")}</span>'
+        
         def render_commodity(commodities: Dict) -> str:
             html = ""
             for name, details in commodities.items():
@@ -1285,7 +1417,7 @@ class DashboardGenerator:
                 
                 html += f"""
                 <div class="price-item">
-                    <div class="price-label">{name.upper()}</div>
+                    <div class="price-label">{name.upper()}{as_of_label(details)}</div>
                     <div class="price-details">
                         <div class="price-value">{details.get('price', 'N/A')} <span class="currency">{details.get('currency', '')}</span></div>
                         <div class="price-change {change_class}">
@@ -1306,7 +1438,7 @@ class DashboardGenerator:
                 
                 html += f"""
                 <div class="fx-item">
-                    <div class="fx-pair">{pair}</div>
+                    <div class="fx-pair">{pair}{as_of_label(details)}</div>
                     <div class="fx-details">
                         <div class="fx-rate">{details.get('rate', 'N/A'):.4f}</div>
                         <div class="fx-change {change_class}">{arrow} {change_symbol}{change_pct:.2f}%</div>
@@ -1342,12 +1474,14 @@ class DashboardGenerator:
                 dod = item.get('dod', 0)
                 dod_class = "positive" if dod >= 0 else "negative"
                 dod_symbol = "+" if dod >= 0 else ""
+                history = " | ".join(f"{label} {item[key]:+.2f}" for key, label in (('wow', 'WoW'), ('mom', 'MoM'))
+                                     if item.get(key) is not None)
                 
                 rows_html += f"""
                 <tr>
                     <td class="curve-period">{period}</td>
                     <td class="curve-price">{price:.2f}</td>
-                    <td class="curve-dod {dod_class}">{dod_symbol}{dod:.2f}</td>
+                    <td class="curve-dod {dod_class}" title="{history or 'No curve history yet'}">{dod_symbol}{dod:.2f}</td>
                 </tr>
                 """
             
@@ -1369,6 +1503,19 @@ class DashboardGenerator:
             </div>
             """
         
+        def stale_badge(section: str) -> str:
+            stale = data.get('stale', {}).get(section)
+            if not stale:
+                return ""
+            age = stale.get('age_minutes')
+            if age is None:
+                label = "UNAVAILABLE"
+            elif age < 120:
+                label = f"STALE · {age} min old"
+            else:
+                label = f"STALE · {age // 60}h old"
+            return f'<span class="stale-badge" title="Not refreshed: {stale.get("reason", "failed")}">{label}</span>'
+        
         # Get data sections
         commodities_data = data.get('commodities', {})
         forex_data = data.get('forex', {})
@@ -1449,6 +1596,19 @@ class DashboardGenerator:
             letter-spacing: 0.5px;
         }}
         
+        .stale-badge {{
+            float: right;
+            color: #d4a017;
+            font-size: 0.85em;
+            letter-spacing: 0;
+        }}
+        
+        .stale-age {{
+            color: #d4a017;
+            font-size: 0.8em;
+            text-transform: none;
+        }}
+        
         .price-item {{
             display: flex;
             justify-content: space-between;
@@ -1772,36 +1932,37 @@ class DashboardGenerator:
         <div class="dashboard-grid">
             <!-- Oil Prices -->
             <div class="card">
-                <div class="card-title">Oil Prices</div>
+                <div class="card-title">Oil Prices{stale_badge('commodities')}</div>
                 {render_commodity(commodities_data.get('commodities', {}).get('oil', {}))}
             </div>
             
             <!-- Gas Prices -->
             <div class="card">
-                <div class="card-title">Gas Prices</div>
+                <div class="card-title">Gas Prices{stale_badge('commodities')}</div>
                 {render_commodity(commodities_data.get('commodities', {}).get('gas', {}))}
             </div>
             
             <!-- Power Prices -->
             <div class="card">
-                <div class="card-title">Power Prices</div>
+                <div class="card-title">Power Prices{stale_badge('commodities')}</div>
                 {render_commodity(commodities_data.get('commodities', {}).get('power', {}))}
             </div>
             
             <!-- FX Rates -->
             <div class="card">
-                <div class="card-title">Foreign Exchange</div>
+                <div class="card-title">Foreign Exchange{stale_badge('forex')}</div>
                 {render_fx_rates(forex_data.get('rates', {}))}
             </div>
         </div>
         
         <!-- Forward Curves Section -->
         <div class="curves-section">
-            <div class="card-title">Forward Curves</div>
+            <div class="card-title">Forward Curves{stale_badge('forward_curves')}</div>
             <div class="curves-grid">
                 {render_forward_curve(curves_data.get('curves', {}).get('ttf', {}))}
                 {render_forward_curve(curves_data.get('curves', {}).get('jkm', {}))}
                 {render_forward_curve(curves_data.get('curves', {}).get('brent', {}))}
+                {render_forward_curve(curves_data['curves']['henry_hub']) if 'henry_hub' in curves_data.get('curves', {}) else ''}
             </div>
         </div>
         
@@ -1809,7 +1970,7 @@ class DashboardGenerator:
         <div class="bottom-grid">
             <!-- News Section -->
             <div class="news-section">
-                <div class="card-title">Market News</div>
+                <div class="card-title">Market News{stale_badge('news')}</div>
                 {render_news(news_data)}
             </div>
             
@@ -1863,38 +2024,381 @@ class DashboardGenerator:
         return html
 
 
-async def main():
-    """Main execution function"""
+# Per-dataset refresh policy, in seconds: a dataset is refetched once it is
+# older than its cadence, and cached data older than its ttl is never served
+DATASET_SCHEDULE = {
+    'forex': {'cadence': 15 * 60, 'ttl': 24 * 3600},
+    'commodities': {'cadence': 15 * 60, 'ttl': 24 * 3600},      # quotes intraday, JEPX daily
+    'news': {'cadence': 10 * 60, 'ttl': 6 * 3600},
+    'forward_curves': {'cadence': 12 * 3600, 'ttl': 8 * 24 * 3600}  # EIA weekly, FRED daily
+}
+
+# Inputs to the quotes rather than dashboard sections, so cached on their own
+# (reference_cache.json) and never rendered, flagged stale or polled
+INTERNAL_SCHEDULE = {
+    # Quorum cross-check of the quotes: scrapes every source, so far slower than a quote poll
+    'reference_prices': {'cadence': 3600, 'ttl': 24 * 3600}
+}
+
+
+class RefreshScheduler:
+    """Refetch each dashboard dataset on its own cadence.
+
+    Results are cached with their fetch time in dataset_cache.json, so a
+    scheduled run only hits the network for datasets whose cadence has
+    elapsed and merges the rest from the cache. A failed refetch, or one
+    that only produced placeholders (see is_live), keeps the cached copy
+    until its ttl runs out; placeholders are shown only when there is no
+    cached copy left, and are never cached.
+    """
+
+    def __init__(self, cache_file: Path = Path(__file__).parent / "dataset_cache.json",
+                 schedule: Optional[Dict[str, Dict[str, float]]] = None):
+        self.cache_file = Path(cache_file)
+        self.schedule = schedule or DATASET_SCHEDULE
+        self.fetchers: Dict[str, Callable[[], Awaitable[Any]]] = {}
+        self.cache: Dict[str, Dict[str, Any]] = self._load_cache()
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"Failed to load dataset cache: {e}")
+        return {}
+
+    def save(self):
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f, ensure_ascii=False)
+        except OSError as e:
+            logger.warning(f"Failed to save dataset cache: {e}")
+
+    def register(self, name: str, fetch: Callable[[], Awaitable[Any]]):
+        if name not in self.schedule:
+            raise ValueError(f"No refresh schedule for dataset '{name}'")
+        self.fetchers[name] = fetch
+
+    def age(self, name: str) -> Optional[float]:
+        """Seconds since the dataset was last fetched, None if never"""
+        entry = self.cache.get(name)
+        return time.time() - entry['fetched_at'] if entry else None
+
+    def due(self, name: str) -> bool:
+        age = self.age(name)
+        return age is None or age >= self.schedule[name]['cadence']
+
+    def cached(self, name: str) -> Optional[Any]:
+        """Cached copy of a dataset if it is not yet due for a refresh"""
+        return None if self.due(name) else self.cache[name]['data']
+    
+    def update(self, name: str, data: Any):
+        """Record a fresh copy of a dataset obtained outside refresh()"""
+        self.cache[name] = {'fetched_at': time.time(), 'data': data}
+
+    async def refresh(self, names: Optional[List[str]] = None, force: bool = False,
+                      deadline: Optional[Deadline] = None
+                      ) -> Tuple[Dict[str, Any], List[str], Dict[str, Dict[str, Any]]]:
+        """Refetch the due datasets among names (default: all registered).
+
+        Fetches still running when the deadline passes are cancelled. Returns
+        ({name: data} for every dataset that is fresh or still within its ttl,
+        [names actually refetched], {name: staleness} for each due dataset that
+        could not be refreshed - served from cache, or missing past its ttl).
+        """
+        names = list(names or self.fetchers)
+        due = [name for name in names if force or self.due(name)]
+        for name in names:
+            if name not in due:
+                logger.info(f"Schedule - {name}: cached, {self.age(name) / 60:.0f} min old")
+
+        tasks = {name: asyncio.ensure_future(self.fetchers[name]()) for name in due}
+        if tasks:
+            done, pending = await asyncio.wait(tasks.values(),
+                                               timeout=deadline.remaining() if deadline else None)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        refreshed = []
+        reasons = {}
+        placeholders = {}
+        for name, task in tasks.items():
+            if task.cancelled():
+                reasons[name] = 'deadline'
+            elif task.exception() is not None or not task.result():
+                reasons[name] = 'failed'
+            elif not is_live(task.result()):
+                reasons[name] = 'no live data'
+                placeholders[name] = task.result()
+            else:
+                self.update(name, task.result())
+                refreshed.append(name)
+                continue
+            logger.warning(f"Schedule - {name}: not refreshed ({reasons[name]}), keeping cached copy")
+        if refreshed:
+            self.save()
+
+        datasets = {}
+        stale = {}
+        for name in names:
+            age = self.age(name)
+            if name in reasons:
+                stale[name] = {'reason': reasons[name],
+                               'age_minutes': round(age / 60) if age is not None else None}
+            if age is not None and age > self.schedule[name]['ttl']:
+                logger.warning(f"Schedule - {name}: cached copy expired ({age / 3600:.1f}h old), dropping")
+                age = None
+            if age is not None:
+                datasets[name] = self.cache[name]['data']
+            elif name in placeholders:
+                datasets[name] = placeholders[name]
+        return datasets, refreshed, stale
+
+
+def is_live(data: Any) -> bool:
+    """Whether a fetched dataset holds anything from a live source: fetchers
+    set 'live': False on a dict built only from fallbacks, and mark fallback
+    list items (news) with 'placeholder': True"""
+    if not data:
+        return False
+    if isinstance(data, dict):
+        return data.get('live', True)
+    if isinstance(data, list):
+        return any(not (isinstance(item, dict) and item.get('placeholder')) for item in data)
+    return True
+
+
+def quote_entries(data: Dict[str, Any]) -> Dict[Tuple[str, ...], Dict]:
+    """Every quote card in a dashboard payload, keyed by its path
+    (e.g. ('forex', 'USDJPY') or ('commodities', 'gas', 'ttf'))"""
+    entries = {}
+    for pair, details in (data.get('forex') or {}).get('rates', {}).items():
+        entries[('forex', pair)] = details
+    for group, items in (data.get('commodities') or {}).get('commodities', {}).items():
+        for name, details in items.items():
+            entries[('commodities', group, name)] = details
+    return entries
+
+
+def _quote_value(details: Dict) -> Optional[float]:
+    return details.get('price', details.get('rate'))
+
+
+def _is_placeholder(details: Dict) -> bool:
+    """Last-known-good entries, which must never overwrite a live quote"""
+    return bool(details.get('stale'))
+
+
+class QuotePoller:
+    """Intraday mode: re-poll FX and commodity quotes on one warm session.
+
+    Each cycle is its own run for request coalescing and the data graph, so
+    quotes are fetched afresh, and gets the poll interval as its deadline so
+    a slow cycle can't run into the next. Only instruments whose value moved are merged into the dashboard
+    payload; the JSON/HTML outputs are rewritten only when something moved.
+    """
+
+    def __init__(self, http: HttpClient, graph: DataGraph, generator: 'DashboardGenerator',
+                 interval: float = 60, scheduler: Optional[RefreshScheduler] = None):
+        self.http = http
+        self.graph = graph
+        self.generator = generator
+        self.interval = interval
+        # News and curves keep their own (slower) cadence between quote polls
+        self.scheduler = scheduler
+
+    async def poll_once(self, dashboard_data: Dict[str, Any]) -> Dict[Tuple[str, ...], Dict]:
+        """Fetch quotes once, merge the instruments that changed and return them"""
+        self.http.begin_run()
+        self.graph.begin_run()
+        deadline = Deadline(self.interval)
+        self.http.deadline = deadline
+        try:
+            forex_data, commodities_data = await asyncio.wait_for(
+                asyncio.gather(self.graph.get('forex'), self.graph.get('commodities')),
+                timeout=deadline.remaining()
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Quote poll overran its {self.interval:g}s deadline")
+            self.graph.cancel_all()
+            self.http.flights.cancel_all()
+            return {}
+        fresh = {"forex": forex_data, "commodities": commodities_data}
+        for name in fresh:
+            if is_live(fresh[name]):
+                dashboard_data.get('stale', {}).pop(name, None)
+
+        current = quote_entries(dashboard_data)
+        changes = {}
+        for path, details in quote_entries(fresh).items():
+            if _is_placeholder(details):
+                continue
+            previous = current.get(path)
+            if previous is None or _quote_value(previous) != _quote_value(details):
+                changes[path] = details
+
+        for path, details in changes.items():
+            section = dashboard_data.setdefault(path[0], {})
+            section['live'] = True
+            if path[0] == 'forex':
+                section.setdefault('rates', {})[path[1]] = details
+            else:
+                section.setdefault('commodities', {}).setdefault(path[1], {})[path[2]] = details
+            previous = current.get(path)
+            old_value = _quote_value(previous) if previous else None
+            logger.info(f"Changed - {'.'.join(path[1:])}: {old_value} -> {_quote_value(details)}")
+
+        # The JEPX summary moves once a day; take it whenever the day-ahead date rolls
+        jepx = (commodities_data or {}).get('jepx')
+        if jepx and jepx != dashboard_data.get('commodities', {}).get('jepx'):
+            dashboard_data.setdefault('commodities', {})['jepx'] = jepx
+            changes[('commodities', 'jepx')] = jepx
+
+        if self.scheduler:
+            if changes:
+                self.scheduler.update('forex', dashboard_data.get('forex'))
+                self.scheduler.update('commodities', dashboard_data.get('commodities'))
+                self.scheduler.save()
+            others = [name for name in self.scheduler.fetchers if name not in ('forex', 'commodities')]
+            datasets, refreshed, stale = await self.scheduler.refresh(others, deadline=deadline)
+            self.graph.cancel_all()
+            self.http.flights.cancel_all()
+            stale_sections = dashboard_data.setdefault('stale', {})
+            for name in refreshed:
+                dashboard_data[name] = datasets[name]
+                stale_sections.pop(name, None)
+                changes[(name,)] = datasets[name]
+            stale_sections.update(stale)
+        return changes
+
+    async def run(self, dashboard_data: Dict[str, Any], max_polls: Optional[int] = None):
+        """Poll every interval seconds until cancelled (or max_polls cycles)"""
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            started = time.monotonic()
+            try:
+                changes = await self.poll_once(dashboard_data)
+            except Exception as e:
+                logger.error(f"Poll failed: {e}")
+                changes = {}
+            polls += 1
+
+            if changes:
+                now = datetime.now().isoformat()
+                dashboard_data["timestamp"] = now
+                self.generator.save_json(dashboard_data, "dashboard_data.json")
+                self.generator.save_json({
+                    "timestamp": now,
+                    "changes": {'.'.join(path): details for path, details in changes.items()}
+                }, "quote_deltas.json")
+                self.generator.generate_html(dashboard_data, "dashboard.html")
+                if self.http.cache:
+                    self.http.cache.save()
+            if self.http.health:
+                self.http.health.save()
+            logger.info(f"Poll {polls}: {len(changes)} instrument(s) changed")
+
+            if max_polls is not None and polls >= max_polls:
+                break
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+
+# Wall-clock budget for one dashboard build, in seconds
+RUN_BUDGET = 120
+
+
+async def main(poll_interval: Optional[float] = None, max_polls: Optional[int] = None,
+               refresh_all: bool = False, budget: float = RUN_BUDGET,
+               max_staleness_days: float = MAX_STALENESS_DAYS):
+    """Main execution function
+
+    Datasets are refetched per DATASET_SCHEDULE (all of them with
+    refresh_all). The build is bounded by budget seconds: whatever hasn't
+    arrived by then is cancelled and its section rendered from cache and
+    flagged stale. Instruments whose live source fails or is slow show their
+    last known real value, if no older than max_staleness_days. With poll_interval set, keep running after the first
+    build and re-poll quotes every poll_interval seconds on the same session.
+    """
     logger.info("Starting Commodities Dashboard Scraper...")
     
     # Initialize output directory
     generator = DashboardGenerator(output_dir="output")
     
-    # Force IPv4 to avoid intermittent IPv6 DNS failures
-    connector = aiohttp.TCPConnector(family=socket.AF_INET)
-    async with aiohttp.ClientSession(connector=connector) as session:
+    # One pooled, keep-alive session (IPv4 only) shared by every fetcher,
+    # with ETag/Last-Modified validators persisted between runs
+    http_cache = ValidatorCache()
+    source_health = SourceHealth()
+    reconciliation_log = ReconciliationLog()
+    price_store = PriceStore()
+    last_known = LastKnownGood(price_store, max_staleness_days)
+    deadline = Deadline(budget)
+    async with create_session() as session:
+        # Every request timeout follows the source's observed latency and is
+        # clamped to what is left of the run budget; failing sources are skipped
+        http = HttpClient(session, http_cache, deadline=deadline, health=source_health)
+        
         # Initialize fetchers
-        forex_fetcher = ForexFetcher(session)
-        commodities_fetcher = CommoditiesFetcher(session)
-        news_fetcher = NewsFetcher(session)
-        curves_fetcher = ForwardCurvesFetcher(session)
+        forex_fetcher = ForexFetcher(session, http, price_store)
+        commodities_fetcher = CommoditiesFetcher(session, http, price_store)
+        news_fetcher = NewsFetcher(session, http, price_store)
+        curves_fetcher = ForwardCurvesFetcher(session, http, price_store)
+        
+        scheduler = RefreshScheduler()
+        internal = RefreshScheduler(Path(__file__).parent / "reference_cache.json", INTERNAL_SCHEDULE)
+        
+        # The run as a graph of named data nodes, each computed once: curves
+        # anchor on the commodities' spot quotes and convert with the FX node
+        graph = DataGraph()
+        for fetcher in (forex_fetcher, commodities_fetcher, news_fetcher, curves_fetcher):
+            fetcher.graph = graph
+            fetcher.last_known = last_known
+            fetcher.fred = commodities_fetcher.fred
+            fetcher.reconciliation_log = reconciliation_log
+        
+        async def fx_rates() -> Dict[str, float]:
+            # A still-current scheduled copy saves refetching FX just for a conversion
+            forex_data = scheduler.cached('forex') or await graph.get('forex') or {}
+            return {pair: details['rate'] for pair, details in forex_data.get('rates', {}).items()}
+        
+        async def reference_prices() -> Dict[str, Dict]:
+            # Quote polls rebuild 'commodities', which cross-checks against this:
+            # reuse the scheduled reconciliation until its own cadence is up
+            cached = internal.cached('reference_prices')
+            if cached is not None:
+                return cached
+            reference = await curves_fetcher.fetch_reference_prices()
+            data = {instrument: result.to_dict() for instrument, result in reference.items()}
+            if data:
+                internal.update('reference_prices', data)
+                internal.save()
+            return data
+        
+        graph.add('forex', lambda: forex_fetcher.fetch_rates(['USD', 'EUR']))
+        graph.add('fx_rates', fx_rates)
+        graph.add('spot_quotes', commodities_fetcher.fetch_spot_quotes)
+        graph.add('jcc', commodities_fetcher.derive_jcc, deps=['spot_quotes'])
+        graph.add('lng_index', curves_fetcher._fetch_lng_price_index)
+        graph.add('reference_prices', reference_prices)
+        graph.add('commodities', commodities_fetcher.fetch_prices)
+        graph.add('news', lambda: news_fetcher.fetch_news(max_items=10))
+        graph.add('forward_curves', curves_fetcher.fetch_curves)
+        
+        # Each dataset has its own cadence; expired ones are fetched concurrently
+        for name in DATASET_SCHEDULE:
+            scheduler.register(name, lambda name=name: graph.get(name))
         
-        # Fetch all data concurrently
         logger.info("Fetching data from sources...")
-        forex_data, commodities_data, news_data, curves_data = await asyncio.gather(
-            forex_fetcher.fetch_rates(['USD', 'EUR']),
-            commodities_fetcher.fetch_prices(),
-            news_fetcher.fetch_news(max_items=10),
-            curves_fetcher.fetch_curves()
-        )
+        datasets, refreshed, stale = await scheduler.refresh(force=refresh_all, deadline=deadline)
+        logger.info(f"Refreshed {len(refreshed)}/{len(scheduler.fetchers)} datasets: {', '.join(refreshed) or 'none'}")
         
         # Compile all data
         dashboard_data = {
             "timestamp": datetime.now().isoformat(),
-            "forex": forex_data,
-            "commodities": commodities_data,
-            "forward_curves": curves_data,
-            "news": news_data
+            **datasets,
+            "stale": stale
         }
         
         # Save JSON
@@ -1903,10 +2407,57 @@ async def main():
         # Generate HTML dashboard
         generator.generate_html(dashboard_data, "dashboard.html")
         
+        # Scenario P&L of the book, if there is one, for the margin estimator
+        if BOOK_FILE.exists():
+            try:
+                positions = load_book(BOOK_FILE)
+                curves = latest_curves(curves_fetcher.snapshots, {p.commodity for p in positions})
+                generator.save_json(revalue_book(positions, curves), "portfolio_revaluation.json")
+            except Exception as e:
+                logger.warning(f"Portfolio revaluation failed: {e}")
+        
+        # Slow sources overtaken by last known values may finish within the
+        # budget; their results land in the price history for the next render
+        if len(last_known):
+            finished = await last_known.drain(deadline.remaining())
+            logger.info(f"{finished} background revalidation(s) completed")
+        
+        # Anything still in flight past the deadline is abandoned, not awaited
+        cancelled = graph.cancel_all() + http.flights.cancel_all()
+        if cancelled:
+            logger.warning(f"Run budget of {budget:g}s reached - cancelled {cancelled} pending fetch(es)")
+        
+        http_cache.save()
+        source_health.save()
+        reconciliation_log.save()
+        
         logger.info("Dashboard generation complete!")
         logger.info(f"Open 'output/dashboard.html' in your browser to view the dashboard")
+        
+        if poll_interval:
+            logger.info(f"Intraday mode: polling quotes every {poll_interval:g}s (Ctrl+C to stop)")
+            poller = QuotePoller(http, graph, generator, poll_interval, scheduler)
+            await asyncio.sleep(poll_interval)
+            await poller.run(dashboard_data, max_polls=max_polls)
+            reconciliation_log.save()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Generate the commodities dashboard")
+    parser.add_argument('--poll', type=float, metavar='SECONDS',
+                        help="keep running and re-poll FX/commodity quotes every SECONDS")
+    parser.add_argument('--max-polls', type=int, metavar='N',
+                        help="stop after N polls (default: run until interrupted)")
+    parser.add_argument('--refresh-all', action='store_true',
+                        help="refetch every dataset regardless of its refresh schedule")
+    parser.add_argument('--budget', type=float, default=RUN_BUDGET, metavar='SECONDS',
+                        help=f"wall-clock budget for a build; late sections render stale (default: {RUN_BUDGET})")
+    parser.add_argument('--max-staleness', type=float, default=MAX_STALENESS_DAYS, metavar='DAYS',
+                        help=f"oldest last-known value shown when a source fails (default: {MAX_STALENESS_DAYS})")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(poll_interval=args.poll, max_polls=args.max_polls, refresh_all=args.refresh_all,
+                         budget=args.budget, max_staleness_days=args.max_staleness))
+    except KeyboardInterrupt:
+        logger.info("Stopped")
 
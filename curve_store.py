@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Date-keyed forward-curve snapshots
+Each commodity's curves are one float32 matrix (snapshot dates x absolute
+delivery months) in a single .npz file, so years of daily curves take a few
+hundred KB and each period's history is a PriceSeries for the change columns.
+"""
+
+import logging
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from forward_curve import ContractCalendar, ForwardCurve
+from price_series import DAY, PriceSeries
+
+logger = logging.getLogger(__name__)
+
+CURVE_HISTORY_DIR = Path(__file__).parent / "curve_history"
+
+# Unix day 0 as a date ordinal, for snapshot timestamps
+EPOCH_DAY = date(1970, 1, 1).toordinal()
+
+
+def _day_number(date_str: str) -> int:
+    return date.fromisoformat(date_str).toordinal()
+
+
+def _date_str(day: int) -> str:
+    return date.fromordinal(int(day)).isoformat()
+
+
+class CurveHistory:
+    """Snapshots of one commodity's curve.
+
+    Columns are absolute delivery months (first_month is the ordinal
+    year * 12 + month - 1 of column 0), so a December contract stays in
+    the same column as the curve rolls forward; rows are snapshot dates,
+    ascending. Missing months are NaN.
+    """
+
+    def __init__(self, days: np.ndarray, first_month: int, prices: np.ndarray):
+        self.days = np.asarray(days, dtype=np.int32)
+        self.first_month = int(first_month)
+        self.prices = np.asarray(prices, dtype=np.float32)
+        if self.prices.ndim != 2 or len(self.prices) != len(self.days):
+            raise ValueError(f"Curve history has {self.prices.shape} prices for {len(self.days)} dates")
+
+    @classmethod
+    def empty(cls) -> 'CurveHistory':
+        return cls(np.zeros(0, dtype=np.int32), 0, np.zeros((0, 0), dtype=np.float32))
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def record(self, day: int, curve: ForwardCurve):
+        """Insert (or replace) the snapshot for day"""
+        first = int(curve.calendar.ordinals[0])
+        last = int(curve.calendar.ordinals[-1])
+        if len(self.days) == 0:
+            self.prices, self.first_month = np.zeros((0, last - first + 1), dtype=np.float32), first
+        # Widen the column range to take months the history hasn't seen
+        first_col = min(first, self.first_month)
+        last_col = max(last, self.first_month + self.prices.shape[1] - 1)
+        width = last_col - first_col + 1
+        if width != self.prices.shape[1]:
+            widened = np.full((len(self.days), width), np.nan, dtype=np.float32)
+            offset = self.first_month - first_col
+            widened[:, offset:offset + self.prices.shape[1]] = self.prices
+            self.prices, self.first_month = widened, first_col
+
+        row = np.full(width, np.nan, dtype=np.float32)
+        row[first - first_col:last - first_col + 1] = curve.prices
+        i = int(np.searchsorted(self.days, day))
+        if i < len(self.days) and self.days[i] == day:
+            self.prices[i] = row
+        else:
+            self.days = np.insert(self.days, i, day)
+            self.prices = np.insert(self.prices, i, row, axis=0)
+
+    @property
+    def calendar(self) -> ContractCalendar:
+        """Calendar of every delivery month the history has a column for"""
+        return ContractCalendar((self.first_month // 12, self.first_month % 12 + 1), self.prices.shape[1])
+
+    def on_or_before(self, day: int) -> Optional[int]:
+        """Row of the latest snapshot taken on or before day"""
+        i = int(np.searchsorted(self.days, day, side='right')) - 1
+        return i if i >= 0 else None
+
+    def period_series(self, periods: List[str]) -> Dict[str, PriceSeries]:
+        """Each period's average price in every snapshot, as a PriceSeries on
+        the snapshot dates (NaN where a snapshot didn't price the period)"""
+        weights = self.calendar.weights(periods)
+        known = ~np.isnan(self.prices)
+        totals = np.where(known, self.prices, 0.0) @ weights.T
+        counts = known @ weights.T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            averages = np.where(counts > 0, totals / counts, np.nan)
+        timestamps = (self.days.astype(np.int64) - EPOCH_DAY) * DAY
+        return {period: PriceSeries(timestamps, averages[:, i], period) for i, period in enumerate(periods)}
+
+    def curve(self, row: int, calendar: ContractCalendar) -> ForwardCurve:
+        """Snapshot row as a ForwardCurve on calendar (NaN where it had no price)"""
+        cols = calendar.ordinals - self.first_month
+        inside = (cols >= 0) & (cols < self.prices.shape[1])
+        values = np.full(len(calendar), np.nan)
+        values[inside] = self.prices[row, cols[inside]]
+        return ForwardCurve(calendar, values)
+
+
+class CurveSnapshotStore:
+    """Curve histories for every commodity, one .npz file each under directory"""
+
+    def __init__(self, directory: Path = CURVE_HISTORY_DIR):
+        self.directory = Path(directory)
+        self.histories: Dict[str, CurveHistory] = {}
+        self._dirty = set()
+
+    def _path(self, commodity: str) -> Path:
+        return self.directory / f"{commodity}.npz"
+
+    def history(self, commodity: str) -> CurveHistory:
+        history = self.histories.get(commodity)
+        if history is None:
+            history = CurveHistory.empty()
+            path = self._path(commodity)
+            if path.exists():
+                try:
+                    with np.load(path) as data:
+                        history = CurveHistory(data['days'], int(data['first_month']), data['prices'])
+                except Exception as e:
+                    logger.warning(f"Failed to load curve history for {commodity}: {e}")
+            self.histories[commodity] = history
+        return history
+
+    def record(self, commodity: str, date_str: str, curve: ForwardCurve):
+        """Store curve as commodity's snapshot for date_str (YYYY-MM-DD)"""
+        self.history(commodity).record(_day_number(date_str), curve)
+        self._dirty.add(commodity)
+
+    def save(self):
+        """Write every history that changed"""
+        for commodity in sorted(self._dirty):
+            history = self.histories[commodity]
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                np.savez_compressed(self._path(commodity), days=history.days,
+                                    first_month=np.int32(history.first_month), prices=history.prices)
+            except OSError as e:
+                logger.warning(f"Failed to save curve history for {commodity}: {e}")
+                continue
+            self._dirty.discard(commodity)
+
+    def snapshot(self, commodity: str, calendar: ContractCalendar,
+                 date_str: str) -> Optional[Tuple[str, ForwardCurve]]:
+        """(snapshot date, curve) of the latest snapshot on or before date_str"""
+        history = self.history(commodity)
+        row = history.on_or_before(_day_number(date_str))
+        if row is None:
+            return None
+        return _date_str(history.days[row]), history.curve(row, calendar)
+
+    def period_series(self, commodity: str, periods: List[str]) -> Dict[str, PriceSeries]:
+        """Stored history of each period's price; see CurveHistory.period_series"""
+        return self.history(commodity).period_series(periods)
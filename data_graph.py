@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Run-scoped dependency graph of named data nodes
+Spot quotes, FX, derived prices and whole dashboard sections are registered
+once; every consumer of a node shares the single computation of it.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from http_client import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class DataGraph:
+    """Named nodes computed at most once per run, as soon as their inputs are ready.
+
+    A node is an async function called with the values of its dependencies,
+    in the order they were declared. Dependencies must be registered before
+    the nodes that use them, which keeps the graph acyclic. Independent
+    nodes - and the dependencies of any one node - run concurrently.
+    Failures are not cached, so a later get() retries.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[str, Tuple[Callable[..., Awaitable[Any]], Tuple[str, ...]]] = {}
+        self.flights = SingleFlight()
+
+    def add(self, name: str, fn: Callable[..., Awaitable[Any]], deps: Iterable[str] = ()):
+        deps = tuple(deps)
+        missing = [dep for dep in deps if dep not in self.nodes]
+        if missing:
+            raise ValueError(f"Node '{name}' depends on unregistered node(s): {', '.join(missing)}")
+        if name in self.nodes:
+            raise ValueError(f"Node '{name}' is already registered")
+        self.nodes[name] = (fn, deps)
+
+    def begin_run(self):
+        """Forget computed values, e.g. for each cycle of a long-running poller"""
+        self.flights = SingleFlight()
+
+    def cancel_all(self) -> int:
+        """Cancel every node still computing, e.g. when the run deadline passes"""
+        return self.flights.cancel_all()
+
+    async def get(self, name: str) -> Any:
+        """Value of a node, computing it (and its dependencies) if needed"""
+        if name not in self.nodes:
+            raise KeyError(f"Unknown data node '{name}'")
+        return await self.flights.do(name, lambda: self._compute(name))
+
+    async def get_or_none(self, name: str) -> Optional[Any]:
+        """Value of a node, or None if it (or a dependency) failed"""
+        try:
+            return await self.get(name)
+        except Exception as e:
+            logger.warning(f"Data node '{name}' unavailable: {e}")
+            return None
+
+    async def _compute(self, name: str) -> Any:
+        fn, deps = self.nodes[name]
+        values = await asyncio.gather(*(self.get(dep) for dep in deps))
+        start = time.perf_counter()
+        try:
+            return await fn(*values)
+        finally:
+            logger.info(f"Timing - node {name}: {time.perf_counter() - start:.2f}s")
@@ -15,6 +15,9 @@ from datetime import datetime
 from typing import List, Dict, Any
 from pathlib import Path
 
+from http_client import HttpClient, ValidatorCache, create_session
+from source_health import CircuitOpenError, SourceHealth
+
 # ----------------------------- CONFIG -----------------------------
 logging.basicConfig(
     level=logging.INFO,
@@ -118,25 +121,33 @@ class NewsFetcher:
         "Accept": "application/rss+xml, text/xml;q=0.9, */*;q=0.8"
     }
 
+    http = None  # set by fetch_all: one pooled session for every feed
+
     async def fetch_url(self, url: str) -> str:
-        import aiohttp
-        timeout = aiohttp.ClientTimeout(total=20)
-        async with aiohttp.ClientSession(headers=self.headers, timeout=timeout) as session:
-            async with session.get(url) as resp:
-                if resp.status != 200:
-                    logger.warning(f"HTTP {resp.status} for {url}")
-                    return ""
-                return await resp.text()
+        # 304 Not Modified comes back as the cached body; known-broken feeds are skipped
+        try:
+            return await self.http.get_text(url, timeout=20) or ""
+        except CircuitOpenError as e:
+            logger.info(f"Skipping {url}: {e}")
+            return ""
 
     async def fetch_all(self) -> List[Dict[str, Any]]:
         seen_links = load_cache()
         all_news = []
         tasks = []
 
-        for name, url in NEWS_SOURCES:
-            tasks.append(self.process_source(name, url, seen_links))
+        http_cache = ValidatorCache()
+        source_health = SourceHealth()
+        async with create_session() as session:
+            self.http = HttpClient(session, http_cache, headers=self.headers, health=source_health)
+
+            for name, url in NEWS_SOURCES:
+                tasks.append(self.process_source(name, url, seen_links))
+
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        http_cache.save()
+        source_health.save()
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
         for result in results:
             if isinstance(result, Exception) or not isinstance(result, list):
                 continue
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Monthly forward curves as NumPy arrays
+A ContractCalendar fixes the delivery months once and precomputes which
+months make up each quarter, season or calendar strip; a ForwardCurve is one
+price per calendar month, so shifting, interpolating and aggregating a curve
+are single array operations.
+"""
+
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Month = Tuple[int, int]  # (year, month)
+
+
+def period_months(period: str) -> List[Month]:
+    """Delivery months of a strip: '27Q1' (Jan-Mar), '27Sum' (Apr-Sep),
+    '27Win' (Oct 2027 - Mar 2028) or '27Cal' (Jan-Dec)"""
+    match = re.fullmatch(r'(\d{2})(Q[1-4]|Sum|Win|Cal)', period)
+    if not match:
+        raise ValueError(f"Unknown curve period '{period}'")
+    year = 2000 + int(match.group(1))
+    kind = match.group(2)
+    if kind.startswith('Q'):
+        first = (int(kind[1]) - 1) * 3 + 1
+        return [(year, first + i) for i in range(3)]
+    if kind == 'Sum':
+        return [(year, month) for month in range(4, 10)]
+    if kind == 'Cal':
+        return [(year, month) for month in range(1, 13)]
+    return [(year, month) for month in range(10, 13)] + [(year + 1, month) for month in range(1, 4)]
+
+
+def _ordinal(month: Month) -> int:
+    return month[0] * 12 + month[1] - 1
+
+
+class ContractCalendar:
+    """Consecutive delivery months and the strip definitions over them.
+
+    weights(periods) is a (periods x months) 0/1 matrix, built once per
+    distinct period list and reused by every curve on this calendar.
+    """
+
+    def __init__(self, first: Month, count: int):
+        self.first_ordinal = _ordinal(first)
+        self.ordinals = self.first_ordinal + np.arange(count)
+        self._weights: Dict[Tuple[str, ...], np.ndarray] = {}
+
+    @classmethod
+    def covering(cls, periods: Iterable[str]) -> 'ContractCalendar':
+        """Calendar from the first to the last delivery month of periods"""
+        ordinals = [_ordinal(month) for period in periods for month in period_months(period)]
+        first = min(ordinals)
+        return cls((first // 12, first % 12 + 1), max(ordinals) - first + 1)
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    @property
+    def months(self) -> List[Month]:
+        return [(int(o) // 12, int(o) % 12 + 1) for o in self.ordinals]
+
+    def index(self, month: Month) -> Optional[int]:
+        """Position of month in the calendar, None outside it"""
+        i = _ordinal(month) - self.first_ordinal
+        return i if 0 <= i < len(self) else None
+
+    def weights(self, periods: Iterable[str]) -> np.ndarray:
+        periods = tuple(periods)
+        matrix = self._weights.get(periods)
+        if matrix is None:
+            matrix = np.zeros((len(periods), len(self)))
+            for row, period in enumerate(periods):
+                for month in period_months(period):
+                    i = self.index(month)
+                    if i is not None:
+                        matrix[row, i] = 1.0
+            self._weights[periods] = matrix
+        return matrix
+
+
+class ForwardCurve:
+    """One price per calendar month (NaN where unknown).
+
+    Operations return new curves; nothing is modified in place.
+    """
+
+    def __init__(self, calendar: ContractCalendar, prices: np.ndarray):
+        self.calendar = calendar
+        self.prices = np.asarray(prices, dtype=float)
+        if self.prices.shape != (len(calendar),):
+            raise ValueError(f"Curve has {self.prices.shape} prices for {len(calendar)} months")
+
+    @classmethod
+    def from_months(cls, calendar: ContractCalendar, prices: Dict[Month, float]) -> 'ForwardCurve':
+        """Curve from {(year, month): price}; months outside the calendar are ignored"""
+        values = np.full(len(calendar), np.nan)
+        for month, price in prices.items():
+            i = calendar.index(month)
+            if i is not None:
+                values[i] = price
+        return cls(calendar, values)
+
+    @classmethod
+    def from_periods(cls, calendar: ContractCalendar, periods: List[str], prices: Iterable[float]) -> 'ForwardCurve':
+        """Curve with each period's price on all of its months (later periods win overlaps)"""
+        weights = calendar.weights(periods).astype(bool)
+        values = np.full(len(calendar), np.nan)
+        for row, price in zip(weights, prices):
+            values[row] = price
+        return cls(calendar, values)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @property
+    def priced(self) -> int:
+        """Number of months with a price"""
+        return int(np.count_nonzero(~np.isnan(self.prices)))
+
+    def shifted(self, amount: Union[float, np.ndarray]) -> 'ForwardCurve':
+        """Parallel shift (scalar) or per-month shift (array)"""
+        return ForwardCurve(self.calendar, self.prices + amount)
+
+    def interpolated(self, extrapolate: bool = False) -> 'ForwardCurve':
+        """Missing months filled linearly between priced ones; beyond the first
+        and last priced month they stay missing unless extrapolate (flat)"""
+        known = np.flatnonzero(~np.isnan(self.prices))
+        if len(known) == 0 or len(known) == len(self):
+            return self
+        x = np.arange(len(self))
+        values = np.interp(x, known, self.prices[known])
+        if not extrapolate:
+            values[(x < known[0]) | (x > known[-1])] = np.nan
+        return ForwardCurve(self.calendar, values)
+
+    def aggregate(self, periods: List[str]) -> np.ndarray:
+        """Average price of each period over its priced months (NaN if none)"""
+        weights = self.calendar.weights(periods)
+        known = ~np.isnan(self.prices)
+        totals = weights @ np.where(known, self.prices, 0.0)
+        counts = weights @ known
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, totals / counts, np.nan)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Incremental reader for FRED (St. Louis Fed) daily series
+History is kept in the local PriceStore; each run only asks FRED for
+observations after the last stored date.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from price_series import PriceSeries
+from price_store import PriceStore, date_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Public CSV graph endpoint, no API key; cosd = first observation date wanted
+FRED_CSV_URL = "https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}"
+
+# Energy series the dashboard can draw on, by instrument
+FRED_SERIES = {
+    'brent': 'DCOILBRENTEU',  # Crude Oil Prices: Brent - Europe (USD/BBL)
+    'wti': 'DCOILWTICO',  # Crude Oil Prices: WTI - Cushing (USD/BBL)
+    'henry_hub': 'DHHNGSP',  # Henry Hub Natural Gas Spot Price (USD/MMBtu)
+}
+
+
+def parse_fred_csv(text: str) -> List[Tuple[int, float]]:
+    """(timestamp, value) rows from a fredgraph.csv body, skipping '.' gaps"""
+    points = []
+    for line in text.strip().splitlines()[1:]:
+        parts = line.split(',')
+        if len(parts) != 2:
+            continue
+        date_str, value_str = parts[0].strip(), parts[1].strip()
+        # FRED uses '.' (or an empty cell) to denote a missing observation
+        if not value_str or value_str == '.':
+            continue
+        try:
+            points.append((date_timestamp(date_str), float(value_str)))
+        except ValueError:
+            continue
+    return points
+
+
+class FredSeriesReader:
+    """Cached, incremental access to any FRED series by ID.
+
+    Observations are stored as 'fred_<SERIES_ID>' in the PriceStore. The
+    first refresh downloads the full history once; after that only rows
+    newer than the last stored date are requested, and latest() answers
+    from the in-memory tail.
+    """
+
+    def __init__(self, fetch_text: Callable[[str, int], Awaitable[Optional[str]]], store: PriceStore):
+        self.fetch_text = fetch_text
+        self.store = store
+
+    @staticmethod
+    def symbol(series_id: str) -> str:
+        return f"fred_{series_id}"
+
+    async def refresh(self, series_id: str, timeout: int = 20) -> Optional[int]:
+        """Fetch observations after the last stored one; returns rows added, None on failure"""
+        url = FRED_CSV_URL.format(series_id=series_id)
+        last = self.store.last_timestamp(self.symbol(series_id))
+        if last is not None:
+            start = datetime.fromtimestamp(last, tz=timezone.utc) + timedelta(days=1)
+            url += f"&cosd={start.strftime('%Y-%m-%d')}"
+
+        text = await self.fetch_text(url, timeout)
+        if text is None:
+            return None
+        added = self.store.append(self.symbol(series_id), parse_fred_csv(text))
+        logger.info(f"FRED {series_id}: {added} new observation(s)")
+        return added
+
+    def latest(self, series_id: str) -> Optional[Tuple[str, float]]:
+        """(YYYY-MM-DD, value) of the most recent stored observation"""
+        latest = self.store.latest(self.symbol(series_id))
+        if latest is None:
+            return None
+        ts, value = latest
+        return datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%Y-%m-%d'), value
+
+    def series(self, series_id: str) -> PriceSeries:
+        return PriceSeries.from_store(self.store, self.symbol(series_id))
+
+    async def fetch_latest(self, series_id: str, timeout: int = 20) -> Optional[Tuple[str, float]]:
+        """Refresh, then return the latest observation (stored data if FRED is down)"""
+        try:
+            await self.refresh(series_id, timeout)
+        except Exception as e:
+            logger.warning(f"Could not refresh FRED {series_id}: {e}")
+        return self.latest(series_id)
@@ -12,6 +12,9 @@ import re
 from datetime import datetime
 from pathlib import Path
 
+from http_client import HttpClient, ValidatorCache, create_session
+from source_health import CircuitOpenError, SourceHealth
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -60,12 +63,14 @@ def smart_date(entry):
 class NewsFetcher:
     headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/131 Safari/537.36"}
 
+    http = None  # set by run(): one pooled session for every feed
+
     async def fetch(self, url):
-        import aiohttp
-        timeout = aiohttp.ClientTimeout(total=20)
-        async with aiohttp.ClientSession(headers=self.headers) as s:
-            async with s.get(url, timeout=timeout) as r:
-                return await r.text() if r.status == 200 else ""
+        try:
+            return await self.http.get_text(url, timeout=20) or ""
+        except CircuitOpenError as e:
+            logger.info(f"Skipping {url}: {e}")
+            return ""
 
     async def process(self, name, url, seen):
         content = await self.fetch(url)
@@ -101,8 +106,14 @@ class NewsFetcher:
 
     async def run(self):
         seen = load_cache()
-        tasks = [self.process(name, url, seen) for name, url in NEWS_SOURCES]
-        results = await asyncio.gather(*tasks)
+        http_cache = ValidatorCache()
+        source_health = SourceHealth()
+        async with create_session() as session:
+            self.http = HttpClient(session, http_cache, headers=self.headers, health=source_health)
+            tasks = [self.process(name, url, seen) for name, url in NEWS_SOURCES]
+            results = await asyncio.gather(*tasks)
+        http_cache.save()
+        source_health.save()
         all_news = [item for sublist in results for item in sublist]
         all_news.sort(key=lambda x: x['date_sort'], reverse=True)
 
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Forward curves from individual monthly futures contracts
+Every contract month of every curve is requested in one batched Yahoo pass,
+cached by trading date and returned as monthly strips for the dashboard's
+quarter and season periods. Intraday refreshes only re-request the front months.
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from forward_curve import Month
+from yahoo_quotes import YahooChartClient
+
+logger = logging.getLogger(__name__)
+
+CURVE_CACHE_FILE = Path(__file__).parent / "futures_curves.json"
+
+# Futures month codes, January first
+MONTH_CODES = "FGHJKMNQUVXZ"
+
+# Yahoo symbol roots of the monthly contracts: <root><month code><yy>.NYM
+CONTRACT_ROOTS = {
+    'brent': 'BZ',       # Brent Last Day Financial, USD/BBL
+    'henry_hub': 'NG',   # Henry Hub natural gas, USD/MMBtu
+    'ttf': 'TFM',        # Dutch TTF natural gas, EUR/MWh
+    'jkm': 'JKM'         # LNG Japan/Korea Marker (Platts), USD/MMBtu
+}
+EXCHANGE_SUFFIX = ".NYM"
+
+# Contracts re-requested on every refresh within a trading day
+FRONT_MONTHS = 3
+
+# A contract whose last bar is older than this has expired or stopped trading
+MAX_BAR_AGE_DAYS = 7
+
+# Contract requests in flight at once: they share query1.finance.yahoo.com
+# (and its per-host connection cap) with the spot quotes
+STRIP_CONCURRENCY = 3
+
+
+def contract_symbol(commodity: str, year: int, month: int) -> str:
+    """Yahoo symbol of one monthly contract, e.g. ('brent', 2027, 3) -> 'BZH27.NYM'"""
+    return f"{CONTRACT_ROOTS[commodity]}{MONTH_CODES[month - 1]}{year % 100:02d}{EXCHANGE_SUFFIX}"
+
+
+def trading_date(now: Optional[datetime] = None) -> str:
+    """UTC trading date; weekends count as the preceding Friday"""
+    now = now or datetime.now(timezone.utc)
+    weekday = now.weekday()
+    if weekday >= 5:
+        now -= timedelta(days=weekday - 4)
+    return now.strftime('%Y-%m-%d')
+
+
+class FuturesCurveBuilder:
+    """Monthly futures strips for several commodities, cached by trading date.
+
+    The cache (futures_curves.json) holds the price of every contract
+    requested on the current trading date. Contracts
+    without a price (not listed, not traded lately, or a failed request) are
+    asked for again on the next refresh.
+    """
+
+    def __init__(self, yahoo: YahooChartClient, cache_file: Path = CURVE_CACHE_FILE,
+                 front_months: int = FRONT_MONTHS):
+        self.yahoo = yahoo
+        self.cache_file = Path(cache_file)
+        self.front_months = front_months
+        self.cache = self._load_cache()
+
+    def _load_cache(self) -> Dict:
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"Failed to load futures curve cache: {e}")
+        return {'trading_date': None, 'contracts': {}}
+
+    def _save_cache(self):
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f, indent=2)
+        except OSError as e:
+            logger.warning(f"Failed to save futures curve cache: {e}")
+
+    def _roll(self, date: str):
+        """Start a new trading date: every contract is requested afresh"""
+        if self.cache['trading_date'] != date:
+            self.cache.update(trading_date=date, contracts={})
+
+    async def build(self, commodities: Iterable[str], months: List[Month],
+                    timeout: int = 10) -> Dict[str, Dict[Month, float]]:
+        """{commodity: {(year, month): price}} for the requested contract months.
+
+        All contracts that need fetching, across every commodity, go out as
+        one batch through the YahooChartClient (which the caller should give
+        a concurrency limit): everything on a new trading date, otherwise
+        only the front months plus contracts not yet priced today.
+        """
+        commodities = list(commodities)
+        months = sorted(months)
+        date = trading_date()
+        self._roll(date)
+        contracts = self.cache['contracts']
+
+        to_fetch = []
+        for commodity in commodities:
+            for i, (year, month) in enumerate(months):
+                symbol = contract_symbol(commodity, year, month)
+                if i < self.front_months or symbol not in contracts:
+                    to_fetch.append(symbol)
+
+        if to_fetch:
+            quotes = await self.yahoo.fetch(to_fetch, range_="5d", timeout=timeout)
+            oldest = (datetime.now(timezone.utc) - timedelta(days=MAX_BAR_AGE_DAYS)).timestamp()
+            for symbol in to_fetch:
+                series = quotes.get(symbol)
+                if series and series.timestamps[-1] >= oldest:
+                    contracts[symbol] = series.last
+            logger.info(f"Futures curves ({date}): requested {len(to_fetch)} contract(s), "
+                        f"{sum(1 for s in to_fetch if s in contracts)} priced")
+            self._save_cache()
+
+        return {commodity: self._strip(commodity, months, contracts) for commodity in commodities}
+
+    @staticmethod
+    def _strip(commodity: str, months: List[Month], contracts: Dict[str, float]) -> Dict[Month, float]:
+        strip = {}
+        for year, month in months:
+            price = contracts.get(contract_symbol(commodity, year, month))
+            if price is not None:
+                strip[(year, month)] = price
+        return strip
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Hedged requests for primary/backup source pairs
+The backup only starts once the primary has been slower than usual, so tail
+latency is bounded by max(primary p90, backup) instead of their sum. For
+sources cheap enough to all start at once, prioritized() picks the best
+answer by priority rather than by arrival.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Hedge delay used until the primary has enough latency history
+DEFAULT_HEDGE_DELAY = 3.0
+
+
+def _result(task: asyncio.Future) -> Any:
+    """Task result, or None if it failed or was cancelled"""
+    if task.cancelled():
+        return None
+    if task.exception() is not None:
+        logger.debug(f"Hedged call failed: {task.exception()}")
+        return None
+    return task.result()
+
+
+async def hedged(primary: Callable[[], Awaitable[Optional[T]]],
+                 backup: Callable[[], Awaitable[Optional[T]]],
+                 delay: float = DEFAULT_HEDGE_DELAY,
+                 valid: Callable[[Any], bool] = bool,
+                 name: str = '') -> Optional[T]:
+    """First valid result of primary and backup.
+
+    primary starts at once; backup starts when primary has not produced a
+    valid result after delay seconds (or immediately after it fails). As soon
+    as either returns a valid result the other is cancelled. If neither is
+    valid, the first non-None result (e.g. a partial one) is returned.
+    """
+    tasks = {asyncio.ensure_future(primary()): 'primary'}
+    fallback = None
+    backup_started = False
+    try:
+        timeout = delay
+        while tasks:
+            done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                label = tasks.pop(task)
+                result = _result(task)
+                if result is not None and valid(result):
+                    if backup_started:
+                        logger.info(f"Hedge {name}: {label} won")
+                    return result
+                if fallback is None:
+                    fallback = result
+            if not backup_started and (not done or not tasks):
+                # Primary is slow (timeout) or has already failed: start the backup
+                logger.info(f"Hedge {name}: primary {'failed' if done else f'slower than {delay:.1f}s'}, "
+                            f"starting backup")
+                tasks[asyncio.ensure_future(backup())] = 'backup'
+                backup_started = True
+            timeout = None
+        return fallback
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def prioritized(calls: List[Tuple[str, Callable[[], Awaitable[Optional[T]]]]],
+                      valid: Callable[[Any], bool] = bool,
+                      wait: Optional[float] = None,
+                      name: str = '') -> Optional[Tuple[str, T]]:
+    """(label, result) of the highest-priority call with a valid result.
+
+    calls is a list of (label, call), highest priority first, all started
+    together. A valid answer cancels every lower-priority call; it is
+    returned as soon as no higher-priority call is still running. After
+    wait seconds the best answer so far is returned (None if there is none)
+    and whatever is left is cancelled.
+    """
+    tasks = [asyncio.ensure_future(call()) for _, call in calls]
+    best: Optional[int] = None
+    loop = asyncio.get_running_loop()
+    give_up = None if wait is None else loop.time() + wait
+    try:
+        while True:
+            pending = [task for task in tasks[:best] if not task.done()]
+            if not pending:
+                break
+            timeout = None if give_up is None else max(0.0, give_up - loop.time())
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                logger.info(f"{name}: gave up waiting after {wait:g}s for higher-priority sources")
+                break
+            for task in done:
+                i = tasks.index(task)
+                result = _result(task)
+                if result is not None and valid(result) and (best is None or i < best):
+                    best = i
+                    for lower in tasks[i + 1:]:
+                        lower.cancel()
+        if best is None:
+            return None
+        return calls[best][0], tasks[best].result()
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Bounded-scan extraction of a few values from large HTML pages
+Each target is an anchor phrase plus a precompiled pattern that is only
+tried within a short window after the anchor, so no regex ever scans (or
+backtracks over) the whole document. Pages can be fed in chunks; reading
+stops as soon as every target has been found.
+"""
+
+import re
+from typing import Dict, Iterable, NamedTuple, Optional, Pattern
+
+
+class Target(NamedTuple):
+    """One value to extract.
+
+    anchor is a literal phrase (matched case-insensitively); pattern is
+    searched in the window characters following it and its first group is
+    the value. With adjacent, pattern must match right after the anchor.
+    Later occurrences of the anchor are tried if one has no match.
+    """
+    name: str
+    anchor: str
+    pattern: Pattern
+    window: int = 400
+    adjacent: bool = False
+
+
+class PageExtractor:
+    """The targets of one page; scan() starts a fresh extraction.
+
+    Instances are immutable and meant to be module-level constants, so they
+    can also key request coalescing for the page.
+    """
+
+    def __init__(self, targets: Iterable[Target]):
+        self.targets = tuple(targets)
+
+    def scan(self) -> 'ExtractionScan':
+        return ExtractionScan(self.targets)
+
+    def extract(self, text: str, chunk_size: int = 65536) -> Dict[str, str]:
+        """Extract from a complete document, stopping once every target is found"""
+        scan = self.scan()
+        for i in range(0, len(text), chunk_size):
+            if scan.feed(text[i:i + chunk_size]):
+                break
+        return scan.finish()
+
+
+class ExtractionScan:
+    """Incremental state of one extraction.
+
+    Only the text from the earliest position still needed by an unresolved
+    target is kept, so memory stays bounded however long the page is.
+    """
+
+    def __init__(self, targets: Iterable[Target]):
+        self.pending = {target.name: target for target in targets}
+        self.results: Dict[str, str] = {}
+        self._buffer = ""
+        self._lower = ""
+        self._scan_from = {name: 0 for name in self.pending}
+
+    @property
+    def done(self) -> bool:
+        return not self.pending
+
+    def feed(self, chunk: str) -> bool:
+        """Add the next chunk of the page; True once every target is found"""
+        self._buffer += chunk
+        self._lower += chunk.lower()
+        self._search(final=False)
+        self._trim()
+        return self.done
+
+    def finish(self) -> Dict[str, str]:
+        """End of the page: resolve what can be, return {name: value}"""
+        self._search(final=True)
+        self.pending.clear()
+        self._buffer = self._lower = ""
+        return self.results
+
+    def _search(self, final: bool):
+        for name, target in list(self.pending.items()):
+            anchor = target.anchor.lower()
+            pos = self._scan_from[name]
+            while True:
+                at = self._lower.find(anchor, pos)
+                if at < 0:
+                    # Keep the tail an anchor split across chunks could start in
+                    self._scan_from[name] = max(pos, len(self._lower) - len(anchor) + 1)
+                    break
+                start = at + len(anchor)
+                end = start + target.window
+                if end > len(self._buffer) and not final:
+                    # Window not fully received yet; retry from this anchor
+                    self._scan_from[name] = at
+                    break
+                if target.adjacent:
+                    match = target.pattern.match(self._buffer, start, min(end, len(self._buffer)))
+                else:
+                    match = target.pattern.search(self._buffer, start, min(end, len(self._buffer)))
+                if match:
+                    self.results[name] = match.group(1)
+                    del self.pending[name]
+                    break
+                pos = at + 1
+
+    def _trim(self):
+        keep_from = min(self._scan_from[name] for name in self.pending) if self.pending else len(self._buffer)
+        if keep_from > 0:
+            self._buffer = self._buffer[keep_from:]
+            self._lower = self._lower[keep_from:]
+            for name in self.pending:
+                self._scan_from[name] -= keep_from
+
+
+def parse_price(value: Optional[str]) -> Optional[float]:
+    """Float from an extracted price string, None if absent or malformed"""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+# ---------------------------------------------------------------- pages
+EIA_WEEKLY = PageExtractor([
+    # "... Title Transfer Facility ... increased $X.XX/MMBtu to a weekly average of $Y.YY/MMBtu"
+    Target('ttf', 'Title Transfer Facility',
+           re.compile(r'\$[\d.]+/MMBtu to a weekly average of \$([\d.]+)/MMBtu', re.IGNORECASE), window=600),
+    Target('jkm', 'East Asia',
+           re.compile(r'\$[\d.]+/MMBtu to a weekly average of \$([\d.]+)/MMBtu', re.IGNORECASE), window=600)
+])
+
+LNG_PRICE_INDEX = PageExtractor([
+    # Ticker banner: "JKM $17.15", "TTF $15.28" (both USD/MMBtu)
+    Target('jkm', 'JKM', re.compile(r'\s*\$([\d.]+)'), window=40, adjacent=True),
+    Target('ttf', 'TTF', re.compile(r'\s*\$([\d.]+)'), window=40, adjacent=True)
+])
+
+CONSTELLATION = PageExtractor([
+    Target('ttf', 'TTF (EU LNG) prompt settled', re.compile(r' \$([\d.]+)/MMbtu'), window=40, adjacent=True),
+    Target('jkm', 'JKM (Asia LNG) prompt settled at', re.compile(r' \$([\d.]+)/MMbtu'), window=40, adjacent=True)
+])
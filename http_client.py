@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP layer for the dashboard and news fetchers
+One pooled aiohttp session per run plus a persisted ETag/Last-Modified cache
+"""
+
+import asyncio
+import codecs
+import hashlib
+import json
+import logging
+import socket
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+import aiohttp
+
+from html_extract import PageExtractor
+from source_health import SourceHealth
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(__file__).parent / "http_cache"
+
+# Bytes read per step when a body is scanned as it streams in
+STREAM_CHUNK_SIZE = 16384
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# urllib fallback runs on its own small pool: a dead host ties up one worker
+# thread instead of the event loop, and can't starve the default executor
+FALLBACK_WORKERS = 4
+_fallback_executor = ThreadPoolExecutor(max_workers=FALLBACK_WORKERS,
+                                        thread_name_prefix="urllib-fallback")
+
+
+def create_session(headers: Optional[Dict[str, str]] = None,
+                   limit: int = 32,
+                   limit_per_host: int = 4,
+                   keepalive_timeout: float = 60) -> aiohttp.ClientSession:
+    """Create the pooled session every fetcher in a run should share.
+
+    Connections are kept alive between requests to the same host, capped per
+    host so one slow site can't take the whole pool, and DNS answers are
+    cached for the lifetime of the session. IPv4 is forced to avoid the
+    intermittent IPv6 DNS failures seen on the Windows box.
+    """
+    connector = aiohttp.TCPConnector(
+        family=socket.AF_INET,
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=300
+    )
+    return aiohttp.ClientSession(connector=connector, headers=headers)
+
+
+class ValidatorCache:
+    """Persisted HTTP validators (ETag / Last-Modified) and their bodies.
+
+    The index lives in cache_dir/index.json; each body is stored in its own
+    file named by the SHA-1 of the URL so large downloads (JEPX, FRED) don't
+    bloat the index. Call save() once at the end of a run.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.index_file = self.cache_dir / "index.json"
+        self.entries: Dict[str, Dict[str, str]] = self._load_index()
+        self._dirty = False
+
+    def _load_index(self) -> Dict[str, Dict[str, str]]:
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"Failed to load HTTP cache index: {e}")
+        return {}
+
+    def _body_path(self, url: str) -> Path:
+        return self.cache_dir / (hashlib.sha1(url.encode('utf-8')).hexdigest() + ".body")
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Validator headers for url, empty if we have nothing usable cached"""
+        entry = self.entries.get(url)
+        if not entry or not self._body_path(url).exists():
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load_body(self, url: str) -> Optional[str]:
+        """Return the cached body for url, or None if it isn't on disk"""
+        path = self._body_path(url)
+        try:
+            return path.read_text(encoding='utf-8')
+        except OSError:
+            return None
+
+    def store(self, url: str, response_headers, body: str):
+        """Remember body and its validators; responses without validators are skipped"""
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._body_path(url).write_text(body, encoding='utf-8')
+            self.entries[url] = {
+                'etag': etag or '',
+                'last_modified': last_modified or '',
+                'fetched': datetime.now().isoformat()
+            }
+            self._dirty = True
+        except OSError as e:
+            logger.warning(f"Failed to cache body for {url}: {e}")
+
+    def save(self):
+        """Write the validator index to disk if anything changed"""
+        if not self._dirty:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.index_file, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=2)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Failed to save HTTP cache index: {e}")
+
+
+class Deadline:
+    """Wall-clock budget for a whole run.
+
+    Hands out per-request timeouts that never run past the end of the
+    budget, so one slow source can't push the run over it.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def clamp(self, timeout: float) -> float:
+        """timeout, cut down to what is left of the budget; raises
+        asyncio.TimeoutError if the budget is already spent"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise asyncio.TimeoutError(f"run deadline of {self.seconds:g}s exceeded")
+        return min(timeout, remaining)
+
+
+def headers_key(headers: Optional[Dict[str, str]]) -> Tuple[Tuple[str, str], ...]:
+    """Hashable form of request headers, for coalescing keys"""
+    return tuple(sorted((headers or {}).items()))
+
+
+class SingleFlight:
+    """Coalesce concurrent and repeated calls for the same key within a run.
+
+    The first caller for a key starts the work; everyone else - whether they
+    arrive while it is in flight or after it finished - gets the same result.
+    Failures (an exception raised by the work) are not remembered, so a later
+    caller can try again; anything returned, None included, is a result.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(fn())
+            call.add_done_callback(lambda f: self._forget_failure(key, f))
+            self._calls[key] = call
+        # shield: one caller timing out must not cancel the shared download
+        return await asyncio.shield(call)
+
+    def cancel_all(self) -> int:
+        """Cancel every call still in flight; returns how many were cancelled"""
+        pending = [call for call in self._calls.values() if not call.done()]
+        for call in pending:
+            call.cancel()
+        return len(pending)
+
+    def _forget_failure(self, key: Hashable, call: asyncio.Future):
+        if call.cancelled() or call.exception() is not None:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+
+class HttpClient:
+    """Conditional-GET client on top of a shared session.
+
+    GETs for the same URL are coalesced through flights, which fetchers can
+    also use to share parsed results (e.g. the JEPX CSV) for the run.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession,
+                 cache: Optional[ValidatorCache] = None,
+                 headers: Optional[Dict[str, str]] = None,
+                 deadline: Optional[Deadline] = None,
+                 health: Optional[SourceHealth] = None):
+        self.session = session
+        self.cache = cache
+        self.headers = headers if headers is not None else dict(DEFAULT_HEADERS)
+        # Optional run budget; every request timeout is clamped to what is left
+        self.deadline = deadline
+        # Optional per-source breakers; timeouts then follow observed latency
+        self.health = health
+        self.flights = SingleFlight()
+
+    def begin_run(self):
+        """Start a fresh coalescing scope, e.g. for each cycle of a long-running poller"""
+        self.flights = SingleFlight()
+
+    async def get_text(self, url: str, timeout: float = 30,
+                       headers: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """GET url and return its body, serving 304 Not Modified from the cache.
+
+        Returns None for any other non-200 status. Network errors propagate so
+        callers can decide whether to try another transport; a source whose
+        circuit breaker is open raises CircuitOpenError without a request.
+        Concurrent and repeated calls for the same URL and headers share a
+        single download.
+        """
+        return await self.flights.do(('GET', url, headers_key(headers)), lambda: self._get_text(url, timeout, headers))
+
+    async def extract(self, url: str, extractor: PageExtractor, timeout: float = 30,
+                      headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """GET url and return extractor's values from its body.
+
+        The body is decoded and scanned as it streams in, and the download is
+        abandoned as soon as every target has been found, so a value near the
+        top of a large page costs only the bytes up to it. A 304 is scanned
+        from the cached body; a body is only cached when read in full. Returns
+        {} for any other non-200 status; errors propagate as for get_text.
+        """
+        found = await self.flights.do(('EXTRACT', url, extractor, headers_key(headers)),
+                                      lambda: self._tracked(url, timeout,
+                                                            lambda t: self._extract(url, extractor, t, headers)))
+        return found or {}
+
+    async def stream(self, url: str, handle: Callable[[aiohttp.ClientResponse], Awaitable[Optional[Any]]],
+                     timeout: float = 30, headers: Optional[Dict[str, str]] = None) -> Optional[Any]:
+        """GET url with extra headers (e.g. Range) and return handle(response).
+
+        handle reads the open response however it needs and returns None when
+        the reply is unusable. The request gets the source's breaker and the
+        run deadline like get_text, but is neither coalesced nor made
+        conditional: a partial reply only makes sense to the caller that
+        asked for it. Errors propagate.
+        """
+        async def request(t: float) -> Optional[Any]:
+            async with self.session.get(url, headers=self._request_headers(url, headers, conditional=False),
+                                        timeout=aiohttp.ClientTimeout(total=t)) as response:
+                return await handle(response)
+        return await self._tracked(url, timeout, request)
+
+    async def _get_text(self, url: str, timeout: float,
+                        headers: Optional[Dict[str, str]]) -> Optional[str]:
+        return await self._tracked(url, timeout, lambda t: self._request(url, t, headers))
+
+    async def _tracked(self, url: str, timeout: float,
+                       request: Callable[[float], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        """Run request(timeout) under the source's breaker, timeout and the run deadline"""
+        if self.deadline:
+            # Before check(): a spent budget must not leave a probe half-open
+            timeout = self.deadline.clamp(timeout)
+        if not self.health:
+            return await request(timeout)
+        self.health.check(url)
+        timeout = self.health.timeout(url, timeout)
+        if self.deadline:
+            timeout = self.deadline.clamp(timeout)
+
+        start = time.monotonic()
+        try:
+            result = await request(timeout)
+        except Exception as e:
+            # A request cut short by the run deadline says nothing about the source
+            if self.deadline and self.deadline.expired:
+                self.health.release(url)
+            else:
+                timed_out = isinstance(e, asyncio.TimeoutError)
+                self.health.record_failure(url, str(e) or type(e).__name__,
+                                           time.monotonic() - start, timed_out=timed_out)
+            raise
+        except BaseException:
+            # Cancelled (poll timeout, end-of-run cancel_all): no verdict either
+            self.health.release(url)
+            raise
+        if result is None:
+            self.health.record_failure(url, "no usable response")
+        else:
+            self.health.record_success(url, time.monotonic() - start)
+        return result
+
+    def _request_headers(self, url: str, headers: Optional[Dict[str, str]],
+                         conditional: bool = True) -> Dict[str, str]:
+        request_headers = dict(self.headers)
+        if headers:
+            request_headers.update(headers)
+        if conditional and self.cache:
+            request_headers.update(self.cache.conditional_headers(url))
+        return request_headers
+
+    async def _extract(self, url: str, extractor: PageExtractor, timeout: float,
+                       headers: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        async with self.session.get(url, headers=self._request_headers(url, headers),
+                                    timeout=client_timeout) as response:
+            if response.status == 304 and self.cache:
+                body = self.cache.load_body(url)
+                if body is not None:
+                    logger.debug(f"304 Not Modified: {url} (extracted from cache)")
+                    return extractor.extract(body)
+                logger.warning(f"304 for {url} but cached body is missing")
+                return None
+            if response.status != 200:
+                logger.warning(f"Failed to fetch {url}: Status {response.status}")
+                return None
+
+            scan = extractor.scan()
+            decoder = codecs.getincrementaldecoder(_stream_encoding(response))(errors='replace')
+            # The full body is only kept when it can go into the validator cache
+            keep = self.cache is not None and bool(response.headers.get('ETag') or
+                                                   response.headers.get('Last-Modified'))
+            parts = []
+            received = 0
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                received += len(chunk)
+                text = decoder.decode(chunk)
+                if keep:
+                    parts.append(text)
+                if scan.feed(text):
+                    logger.debug(f"Extracted {len(scan.results)} value(s) from {url} "
+                                 f"after {received / 1024:.0f} KB")
+                    return scan.finish()
+            text = decoder.decode(b'', final=True)
+            scan.feed(text)
+            if keep:
+                self.cache.store(url, response.headers, ''.join(parts) + text)
+            return scan.finish()
+
+    async def _request(self, url: str, timeout: float,
+                       headers: Optional[Dict[str, str]]) -> Optional[str]:
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        async with self.session.get(url, headers=self._request_headers(url, headers),
+                                    timeout=client_timeout) as response:
+            if response.status == 304 and self.cache:
+                body = self.cache.load_body(url)
+                if body is not None:
+                    logger.debug(f"304 Not Modified: {url} (served from cache)")
+                    return body
+                logger.warning(f"304 for {url} but cached body is missing")
+                return None
+            if response.status == 200:
+                text = await response.text()
+                if self.cache:
+                    self.cache.store(url, response.headers, text)
+                return text
+            logger.warning(f"Failed to fetch {url}: Status {response.status}")
+            return None
+
+
+def _stream_encoding(response: aiohttp.ClientResponse) -> str:
+    """Declared charset of response, UTF-8 when missing or unknown (the
+    body-sniffing fallback of response.text() needs the whole body)"""
+    try:
+        return codecs.lookup(response.charset or 'utf-8').name
+    except LookupError:
+        return 'utf-8'
+
+
+def _urllib_get(url: str, headers: Dict[str, str], timeout: float) -> Optional[str]:
+    """Blocking urllib GET - only ever called from the fallback pool"""
+    req = urllib.request.Request(url, headers=headers)
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        if response.status == 200:
+            return response.read().decode('utf-8')
+        return None
+
+
+async def fallback_get_text(url: str, timeout: float = 30,
+                            headers: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """GET url with urllib (system DNS) without blocking the event loop.
+
+    At most FALLBACK_WORKERS requests run at once; the rest queue. The whole
+    call, queueing included, is bounded by timeout and raises
+    asyncio.TimeoutError when it runs out - the worker thread is left to
+    finish on its own.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(_fallback_executor, _urllib_get, url,
+                                  dict(headers or DEFAULT_HEADERS), timeout)
+    return await asyncio.wait_for(future, timeout=timeout)
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Streaming, tail-first ingestion of the japanesepower.org JEPX spot CSV
+jepxSpot.csv holds every half-hour since JEPX launched and only ever grows at
+the end, so we keep a local window of its tail and fetch new bytes with HTTP
+Range requests instead of re-downloading and re-parsing the whole history.
+"""
+
+import csv
+import json
+import logging
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+import numpy as np
+
+from http_client import HttpClient
+
+logger = logging.getLogger(__name__)
+
+JEPX_URL = "https://japanesepower.org/jepxSpot.csv"
+CACHE_DIR = Path(__file__).parent / "jepx_cache"
+
+# First contact downloads only this much of the end of the file (~7 weeks of rows)
+TAIL_BYTES = 256 * 1024
+HEADER_BYTES = 4096
+CHUNK_BYTES = 64 * 1024
+
+SLOTS = 48
+# System price plus the nine JEPX areas, in the order the tools display them
+AREAS = ['System', 'Hokkaido', 'Tohoku', 'Tokyo', 'Chubu', 'Hokuriku',
+         'Kansai', 'Chugoku', 'Shikoku', 'Kyushu']
+# Peak block 08:00-20:00 JST = slots 17-40 (zero-based 16..39)
+PEAK_SLOTS = np.arange(16, 40)
+
+
+def _header_area(name: str) -> Optional[str]:
+    """Area of a price column header ('Tokyo Yen/kWh' -> 'Tokyo'); the system
+    price goes by several names ('System Price Yen/kWh'), all starting 'System'"""
+    area = name.replace('Yen/kWh', '').strip()
+    if area.lower().startswith('system'):
+        return 'System'
+    return area if area in AREAS else None
+
+
+def _price(cell: str) -> float:
+    """One price cell; blank, '-' and other non-numbers are missing (NaN)"""
+    try:
+        return float(cell)
+    except ValueError:
+        return np.nan
+
+
+def _date_column(header: List[str]) -> int:
+    return header.index('Date') if 'Date' in header else 1
+
+
+def rows_from_text(content: str, dates: Iterable[str]) -> Tuple[List[str], Dict[str, List[List[str]]]]:
+    """Parse a complete CSV body and keep only the rows for the given dates.
+
+    Used when the Range path is unavailable and the whole file had to be
+    downloaded anyway (e.g. via the urllib fallback).
+    """
+    wanted = set(dates)
+    reader = csv.reader(content.splitlines())
+    header = [h.strip() for h in next(reader, [])]
+    rows: Dict[str, List[List[str]]] = {d: [] for d in wanted}
+    if not header:
+        return header, rows
+    date_idx = _date_column(header)
+    for row in reader:
+        if len(row) > date_idx and row[date_idx] in wanted:
+            rows[row[date_idx]].append(row)
+    return header, rows
+
+
+class JepxIngester:
+    """Local tail window of jepxSpot.csv plus a date -> byte range index.
+
+    cache_dir/jepxSpot.csv holds bytes [base, size) of the remote file, and
+    cache_dir/index.json records base, size, the header row, the ETag and
+    the absolute byte range of each date's rows. Each run:
+      1. asks for bytes from `size` onwards (206 appends, 416 = nothing new);
+         on first contact, only the last TAIL_BYTES plus the header line;
+      2. indexes the new complete lines as they are written;
+      3. seeks straight to the requested dates' byte ranges to read them.
+    Nothing before the requested dates is parsed again.
+    """
+
+    def __init__(self, http: HttpClient, url: str = JEPX_URL,
+                 cache_dir: Path = CACHE_DIR, headers: Optional[Dict[str, str]] = None):
+        self.http = http
+        self.url = url
+        self.cache_dir = Path(cache_dir)
+        self.data_file = self.cache_dir / "jepxSpot.csv"
+        self.index_file = self.cache_dir / "index.json"
+        self.headers = headers or {}
+        self.meta = self._load_meta()
+
+    # ------------------------------------------------------------ metadata
+    def _empty_meta(self) -> Dict:
+        return {'base': 0, 'size': 0, 'indexed_to': 0, 'header': [], 'etag': '', 'dates': {}}
+
+    def _load_meta(self) -> Dict:
+        if self.index_file.exists() and self.data_file.exists():
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                if self.data_file.stat().st_size == meta['size'] - meta['base']:
+                    return meta
+                logger.warning("JEPX cache size mismatch - rebuilding")
+            except Exception as e:
+                logger.warning(f"Failed to load JEPX index: {e}")
+        return self._empty_meta()
+
+    def _save_meta(self):
+        try:
+            with open(self.index_file, 'w', encoding='utf-8') as f:
+                json.dump(self.meta, f)
+        except OSError as e:
+            logger.warning(f"Failed to save JEPX index: {e}")
+
+    def _reset(self):
+        self.meta = self._empty_meta()
+        if self.data_file.exists():
+            self.data_file.unlink()
+
+    # ----------------------------------------------------------- transport
+    async def _get(self, range_header: str, timeout: float,
+                   handle: Callable[[aiohttp.ClientResponse], Awaitable[Optional[Any]]],
+                   extra: Optional[Dict[str, str]] = None) -> Optional[Any]:
+        """handle(response) for a Range GET, through the shared HttpClient so the
+        source gets the run deadline and its breaker"""
+        headers = dict(self.headers)
+        headers['Range'] = range_header
+        if extra:
+            headers.update(extra)
+        return await self.http.stream(self.url, handle, timeout, headers)
+
+    @staticmethod
+    def _content_range(response) -> Tuple[Optional[int], Optional[int]]:
+        """(first byte, total size) from a Content-Range header"""
+        match = re.match(r'bytes (\d+|\*)-?\d*/(\d+|\*)', response.headers.get('Content-Range', ''))
+        if not match:
+            return None, None
+        start = int(match.group(1)) if match.group(1) != '*' else None
+        total = int(match.group(2)) if match.group(2) != '*' else None
+        return start, total
+
+    async def _stream_to_cache(self, response, append: bool) -> int:
+        """Write the response body to the cache file chunk by chunk"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        written = 0
+        with open(self.data_file, 'ab' if append else 'wb') as f:
+            async for chunk in response.content.iter_chunked(CHUNK_BYTES):
+                f.write(chunk)
+                written += len(chunk)
+        return written
+
+    async def _fetch_header(self, timeout: float) -> List[str]:
+        async def first_line(response) -> Optional[bytes]:
+            if response.status not in (200, 206):
+                return None
+            return await response.content.readline()
+
+        line = await self._get(f"bytes=0-{HEADER_BYTES - 1}", timeout, first_line)
+        if line is None:
+            return []
+        return [h.strip() for h in line.decode('utf-8', errors='replace').strip().split(',')]
+
+    async def _apply_reply(self, response: aiohttp.ClientResponse) -> Optional[str]:
+        """Fold a Range reply into the local window: 'unchanged', 'appended',
+        'rebuilt', 'reset' (cache dropped, ask again) or None on failure"""
+        meta = self.meta
+        start, total = self._content_range(response)
+        if response.status == 416:
+            if total is not None and total < meta['size']:
+                logger.warning("JEPX CSV shrank upstream - resetting cache")
+                self._reset()
+                return 'reset'
+            return 'unchanged'
+        if response.status == 206 and start is not None:
+            fresh = not meta['size']
+            if fresh:
+                meta['base'] = meta['size'] = meta['indexed_to'] = start
+            elif start != meta['size']:
+                logger.warning("JEPX Range reply out of step with cache - resetting")
+                self._reset()
+                return 'reset'
+            meta['size'] += await self._stream_to_cache(response, append=not fresh)
+            meta['etag'] = response.headers.get('ETag', meta['etag'])
+            if fresh:
+                # The tail starts mid-line: skip to the first full row
+                meta['indexed_to'] = self._first_line_start(start)
+            return 'appended'
+        if response.status == 200:
+            # Server ignored the range (or the file changed): take it all, once
+            logger.info("JEPX server sent the full CSV - rebuilding local window")
+            self._reset()
+            meta = self.meta
+            meta['size'] = await self._stream_to_cache(response, append=False)
+            meta['etag'] = response.headers.get('ETag', '')
+            return 'rebuilt'
+        logger.warning(f"JEPX CSV returned HTTP {response.status}")
+        return None
+
+    async def refresh(self, timeout: float = 15) -> bool:
+        """Bring the local window up to date with the remote file"""
+        meta = self.meta
+        if meta['size']:
+            # If-Range only works with strong validators; a weak one would force a full 200
+            strong = meta['etag'] and not meta['etag'].startswith('W/')
+            extra = {'If-Range': meta['etag']} if strong else None
+            range_header = f"bytes={meta['size']}-"
+        else:
+            extra = None
+            range_header = f"bytes=-{TAIL_BYTES}"
+
+        outcome = await self._get(range_header, timeout, self._apply_reply, extra)
+        if outcome == 'reset':
+            return await self.refresh(timeout)
+        if outcome is None:
+            return False
+        if outcome == 'unchanged':
+            return True  # nothing new
+
+        meta = self.meta
+        if not meta['header']:
+            if meta['base'] == 0:
+                meta['header'] = self._read_first_line()
+                meta['indexed_to'] = max(meta['indexed_to'], self._first_line_start(0))
+            else:
+                meta['header'] = await self._fetch_header(timeout)
+        self._index_new_lines()
+        self._save_meta()
+        return True
+
+    # ------------------------------------------------------------- parsing
+    def _first_line_start(self, offset: int) -> int:
+        """Absolute offset just after the first newline at or after offset"""
+        with open(self.data_file, 'rb') as f:
+            f.seek(offset - self.meta['base'])
+            f.readline()
+            return self.meta['base'] + f.tell()
+
+    def _read_first_line(self) -> List[str]:
+        with open(self.data_file, 'rb') as f:
+            line = f.readline().decode('utf-8', errors='replace')
+        return [h.strip() for h in line.strip().split(',')]
+
+    def _index_new_lines(self):
+        """Extend the date index over complete lines written since last time"""
+        meta = self.meta
+        if not meta['header']:
+            return
+        date_idx = _date_column(meta['header'])
+        dates = meta['dates']
+        with open(self.data_file, 'rb') as f:
+            f.seek(meta['indexed_to'] - meta['base'])
+            pos = meta['indexed_to']
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    break  # partial last line; finished on a later run
+                parts = raw.split(b',', date_idx + 1)
+                end = pos + len(raw)
+                if len(parts) > date_idx:
+                    day = parts[date_idx].decode('ascii', errors='replace').strip()
+                    span = dates.get(day)
+                    if span:
+                        span[0] = min(span[0], pos)
+                        span[1] = max(span[1], end)
+                    else:
+                        dates[day] = [pos, end]
+                pos = end
+        meta['indexed_to'] = pos
+
+    def read_dates(self, dates: Iterable[str]) -> Dict[str, List[List[str]]]:
+        """Rows for each requested date, read straight from their byte ranges"""
+        meta = self.meta
+        date_idx = _date_column(meta['header']) if meta['header'] else 1
+        rows: Dict[str, List[List[str]]] = {}
+        with open(self.data_file, 'rb') as f:
+            for day in dates:
+                span = meta['dates'].get(day)
+                rows[day] = []
+                if not span:
+                    continue
+                f.seek(span[0] - meta['base'])
+                block = f.read(span[1] - span[0]).decode('utf-8', errors='replace')
+                for row in csv.reader(block.splitlines()):
+                    if len(row) > date_idx and row[date_idx] == day:
+                        rows[day].append(row)
+        return rows
+
+    async def fetch_rows(self, dates: Iterable[str],
+                         timeout: float = 15) -> Optional[Tuple[List[str], Dict[str, List[List[str]]]]]:
+        """(header, {date: rows}) for the requested dates, or None if unavailable"""
+        dates = list(dates)
+        if not await self.refresh(timeout) or not self.meta['header']:
+            return None
+        return self.meta['header'], self.read_dates(dates)
+
+
+class JepxDayAhead:
+    """Half-hourly JEPX day-ahead prices for every area as one array.
+
+    prices has shape (days, areas, 48) in JPY/kWh with NaN for missing slots;
+    dates and areas label the first two axes. All aggregations are NumPy
+    reductions over that array.
+    """
+
+    def __init__(self, dates: List[str], areas: List[str], prices: np.ndarray):
+        self.dates = list(dates)
+        self.areas = list(areas)
+        self.prices = prices
+
+    @classmethod
+    def from_rows(cls, header: List[str], rows: Dict[str, List[List[str]]]) -> Optional['JepxDayAhead']:
+        """Build the model from (header, {date: rows}) in a single pass"""
+        columns = {}
+        for idx, name in enumerate(header):
+            area = _header_area(name)
+            if area is not None and area not in columns:
+                columns[area] = idx
+        if not columns:
+            return None
+        areas = [a for a in AREAS if a in columns]
+        col_idx = np.array([columns[a] for a in areas])
+        slot_col = 0 if header and header[0].strip().lower() in ('slot', 'period') else None
+
+        dates = sorted(d for d, day_rows in rows.items() if day_rows)
+        prices = np.full((len(dates), len(areas), SLOTS), np.nan)
+        for d, day in enumerate(dates):
+            for order, row in enumerate(rows[day]):
+                try:
+                    slot = int(row[slot_col]) - 1 if slot_col is not None else order
+                except ValueError:
+                    slot = order
+                if not 0 <= slot < SLOTS:
+                    continue
+                prices[d, :, slot] = [_price(row[i]) if i < len(row) else np.nan for i in col_idx]
+        return cls(dates, areas, prices)
+
+    def _date_idx(self, date: str) -> Optional[int]:
+        try:
+            return self.dates.index(date)
+        except ValueError:
+            return None
+
+    def slots_reported(self) -> np.ndarray:
+        """(days, areas) count of non-missing half-hours"""
+        return np.sum(~np.isnan(self.prices), axis=2)
+
+    def base(self) -> np.ndarray:
+        """(days, areas) daily average over all 48 slots"""
+        with np.errstate(invalid='ignore'):
+            return np.nanmean(self.prices, axis=2)
+
+    def peak(self) -> np.ndarray:
+        """(days, areas) average over the 08:00-20:00 peak block"""
+        with np.errstate(invalid='ignore'):
+            return np.nanmean(self.prices[:, :, PEAK_SLOTS], axis=2)
+
+    def offpeak(self) -> np.ndarray:
+        """(days, areas) average over the slots outside the peak block"""
+        mask = np.ones(SLOTS, dtype=bool)
+        mask[PEAK_SLOTS] = False
+        with np.errstate(invalid='ignore'):
+            return np.nanmean(self.prices[:, :, mask], axis=2)
+
+    def weekday_mask(self) -> np.ndarray:
+        """(days,) True for Monday-Friday"""
+        return np.array([datetime.strptime(d, '%Y-%m-%d').weekday() < 5 for d in self.dates], dtype=bool)
+
+    def spread(self, area_a: str, area_b: str) -> np.ndarray:
+        """(days, 48) half-hourly price spread area_a - area_b"""
+        a, b = self.areas.index(area_a), self.areas.index(area_b)
+        return self.prices[:, a, :] - self.prices[:, b, :]
+
+    def profile(self, area: str, days: int = 7) -> np.ndarray:
+        """(48,) average intraday shape over the last `days` days"""
+        a = self.areas.index(area)
+        with np.errstate(invalid='ignore'):
+            return np.nanmean(self.prices[-days:, a, :], axis=0)
+
+    def daily_summary(self, date: str) -> Optional[Dict[str, Dict[str, Optional[float]]]]:
+        """{area: {base, peak, offpeak, slots}} for one date, rounded for JSON"""
+        d = self._date_idx(date)
+        if d is None:
+            return None
+        base, peak, offpeak, slots = self.base()[d], self.peak()[d], self.offpeak()[d], self.slots_reported()[d]
+
+        def r(x):
+            return None if np.isnan(x) else round(float(x), 2)
+
+        return {
+            area: {'base': r(base[i]), 'peak': r(peak[i]), 'offpeak': r(offpeak[i]), 'slots': int(slots[i])}
+            for i, area in enumerate(self.areas)
+        }
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Last-known-good values for the instruments the dashboard shows
+When a live source fails or is slow, the most recent real observation from
+the price history is served with its age, while the live fetch carries on in
+the background and refreshes the history for the next render.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set, Tuple
+
+from price_store import DAY, PriceStore
+
+logger = logging.getLogger(__name__)
+
+# Older observations are not shown at all - an empty card beats a misleading one
+MAX_STALENESS_DAYS = 7
+
+
+class LastKnownGood:
+    """Stale-while-revalidate view over the PriceStore.
+
+    lookup() returns the latest stored value for a symbol if it is within the
+    maximum staleness. Live fetches that were overtaken by a stale value are
+    handed to revalidate() and awaited by drain() before the run ends.
+    """
+
+    def __init__(self, store: PriceStore, max_staleness_days: float = MAX_STALENESS_DAYS):
+        self.store = store
+        self.max_staleness_days = max_staleness_days
+        self._revalidating: Set[asyncio.Future] = set()
+
+    def lookup(self, symbol: str) -> Optional[Tuple[float, str, float]]:
+        """(value, as-of date, age in days) of the latest real observation"""
+        latest = self.store.latest(symbol)
+        if latest is None:
+            return None
+        ts, value = latest
+        now = datetime.now(timezone.utc).timestamp()
+        age_days = max(0.0, (now - ts) / DAY)
+        if age_days > self.max_staleness_days:
+            logger.warning(f"Last known {symbol} is {age_days:.0f} days old, "
+                           f"beyond the {self.max_staleness_days:g}-day limit")
+            return None
+        as_of = datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%Y-%m-%d')
+        return value, as_of, age_days
+
+    @staticmethod
+    def annotate(entry: Dict, as_of: str, age_days: float) -> Dict:
+        """Mark a dashboard entry as served from the last-known-good cache"""
+        entry.update({"stale": True, "as_of": as_of, "age_days": round(age_days, 1)})
+        return entry
+
+    def revalidate(self, task: asyncio.Future):
+        """Keep a live fetch running after its stale value has been served"""
+        self._revalidating.add(task)
+        task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Future):
+        self._revalidating.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background revalidation failed: {task.exception()}")
+
+    def __len__(self) -> int:
+        return len(self._revalidating)
+
+    async def drain(self, timeout: Optional[float] = None) -> int:
+        """Wait for background revalidations; cancel what is left after timeout.
+
+        Returns how many finished in time.
+        """
+        if not self._revalidating:
+            return 0
+        done, pending = await asyncio.wait(set(self._revalidating), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"{len(pending)} background revalidation(s) cancelled")
+        return len(done)
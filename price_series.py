@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Columnar price series backed by NumPy arrays
+Timestamps and values live in two parallel arrays, optionally memory-mapped
+from .npy files so long daily or half-hourly histories open instantly.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DAY = 86400
+
+# Look-backs of the change columns, in calendar days (1 = previous observation)
+CHANGE_LOOKBACKS = {
+    'dod': 1,
+    'wow': 7,
+    'mom': 30
+}
+
+
+class PriceSeries:
+    """Timestamps (int64 unix seconds, ascending) and float64 values.
+
+    Slicing returns views, so a slice of a memory-mapped series still only
+    touches the pages it reads. All analytics are whole-array operations.
+    """
+
+    __slots__ = ('symbol', 'timestamps', 'values')
+
+    def __init__(self, timestamps, values, symbol: str = ''):
+        self.symbol = symbol
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.values = np.asarray(values, dtype=np.float64)
+        if self.timestamps.shape != self.values.shape:
+            raise ValueError(f"{symbol}: {len(self.timestamps)} timestamps vs {len(self.values)} values")
+
+    # ------------------------------------------------------------------ io
+    @classmethod
+    def from_store(cls, store, symbol: str) -> 'PriceSeries':
+        """The PriceStore series for symbol (memory-mapped when saved)"""
+        return store.series(symbol)
+
+    @staticmethod
+    def _paths(directory: Path, name: str) -> Tuple[Path, Path]:
+        directory = Path(directory)
+        return directory / f"{name}.ts.npy", directory / f"{name}.val.npy"
+
+    def save(self, directory: Path, name: Optional[str] = None):
+        """Write the two columns as .npy files under directory (named after
+        the symbol by default). Each file is written aside and renamed into
+        place, so series already memory-mapped from the old files stay valid."""
+        for path, column in zip(self._paths(directory, name or self.symbol), (self.timestamps, self.values)):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            with open(tmp, 'wb') as f:
+                np.save(f, np.ascontiguousarray(column))
+            os.replace(tmp, path)
+
+    @classmethod
+    def open(cls, directory: Path, symbol: str, mmap: bool = True,
+             name: Optional[str] = None) -> Optional['PriceSeries']:
+        """Open a saved series; with mmap=True nothing is read until sliced"""
+        ts_path, val_path = cls._paths(directory, name or symbol)
+        if not ts_path.exists() or not val_path.exists():
+            return None
+        mode = 'r' if mmap else None
+        return cls(np.load(ts_path, mmap_mode=mode), np.load(val_path, mmap_mode=mode), symbol)
+
+    # ------------------------------------------------------------- access
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, item) -> 'PriceSeries':
+        return PriceSeries(self.timestamps[item], self.values[item], self.symbol)
+
+    @property
+    def last(self) -> Optional[float]:
+        return float(self.values[-1]) if len(self.values) else None
+
+    def between(self, start: Optional[int] = None, end: Optional[int] = None) -> 'PriceSeries':
+        """View of the points with start <= timestamp < end"""
+        lo = 0 if start is None else int(np.searchsorted(self.timestamps, start, side='left'))
+        hi = len(self) if end is None else int(np.searchsorted(self.timestamps, end, side='left'))
+        return self[lo:hi]
+
+    def value_before(self, ts: int) -> Optional[float]:
+        """Most recent value strictly before ts"""
+        i = int(np.searchsorted(self.timestamps, ts, side='left'))
+        return float(self.values[i - 1]) if i > 0 else None
+
+    # ---------------------------------------------------------- analytics
+    def change(self, periods: int = 1) -> np.ndarray:
+        """values[t] - values[t - periods], aligned to the later point"""
+        return self.values[periods:] - self.values[:-periods]
+
+    def pct_change(self, periods: int = 1) -> np.ndarray:
+        prev = self.values[:-periods]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(prev != 0, (self.values[periods:] - prev) / prev * 100, 0.0)
+
+    def change_since(self, days: int = 1) -> Optional[Tuple[float, float]]:
+        """(absolute, percent) change of the latest value vs the last value at
+        least `days` days earlier; days=1 is the previous observation."""
+        if not len(self):
+            return None
+        current = float(self.values[-1])
+        prev = self.value_before(int(self.timestamps[-1]) - (days - 1) * DAY)
+        if prev is None:
+            return None
+        diff = current - prev
+        return diff, (diff / prev) * 100 if prev else 0.0
+
+    def change_to(self, value: float, ts: int, days: int = 1) -> Optional[float]:
+        """value (as of ts) minus the last value at least `days` days before
+        ts; days=1 is the last observation before ts. None without one."""
+        prev = self.value_before(ts - (days - 1) * DAY)
+        if prev is None or np.isnan(prev) or np.isnan(value):
+            return None
+        return float(value) - prev
+
+    def rolling_mean(self, window: int) -> np.ndarray:
+        """Mean over each trailing window, aligned to the window's last point"""
+        if window <= 0 or window > len(self):
+            return np.empty(0)
+        csum = np.cumsum(np.concatenate(([0.0], self.values)))
+        return (csum[window:] - csum[:-window]) / window
+
+    def rolling_std(self, window: int) -> np.ndarray:
+        """Sample standard deviation (ddof=1) over each trailing window"""
+        if window <= 1 or window > len(self):
+            return np.empty(0)
+        windows = np.lib.stride_tricks.sliding_window_view(self.values, window)
+        return windows.std(axis=1, ddof=1)
+
+    def resample(self, seconds: int, how: str = 'last') -> 'PriceSeries':
+        """Bucket into fixed periods (e.g. DAY, 1800) taking 'last', 'first' or 'mean'"""
+        if not len(self):
+            return PriceSeries([], [], self.symbol)
+        buckets = self.timestamps // seconds
+        starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+        bucket_ts = buckets[starts] * seconds
+        if how == 'first':
+            values = self.values[starts]
+        elif how == 'last':
+            values = self.values[np.append(starts[1:], len(self)) - 1]
+        elif how == 'mean':
+            counts = np.diff(np.append(starts, len(self)))
+            values = np.add.reduceat(self.values, starts) / counts
+        else:
+            raise ValueError(f"Unknown resample method: {how}")
+        return PriceSeries(bucket_ts, values, self.symbol)
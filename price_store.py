@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Local price history for every quote the dashboard shows
+Two .npy columns per symbol (price_history/<symbol>.ts.npy and .val.npy),
+memory-mapped when read
+"""
+
+import logging
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from price_series import PriceSeries
+
+logger = logging.getLogger(__name__)
+
+STORE_DIR = Path(__file__).parent / "price_history"
+
+DAY = 86400
+
+
+def day_start(ts: int) -> int:
+    """Truncate a unix timestamp to 00:00 UTC of its day"""
+    return int(ts) - int(ts) % DAY
+
+
+def date_timestamp(date_str: str) -> int:
+    """Unix timestamp of 00:00 UTC on a YYYY-MM-DD date"""
+    return int(datetime.strptime(date_str, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp())
+
+
+class PriceStore:
+    """Time series keyed by symbol and unix timestamp.
+
+    Each symbol is a PriceSeries saved as two .npy columns and memory-mapped
+    on first use, so a long history opens without being parsed. Points are
+    only ever added at the end: one whose timestamp equals the latest
+    revises it, which is how today's still-moving daily bar gets updated;
+    older timestamps are ignored. Histories from the old one-CSV-per-symbol
+    layout are converted the first time they are opened.
+    """
+
+    def __init__(self, store_dir: Path = STORE_DIR):
+        self.store_dir = Path(store_dir)
+        self._series: Dict[str, PriceSeries] = {}
+
+    @staticmethod
+    def _name(symbol: str) -> str:
+        return re.sub(r'[^A-Za-z0-9_.-]', '_', symbol)
+
+    def series(self, symbol: str) -> PriceSeries:
+        """The history of symbol, oldest first"""
+        series = self._series.get(symbol)
+        if series is None:
+            try:
+                series = PriceSeries.open(self.store_dir, symbol, name=self._name(symbol))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to open price history for {symbol}: {e}")
+            if series is None:
+                series = self._import_csv(symbol)
+            self._series[symbol] = series
+        return series
+
+    def _import_csv(self, symbol: str) -> PriceSeries:
+        """Series from a legacy <symbol>.csv (timestamp,value rows, last write
+        wins), saved as .npy columns; empty if there is none"""
+        points: Dict[int, float] = {}
+        path = self.store_dir / (self._name(symbol) + ".csv")
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        parts = line.strip().split(',')
+                        if len(parts) != 2:
+                            continue
+                        try:
+                            points[int(parts[0])] = float(parts[1])
+                        except ValueError:
+                            continue
+            except OSError as e:
+                logger.warning(f"Failed to read price history for {symbol}: {e}")
+
+        timestamps = sorted(points)
+        series = PriceSeries(timestamps, [points[t] for t in timestamps], symbol)
+        if len(series):
+            self._save(series)
+            logger.info(f"Converted {len(series)} row(s) of {symbol} price history to .npy")
+        return series
+
+    def _save(self, series: PriceSeries):
+        try:
+            series.save(self.store_dir, self._name(series.symbol))
+        except OSError as e:
+            logger.warning(f"Failed to save price history for {series.symbol}: {e}")
+
+    def last_timestamp(self, symbol: str) -> Optional[int]:
+        series = self.series(symbol)
+        return int(series.timestamps[-1]) if len(series) else None
+
+    def append(self, symbol: str, points: Iterable[Tuple[int, float]]) -> int:
+        """Add points newer than (or revising) the latest one; returns points taken"""
+        series = self.series(symbol)
+        # Only the latest point can change, so only it comes out of the arrays
+        kept = max(len(series) - 1, 0)
+        timestamps = [int(series.timestamps[-1])] if len(series) else []
+        values = [float(series.values[-1])] if len(series) else []
+        taken = 0
+        for ts, value in sorted((int(t), float(v)) for t, v in points):
+            if timestamps and ts < timestamps[-1]:
+                continue
+            if timestamps and ts == timestamps[-1]:
+                if values[-1] == value:
+                    continue
+                values[-1] = value
+            else:
+                timestamps.append(ts)
+                values.append(value)
+            taken += 1
+
+        if taken:
+            series = PriceSeries(np.concatenate((series.timestamps[:kept], timestamps)),
+                                 np.concatenate((series.values[:kept], values)), symbol)
+            self._series[symbol] = series
+            self._save(series)
+        return taken
+
+    def record(self, symbol: str, value: float, ts: Optional[int] = None):
+        """Record one daily observation (defaults to today, 00:00 UTC)"""
+        if ts is None:
+            ts = day_start(int(datetime.now(timezone.utc).timestamp()))
+        self.append(symbol, [(ts, value)])
+
+    def latest(self, symbol: str) -> Optional[Tuple[int, float]]:
+        series = self.series(symbol)
+        return (int(series.timestamps[-1]), float(series.values[-1])) if len(series) else None
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Quorum reconciliation of one price across independent sources
+Every source for an instrument is queried at once; the answer is the first
+value a quorum agrees on, or the median of whatever arrived by the deadline.
+Sources that disagree are recorded, so a scraper returning a wrong number
+shows up in the history instead of on the dashboard.
+"""
+
+import asyncio
+import json
+import logging
+import statistics
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RECONCILIATION_FILE = Path(__file__).parent / "price_reconciliation.json"
+
+# Sources agree when within this fraction of each other
+DEFAULT_TOLERANCE = 0.05
+DEFAULT_QUORUM = 2
+# Seconds to wait for a quorum before settling for the median
+DEFAULT_WAIT = 10.0
+
+
+class Reconciliation(NamedTuple):
+    """Agreed value for one instrument and how it was reached"""
+    instrument: str
+    value: float
+    method: str                       # 'quorum', 'median' or 'single'
+    agreeing: Tuple[str, ...]
+    dissenting: Dict[str, float]      # source -> the value it reported
+    missing: Tuple[str, ...]          # sources that failed or had not answered
+
+    def to_dict(self) -> Dict:
+        return {
+            "value": round(self.value, 4),
+            "method": self.method,
+            "agreeing": list(self.agreeing),
+            "dissenting": {source: round(value, 4) for source, value in self.dissenting.items()},
+            "missing": list(self.missing)
+        }
+
+    @classmethod
+    def from_dict(cls, instrument: str, data: Dict) -> 'Reconciliation':
+        """Inverse of to_dict, e.g. for a reconciliation cached between runs"""
+        return cls(instrument, float(data['value']), data['method'], tuple(data['agreeing']),
+                   dict(data['dissenting']), tuple(data['missing']))
+
+
+def _within(value: float, reference: float, tolerance: float) -> bool:
+    return abs(value - reference) <= tolerance * abs(reference)
+
+
+def largest_agreeing_group(values: Dict[str, float], tolerance: float) -> Tuple[str, ...]:
+    """Largest set of sources all within tolerance of one of them (ties: tightest spread)"""
+    best: Tuple[str, ...] = ()
+    best_spread = float('inf')
+    for reference in values.values():
+        group = tuple(source for source, value in values.items() if _within(value, reference, tolerance))
+        spread = max(values[s] for s in group) - min(values[s] for s in group)
+        if len(group) > len(best) or (len(group) == len(best) and spread < best_spread):
+            best, best_spread = group, spread
+    return best
+
+
+def settle(instrument: str, values: Dict[str, float], sources: List[str],
+           tolerance: float, quorum: int) -> Optional[Reconciliation]:
+    """Reconciliation of the values received so far, None if nothing arrived.
+
+    With a quorum the value is the median of the agreeing group; otherwise it
+    is the median of everything received, and sources outside tolerance of it
+    count as dissenting.
+    """
+    if not values:
+        return None
+    missing = tuple(source for source in sources if source not in values)
+    group = largest_agreeing_group(values, tolerance)
+    if len(group) >= quorum:
+        value = statistics.median(values[s] for s in group)
+        method = 'quorum'
+    else:
+        value = statistics.median(values.values())
+        method = 'median' if len(values) > 1 else 'single'
+    agreeing = tuple(s for s in values if _within(values[s], value, tolerance))
+    dissenting = {s: v for s, v in values.items() if s not in agreeing}
+    return Reconciliation(instrument, value, method, agreeing, dissenting, missing)
+
+
+async def reconcile(instrument: str,
+                    sources: Dict[str, Callable[[], Awaitable[Optional[float]]]],
+                    tolerance: float = DEFAULT_TOLERANCE,
+                    quorum: int = DEFAULT_QUORUM,
+                    wait: float = DEFAULT_WAIT) -> Optional[Reconciliation]:
+    """Query every source concurrently and return as soon as quorum of them agree.
+
+    Sources still running at that point are cancelled. If no quorum forms
+    before wait seconds (or every source has answered), the median of what
+    arrived is returned. A source failing or returning None counts as missing.
+    """
+    tasks = {asyncio.ensure_future(fetch()): source for source, fetch in sources.items()}
+    values: Dict[str, float] = {}
+    loop = asyncio.get_running_loop()
+    give_up = loop.time() + wait
+    try:
+        pending = set(tasks)
+        while pending:
+            remaining = give_up - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                source = tasks[task]
+                if task.cancelled() or task.exception() is not None:
+                    logger.debug(f"{instrument} source {source} failed: "
+                                 f"{None if task.cancelled() else task.exception()}")
+                    continue
+                if task.result() is not None:
+                    values[source] = float(task.result())
+            if values and len(largest_agreeing_group(values, tolerance)) >= quorum:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    result = settle(instrument, values, list(sources), tolerance, quorum)
+    if result is None:
+        logger.warning(f"Reconcile {instrument}: no source answered")
+    elif result.dissenting:
+        logger.warning(f"Reconcile {instrument}: {result.value:.2f} by {result.method} "
+                       f"({', '.join(result.agreeing) or 'none'}), dissenting: "
+                       + ", ".join(f"{s}={v:.2f}" for s, v in result.dissenting.items()))
+    else:
+        logger.info(f"Reconcile {instrument}: {result.value:.2f} by {result.method} "
+                    f"({', '.join(result.agreeing)})")
+    return result
+
+
+class ReconciliationLog:
+    """Persisted record of which sources disagreed, and how often.
+
+    Per source: how many reconciliations it took part in and how many it
+    dissented from, plus the most recent dissents per instrument. Written to
+    price_reconciliation.json by save().
+    """
+
+    HISTORY = 50                      # dissent events kept per instrument
+
+    def __init__(self, path: Path = RECONCILIATION_FILE):
+        self.path = Path(path)
+        self.data: Dict[str, Dict] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict]:
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"Failed to load reconciliation history: {e}")
+        return {'sources': {}, 'dissents': {}}
+
+    def record(self, result: Reconciliation):
+        for source in list(result.agreeing) + list(result.dissenting):
+            counts = self.data['sources'].setdefault(source, {'answers': 0, 'dissents': 0})
+            counts['answers'] += 1
+            if source in result.dissenting:
+                counts['dissents'] += 1
+        if result.dissenting:
+            events = self.data['dissents'].setdefault(result.instrument, [])
+            events.append({'time': datetime.now().isoformat(), **result.to_dict()})
+            del events[:-self.HISTORY]
+        self._dirty = True
+
+    def save(self):
+        """Write the history to disk if anything changed"""
+        if not self._dirty:
+            return
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Failed to save reconciliation history: {e}")
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Scenario revaluation of a book of forward positions
+Positions (commodity, tenor, volume) are revalued on the monthly forward
+curves under a grid of relative curve shocks - parallel, twist and
+seasonal - with each commodity's P&L for every scenario computed as one
+matrix product. The result is written as JSON for the margin estimator page.
+
+Usage: python revaluation.py [book.json] [output.json]
+"""
+
+import json
+import logging
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from curve_store import CurveSnapshotStore
+from forward_curve import ContractCalendar, ForwardCurve, Month, period_months
+
+logger = logging.getLogger(__name__)
+
+BOOK_FILE = Path(__file__).parent / "positions.json"
+REVALUATION_FILE = Path(__file__).parent / "output" / "portfolio_revaluation.json"
+
+# Default shock grid, as fractions of the base price: 21 x 17 x 15 = 5355 scenarios
+PARALLEL_SHOCKS = np.linspace(-0.5, 0.5, 21)
+TWIST_SHOCKS = np.linspace(-0.2, 0.2, 17)
+SEASONAL_SHOCKS = np.linspace(-0.15, 0.15, 15)
+
+# A twist moves the front month by -size and months this far out and beyond
+# by +size, linearly in between around the midpoint
+TWIST_HORIZON_MONTHS = 24
+
+# Positions revalued per block when reducing the position x scenario grid
+POSITION_BLOCK = 1024
+
+
+def tenor_months(tenor: str) -> List[Month]:
+    """Delivery months of a tenor: a curve period ('27Q1', '27Win', ...) or one month ('2027-03')"""
+    match = re.fullmatch(r'(\d{4})-(\d{2})', tenor)
+    if match:
+        return [(int(match.group(1)), int(match.group(2)))]
+    return period_months(tenor)
+
+
+def shock_basis(ordinals: np.ndarray, front: int) -> np.ndarray:
+    """(3 x months) unit parallel, twist and seasonal moves of the delivery
+    months ordinals (year * 12 + month - 1) on a curve whose front is front"""
+    tilt = np.clip(2 * (ordinals - front) / TWIST_HORIZON_MONTHS - 1, -1, 1)
+    season = np.cos(2 * np.pi * (ordinals % 12) / 12)
+    return np.vstack([np.ones(len(ordinals)), tilt, season])
+
+
+class Position(NamedTuple):
+    """A linear forward position; volume is signed (long > 0) in the curve's
+    price unit (MWh for TTF, MMBtu for JKM and Henry Hub, BBL for Brent)"""
+    commodity: str
+    tenor: str
+    volume: float
+    trade_price: Optional[float] = None
+    id: str = ''
+
+
+def load_book(path: Path = BOOK_FILE) -> List[Position]:
+    """Positions from a JSON list of {commodity, tenor, volume[, trade_price, id]}"""
+    with open(path, 'r', encoding='utf-8') as f:
+        rows = json.load(f)
+    return [Position(row['commodity'], str(row['tenor']), float(row['volume']),
+                     None if row.get('trade_price') is None else float(row['trade_price']),
+                     str(row.get('id', i)))
+            for i, row in enumerate(rows)]
+
+
+class ShockGrid:
+    """Relative curve shocks, one row per scenario.
+
+    Scenario s moves month m of a curve by
+    parallel[s] + twist[s] * tilt[m] + seasonal[s] * season[m]
+    times the base price, where tilt runs from -1 at the calendar's first
+    month (the curve front) to +1 at TWIST_HORIZON_MONTHS out, and season is
+    +1 in January and -1 in July.
+    """
+
+    def __init__(self, parallel: Iterable[float], twist: Iterable[float], seasonal: Iterable[float]):
+        self.coefficients = np.column_stack([np.asarray(list(parallel), dtype=float),
+                                             np.asarray(list(twist), dtype=float),
+                                             np.asarray(list(seasonal), dtype=float)])
+
+    @classmethod
+    def grid(cls, parallel: Iterable[float] = PARALLEL_SHOCKS, twist: Iterable[float] = TWIST_SHOCKS,
+             seasonal: Iterable[float] = SEASONAL_SHOCKS) -> 'ShockGrid':
+        """Every combination of the given parallel, twist and seasonal sizes"""
+        p, t, s = np.meshgrid(np.asarray(list(parallel), dtype=float), np.asarray(list(twist), dtype=float),
+                              np.asarray(list(seasonal), dtype=float), indexing='ij')
+        return cls(p.ravel(), t.ravel(), s.ravel())
+
+    def __len__(self) -> int:
+        return len(self.coefficients)
+
+    @staticmethod
+    def basis(calendar: ContractCalendar) -> np.ndarray:
+        """(3 x months) shapes of a unit parallel, twist and seasonal shock"""
+        return shock_basis(calendar.ordinals, calendar.first_ordinal)
+
+    def matrix(self, calendar: ContractCalendar, scale: float = 1.0,
+               scenarios: Optional[slice] = None) -> np.ndarray:
+        """(months x scenarios) relative move of every month under every
+        scenario (or the given slice of them), all sizes times scale"""
+        coefficients = self.coefficients if scenarios is None else self.coefficients[scenarios]
+        return self.basis(calendar).T @ (coefficients.T * scale)
+
+    def describe(self, scenario: int) -> Dict[str, float]:
+        parallel, twist, seasonal = self.coefficients[scenario]
+        return {"scenario": int(scenario), "parallel": round(float(parallel), 4),
+                "twist": round(float(twist), 4), "seasonal": round(float(seasonal), 4)}
+
+
+class Revaluation(NamedTuple):
+    """MTM of a book and its P&L under every scenario of a ShockGrid"""
+    positions: List[Position]
+    shocks: ShockGrid
+    price: np.ndarray                  # (positions,) current tenor price, NaN if unpriced
+    mtm: np.ndarray                    # (positions,) volume * (price - trade_price), NaN without a trade price
+    commodity_pnl: Dict[str, np.ndarray]   # commodity -> (scenarios,) P&L
+    worst_pnl: np.ndarray              # (positions,) each position's worst scenario P&L
+    worst_scenario: np.ndarray         # (positions,) and the scenario it occurs in
+    contributions: np.ndarray          # (positions,) P&L in the book's worst scenario
+
+    @property
+    def pnl(self) -> np.ndarray:
+        """(scenarios,) P&L of the whole book"""
+        return sum(self.commodity_pnl.values(), np.zeros(len(self.shocks)))
+
+    def to_dict(self, top: int = 20) -> Dict:
+        """JSON summary: MTM, the P&L distribution over scenarios, the worst
+        scenarios and the positions that lose most in the worst of them"""
+        pnl = self.pnl
+        order = np.argsort(pnl)
+        priced = ~np.isnan(self.price)
+
+        def money(value) -> float:
+            return round(float(value), 2)
+
+        by_commodity = {}
+        for commodity, commodity_pnl in self.commodity_pnl.items():
+            rows = np.array([p.commodity == commodity for p in self.positions])
+            by_commodity[commodity] = {
+                "positions": int(rows.sum()),
+                "unpriced": int((rows & ~priced).sum()),
+                "mtm": money(np.nansum(self.mtm[rows])),
+                "worst_pnl": money(commodity_pnl.min()),
+                "best_pnl": money(commodity_pnl.max())
+            }
+
+        contributors = []
+        for i in np.argsort(self.contributions)[:top]:
+            if self.contributions[i] >= 0:
+                break
+            position = self.positions[i]
+            contributors.append({"id": position.id, "commodity": position.commodity,
+                                 "tenor": position.tenor, "volume": position.volume,
+                                 "pnl": money(self.contributions[i]),
+                                 "own_worst_pnl": money(self.worst_pnl[i])})
+
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "positions": len(self.positions),
+            "unpriced_positions": int((~priced).sum()),
+            "scenarios": len(self.shocks),
+            "mtm": money(np.nansum(self.mtm)),
+            "by_commodity": by_commodity,
+            "pnl_percentiles": {f"p{q}": money(np.percentile(pnl, q)) for q in (1, 5, 25, 50, 75, 95, 99)},
+            "worst_scenarios": [{**self.shocks.describe(s), "pnl": money(pnl[s])} for s in order[:top]],
+            "best_scenarios": [{**self.shocks.describe(s), "pnl": money(pnl[s])} for s in order[::-1][:top]],
+            "worst_scenario_contributors": contributors
+        }
+
+
+class BookRevaluer:
+    """Revalue a book on a set of monthly curves.
+
+    Per commodity the book is reduced once to an exposure matrix (positions
+    x delivery months): volume times base price, spread evenly over the
+    priced months of each position's tenor. A scenario's P&L is then that
+    matrix times the scenario's relative moves, so the whole position x
+    scenario grid is one matrix product per commodity, taken in blocks of
+    positions to bound memory.
+    """
+
+    def __init__(self, positions: List[Position], curves: Dict[str, ForwardCurve],
+                 scales: Optional[Dict[str, float]] = None):
+        self.positions = list(positions)
+        self.curves = curves
+        # Optional per-commodity multiplier on every shock, e.g. relative volatility
+        self.scales = scales or {}
+        self.price = np.full(len(self.positions), np.nan)
+        self._exposures: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._build()
+
+    def _build(self):
+        rows: Dict[str, List[int]] = {}
+        for i, position in enumerate(self.positions):
+            rows.setdefault(position.commodity, []).append(i)
+
+        for commodity, indices in rows.items():
+            indices = np.asarray(indices)
+            curve = self.curves.get(commodity)
+            if curve is None:
+                logger.warning(f"Revaluation: no curve for {commodity}, "
+                               f"{len(indices)} position(s) unpriced")
+                continue
+            base = curve.prices
+            priced = ~np.isnan(base)
+            # One weight row per distinct tenor: 1/n on its n priced months
+            tenors = sorted({self.positions[i].tenor for i in indices})
+            weights = np.zeros((len(tenors), len(curve)))
+            for row, tenor in enumerate(tenors):
+                for month in tenor_months(tenor):
+                    m = curve.calendar.index(month)
+                    if m is not None and priced[m]:
+                        weights[row, m] = 1.0
+            counts = weights.sum(axis=1, keepdims=True)
+            np.divide(weights, counts, out=weights, where=counts > 0)
+
+            tenor_row = {tenor: row for row, tenor in enumerate(tenors)}
+            position_rows = np.array([tenor_row[self.positions[i].tenor] for i in indices])
+            position_weights = weights[position_rows]
+            volumes = np.array([self.positions[i].volume for i in indices])
+            base = np.where(priced, base, 0.0)
+            prices = position_weights @ base
+            prices[counts[position_rows, 0] == 0] = np.nan
+            self.price[indices] = prices
+            self._exposures[commodity] = (indices, position_weights * base * volumes[:, None])
+
+        unpriced = int(np.isnan(self.price).sum())
+        if unpriced:
+            logger.warning(f"Revaluation: {unpriced}/{len(self.positions)} position(s) outside the priced curves")
+
+    @property
+    def mtm(self) -> np.ndarray:
+        trade = np.array([np.nan if p.trade_price is None else p.trade_price for p in self.positions])
+        volume = np.array([p.volume for p in self.positions])
+        return volume * (self.price - trade)
+
+    def net_exposure(self) -> Dict[str, np.ndarray]:
+        """Book exposure per commodity: (months,) P&L of a +1 (100%) move of
+        each month of its curve"""
+        return {commodity: exposure.sum(axis=0) for commodity, (_, exposure) in self._exposures.items()}
+
+    def _moves(self, commodity: str, shocks: ShockGrid, scenarios: Optional[slice] = None) -> np.ndarray:
+        return shocks.matrix(self.curves[commodity].calendar, self.scales.get(commodity, 1.0), scenarios)
+
+    def position_pnl(self, shocks: ShockGrid, scenario: int) -> np.ndarray:
+        """(positions,) P&L of every position under one scenario"""
+        pnl = np.zeros(len(self.positions))
+        for commodity, (indices, exposure) in self._exposures.items():
+            pnl[indices] = (exposure @ self._moves(commodity, shocks, slice(scenario, scenario + 1)))[:, 0]
+        return pnl
+
+    def revalue(self, shocks: ShockGrid, block: int = POSITION_BLOCK) -> Revaluation:
+        """MTM and P&L of the book under every scenario of shocks"""
+        commodity_pnl = {}
+        worst_pnl = np.zeros(len(self.positions))
+        worst_scenario = np.zeros(len(self.positions), dtype=np.int64)
+        for commodity, (indices, exposure) in self._exposures.items():
+            moves = self._moves(commodity, shocks)
+            # Book P&L needs only the net monthly exposure
+            commodity_pnl[commodity] = exposure.sum(axis=0) @ moves
+            for start in range(0, len(indices), block):
+                grid = exposure[start:start + block] @ moves
+                worst = grid.argmin(axis=1)
+                rows = indices[start:start + block]
+                worst_scenario[rows] = worst
+                worst_pnl[rows] = grid[np.arange(len(worst)), worst]
+        book_pnl = sum(commodity_pnl.values(), np.zeros(len(shocks)))
+        contributions = self.position_pnl(shocks, int(book_pnl.argmin()))
+        return Revaluation(self.positions, shocks, self.price, self.mtm, commodity_pnl,
+                           worst_pnl, worst_scenario, contributions)
+
+
+def latest_curves(store: CurveSnapshotStore, commodities: Iterable[str],
+                  date_str: Optional[str] = None) -> Dict[str, ForwardCurve]:
+    """Latest stored monthly curve per commodity (on or before date_str), on
+    a calendar from its first to its last priced month, gaps interpolated"""
+    curves = {}
+    for commodity in commodities:
+        history = store.history(commodity)
+        if not len(history):
+            continue
+        snapshot = store.snapshot(commodity, history.calendar, date_str or datetime.now().strftime('%Y-%m-%d'))
+        if snapshot is None or not snapshot[1].priced:
+            continue
+        curve = snapshot[1]
+        known = np.flatnonzero(~np.isnan(curve.prices))
+        calendar = ContractCalendar(curve.calendar.months[known[0]], known[-1] - known[0] + 1)
+        curves[commodity] = ForwardCurve(calendar, curve.prices[known[0]:known[-1] + 1]).interpolated()
+    return curves
+
+
+def revalue_book(positions: List[Position], curves: Dict[str, ForwardCurve],
+                 shocks: Optional[ShockGrid] = None) -> Dict:
+    """JSON-ready revaluation of positions on curves under shocks (default grid)"""
+    shocks = shocks or ShockGrid.grid()
+    result = BookRevaluer(positions, curves).revalue(shocks)
+    logger.info(f"Revalued {len(positions)} position(s) under {len(shocks)} scenario(s): "
+                f"worst book P&L {result.pnl.min():,.0f}")
+    summary = result.to_dict()
+    summary["curves"] = {commodity: {"front": "%d-%02d" % curve.calendar.months[0], "months": len(curve)}
+                         for commodity, curve in curves.items()}
+    return summary
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    book_file = Path(sys.argv[1]) if len(sys.argv) > 1 else BOOK_FILE
+    output_file = Path(sys.argv[2]) if len(sys.argv) > 2 else REVALUATION_FILE
+    positions = load_book(book_file)
+    commodities = sorted({p.commodity for p in positions})
+    curves = latest_curves(CurveSnapshotStore(), commodities)
+    summary = revalue_book(positions, curves)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    logger.info(f"Revaluation saved to {output_file}")
+
+
+if __name__ == "__main__":
+    main()
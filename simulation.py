@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo simulation of the forward curves for VaR and margin-at-risk
+Each curve moves by three correlated factors per day - the parallel, twist
+and seasonal shapes of the revaluation shock grid - with volatilities and
+correlations estimated from the stored curve snapshots. Paths are simulated
+in fixed-size shards, each with its own child seed, across a process pool,
+so results depend only on the seed and path count, not on the worker count.
+
+Usage: python simulation.py [--paths N] [--horizons 1,5,10] [--workers W] [--seed S] [book.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from curve_store import CurveHistory, CurveSnapshotStore
+from forward_curve import ForwardCurve
+from revaluation import BOOK_FILE, BookRevaluer, Position, latest_curves, load_book, shock_basis
+
+logger = logging.getLogger(__name__)
+
+MARGIN_AT_RISK_FILE = Path(__file__).parent / "output" / "margin_at_risk.json"
+
+SIMULATED_COMMODITIES = ('ttf', 'jkm', 'brent')
+FACTORS = ('parallel', 'twist', 'seasonal')
+
+DEFAULT_PATHS = 100000
+DEFAULT_HORIZONS = (1, 2, 5, 10)            # trading days
+DEFAULT_SEED = 20260101
+CONFIDENCE_LEVELS = (0.95, 0.99)
+# Collateral above initial margin, as a fraction of the book's gross notional:
+# a margin call is a path whose loss to date exceeds it
+MARGIN_BUFFERS = (0.01, 0.025, 0.05, 0.10)
+
+# Paths per shard; fixed so a seed gives the same paths for any worker count
+SHARD_PATHS = 10000
+# Paths simulated at once inside a shard
+BATCH_PATHS = 2048
+
+# Fewer common daily observations than this and the defaults below are used
+MIN_OBSERVATIONS = 20
+TRADING_DAYS = 252
+# Annualised volatility of the parallel factor; twist and seasonal get fixed fractions of it
+DEFAULT_VOLS = {'brent': 0.35, 'henry_hub': 0.55, 'ttf': 0.60, 'jkm': 0.55}
+DEFAULT_FACTOR_SCALE = {'parallel': 1.0, 'twist': 0.3, 'seasonal': 0.15}
+# Correlation of the parallel factors between commodities
+DEFAULT_CORRELATIONS = {('jkm', 'ttf'): 0.75, ('brent', 'jkm'): 0.45, ('brent', 'ttf'): 0.35}
+DEFAULT_CORRELATION = 0.3
+
+
+class FactorModel:
+    """Daily covariance of the curve factors of several commodities.
+
+    Factor k is FACTORS[k % 3] of commodities[k // 3]; moves are daily log
+    changes of the curve's months projected on the factor shapes.
+    """
+
+    def __init__(self, commodities: Sequence[str], covariance: np.ndarray, source: str, observations: int = 0):
+        self.commodities = list(commodities)
+        self.covariance = np.asarray(covariance, dtype=float)
+        self.source = source                # 'history' or 'default'
+        self.observations = observations
+
+    @classmethod
+    def default(cls, commodities: Sequence[str]) -> 'FactorModel':
+        """Model from DEFAULT_VOLS and DEFAULT_CORRELATIONS"""
+        k = len(FACTORS)
+        vols = np.array([DEFAULT_VOLS.get(c, 0.5) * DEFAULT_FACTOR_SCALE[f] / np.sqrt(TRADING_DAYS)
+                         for c in commodities for f in FACTORS])
+        correlation = np.eye(len(vols))
+        for i, a in enumerate(commodities):
+            for j, b in enumerate(commodities):
+                if i != j:
+                    rho = DEFAULT_CORRELATIONS.get(tuple(sorted((a, b))), DEFAULT_CORRELATION)
+                    correlation[i * k, j * k] = rho
+        return cls(commodities, correlation * np.outer(vols, vols), 'default')
+
+    @classmethod
+    def estimate(cls, store: CurveSnapshotStore, commodities: Sequence[str]) -> 'FactorModel':
+        """Model from the daily factor moves of the stored snapshots, on the
+        days every commodity has one; the defaults if there are too few"""
+        moves = [factor_moves(store.history(c)) for c in commodities]
+        common = set.intersection(*(set(m) for m in moves)) if moves else set()
+        if len(common) < MIN_OBSERVATIONS:
+            logger.warning(f"Simulation: {len(common)} common daily curve move(s) in the history "
+                           f"(need {MIN_OBSERVATIONS}) - using default volatilities and correlations")
+            return cls.default(commodities)
+        days = sorted(common)
+        samples = np.hstack([np.array([m[day] for day in days]) for m in moves])
+        return cls(commodities, np.cov(samples, rowvar=False), 'history', len(days))
+
+    def cholesky(self) -> np.ndarray:
+        """Lower-triangular factor of the covariance, nudged to positive
+        definite if estimation left it singular"""
+        covariance = (self.covariance + self.covariance.T) / 2
+        jitter = 1e-12 * max(np.trace(covariance) / len(covariance), 1e-12)
+        for _ in range(10):
+            try:
+                return np.linalg.cholesky(covariance + jitter * np.eye(len(covariance)))
+            except np.linalg.LinAlgError:
+                jitter *= 10
+        values, vectors = np.linalg.eigh(covariance)
+        return vectors * np.sqrt(np.clip(values, 0, None))
+
+    def to_dict(self) -> Dict:
+        k = len(FACTORS)
+        vols = np.sqrt(np.diag(self.covariance) * TRADING_DAYS)
+        parallel = [i * k for i in range(len(self.commodities))]
+        std = np.sqrt(np.diag(self.covariance)[parallel])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            correlation = self.covariance[np.ix_(parallel, parallel)] / np.outer(std, std)
+        return {
+            "source": self.source,
+            "observations": self.observations,
+            "annual_vols": {c: {f: round(float(vols[i * k + j]), 4) for j, f in enumerate(FACTORS)}
+                            for i, c in enumerate(self.commodities)},
+            "parallel_correlation": {a: {b: round(float(correlation[i, j]), 3)
+                                         for j, b in enumerate(self.commodities)}
+                                     for i, a in enumerate(self.commodities)}
+        }
+
+
+def factor_moves(history: CurveHistory) -> Dict[int, np.ndarray]:
+    """{day: (3,) factor move} between consecutive snapshots of history,
+    per trading day elapsed (a move over n days is scaled by 1/sqrt(n))"""
+    moves = {}
+    ordinals = history.first_month + np.arange(history.prices.shape[1])
+    for t in range(1, len(history)):
+        before, after = history.prices[t - 1].astype(float), history.prices[t].astype(float)
+        both = ~np.isnan(before) & ~np.isnan(after) & (before > 0) & (after > 0)
+        if both.sum() <= len(FACTORS):
+            continue
+        front = int(ordinals[np.flatnonzero(~np.isnan(before))[0]])
+        basis = shock_basis(ordinals[both], front)
+        change = np.log(after[both] / before[both])
+        coefficients = np.linalg.lstsq(basis.T, change, rcond=None)[0]
+        gap = np.busday_count(date.fromordinal(int(history.days[t - 1])), date.fromordinal(int(history.days[t])))
+        if gap > 0:
+            moves[int(history.days[t])] = coefficients / np.sqrt(gap)
+    return moves
+
+
+class SimulationSpec(NamedTuple):
+    """What a shard needs to simulate book P&L paths (sent to worker processes)"""
+    cholesky: np.ndarray                          # (factors x factors) daily
+    bases: Tuple[np.ndarray, ...]                 # per commodity (3 x months)
+    drifts: Tuple[np.ndarray, ...]                # per commodity (months,) daily log drift
+    exposures: Tuple[np.ndarray, ...]             # per commodity (months,) P&L of a +100% move
+    horizons: Tuple[int, ...]
+
+
+def simulate_shard(spec: SimulationSpec, paths: int, seed: np.random.SeedSequence) -> Tuple[np.ndarray, np.ndarray]:
+    """(paths x horizons) book P&L at each horizon, and the lowest P&L
+    reached on each path up to that horizon"""
+    rng = np.random.default_rng(seed)
+    days = max(spec.horizons)
+    at = np.asarray(spec.horizons) - 1
+    k = len(FACTORS)
+    pnl = np.empty((paths, len(at)))
+    low = np.empty((paths, len(at)))
+    for start in range(0, paths, BATCH_PATHS):
+        n = min(BATCH_PATHS, paths - start)
+        shocks = rng.standard_normal((n, days, len(spec.cholesky))) @ spec.cholesky.T
+        factors = np.cumsum(shocks, axis=1)
+        path_pnl = np.zeros((n, days))
+        for c, (basis, drift, exposure) in enumerate(zip(spec.bases, spec.drifts, spec.exposures)):
+            log_moves = factors[:, :, c * k:(c + 1) * k] @ basis - drift * np.arange(1, days + 1)[:, None]
+            path_pnl += np.expm1(log_moves) @ exposure
+        pnl[start:start + n] = path_pnl[:, at]
+        low[start:start + n] = np.minimum.accumulate(path_pnl, axis=1)[:, at]
+    return pnl, low
+
+
+class MarginAtRisk(NamedTuple):
+    """Simulated book P&L per horizon and what it implies for margin"""
+    horizons: Tuple[int, ...]
+    pnl: np.ndarray                   # (paths x horizons)
+    low: np.ndarray                   # (paths x horizons) lowest P&L to date
+    gross_notional: float
+    model: FactorModel
+    seed: int
+
+    def to_dict(self) -> Dict:
+        def money(value) -> float:
+            return round(float(value), 2)
+
+        horizons = []
+        for h, horizon in enumerate(self.horizons):
+            losses = -self.pnl[:, h]
+            entry = {"days": horizon, "mean_pnl": money(self.pnl[:, h].mean())}
+            for level in CONFIDENCE_LEVELS:
+                var = np.quantile(losses, level)
+                tag = f"{level * 100:g}"
+                entry[f"var_{tag}"] = money(var)
+                entry[f"es_{tag}"] = money(losses[losses >= var].mean())
+            entry["margin_call_probability"] = {
+                f"{buffer * 100:g}%": round(float(np.mean(self.low[:, h] < -buffer * self.gross_notional)), 5)
+                for buffer in MARGIN_BUFFERS
+            }
+            horizons.append(entry)
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "paths": len(self.pnl),
+            "seed": self.seed,
+            "gross_notional": money(self.gross_notional),
+            "margin_buffers": "margin call = loss to date above this share of gross notional",
+            "horizons": horizons,
+            "model": self.model.to_dict()
+        }
+
+
+def simulate(curves: Dict[str, ForwardCurve], exposures: Dict[str, np.ndarray], model: FactorModel,
+             paths: int = DEFAULT_PATHS, horizons: Sequence[int] = DEFAULT_HORIZONS,
+             seed: int = DEFAULT_SEED, workers: Optional[int] = None,
+             gross_notional: float = 0.0) -> MarginAtRisk:
+    """Simulate book P&L paths for the model's commodities.
+
+    exposures is the book's net monthly exposure per commodity on curves
+    (BookRevaluer.net_exposure). Shards run on workers processes (all cores
+    by default; 1 runs in this process).
+    """
+    if paths <= 0:
+        raise ValueError(f"paths must be positive, got {paths}")
+    horizons = tuple(sorted(set(int(h) for h in horizons)))
+    if not horizons or horizons[0] <= 0:
+        raise ValueError(f"horizons must be one or more positive day counts, got {list(horizons)}")
+    daily = model.covariance
+    k = len(FACTORS)
+    bases, drifts, book = [], [], []
+    for c, commodity in enumerate(model.commodities):
+        curve = curves[commodity]
+        basis = shock_basis(curve.calendar.ordinals, curve.calendar.first_ordinal)
+        block = daily[c * k:(c + 1) * k, c * k:(c + 1) * k]
+        bases.append(basis)
+        # Martingale drift: each month's expected price stays at today's forward
+        drifts.append(0.5 * np.einsum('im,ij,jm->m', basis, block, basis))
+        book.append(np.nan_to_num(exposures.get(commodity, np.zeros(len(curve)))))
+    spec = SimulationSpec(model.cholesky(), tuple(bases), tuple(drifts), tuple(book), horizons)
+
+    sizes = [SHARD_PATHS] * (paths // SHARD_PATHS) + ([paths % SHARD_PATHS] if paths % SHARD_PATHS else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = min(workers or os.cpu_count() or 1, len(sizes))
+    if workers <= 1:
+        shards = [simulate_shard(spec, size, shard_seed) for size, shard_seed in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shards = list(pool.map(simulate_shard, [spec] * len(sizes), sizes, seeds))
+    pnl = np.vstack([shard[0] for shard in shards])
+    low = np.vstack([shard[1] for shard in shards])
+    logger.info(f"Simulated {paths} path(s) over {max(horizons)} day(s) in {len(sizes)} shard(s) "
+                f"on {workers} worker(s)")
+    return MarginAtRisk(horizons, pnl, low, gross_notional, model, seed)
+
+
+def simulate_book(positions: List[Position], store: CurveSnapshotStore,
+                  commodities: Sequence[str] = SIMULATED_COMMODITIES, **kwargs) -> MarginAtRisk:
+    """Margin-at-risk of positions on the latest stored curves; positions in
+    other commodities or outside the curves are left out"""
+    curves = latest_curves(store, commodities)
+    simulated = [c for c in commodities if c in curves]
+    if not simulated:
+        raise ValueError(f"No stored curves for {', '.join(commodities)}")
+    left_out = sum(1 for p in positions if p.commodity not in simulated)
+    if left_out:
+        logger.info(f"Simulation: {left_out} position(s) outside {', '.join(simulated)} left out")
+    positions = [p for p in positions if p.commodity in simulated]
+    revaluer = BookRevaluer(positions, curves)
+    volumes = np.array([p.volume for p in positions])
+    gross = float(np.nansum(np.abs(volumes * revaluer.price))) if positions else 0.0
+    return simulate(curves, revaluer.net_exposure(), FactorModel.estimate(store, simulated),
+                    gross_notional=gross, **kwargs)
+
+
+def _positive_int(text: str) -> int:
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an integer: {text!r}")
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be positive, got {value}")
+    return value
+
+
+def _horizons(text: str) -> List[int]:
+    horizons = [_positive_int(h.strip()) for h in text.split(',') if h.strip()]
+    if not horizons:
+        raise argparse.ArgumentTypeError("at least one horizon is required")
+    return horizons
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo VaR and margin-at-risk of the position book")
+    parser.add_argument('book', nargs='?', type=Path, default=BOOK_FILE)
+    parser.add_argument('--paths', type=_positive_int, default=DEFAULT_PATHS)
+    parser.add_argument('--horizons', type=_horizons, default=list(DEFAULT_HORIZONS),
+                        help="comma-separated horizons in trading days")
+    parser.add_argument('--workers', type=_positive_int, help="worker processes (default: all cores)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--output', type=Path, default=MARGIN_AT_RISK_FILE)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    try:
+        result = simulate_book(load_book(args.book), CurveSnapshotStore(), paths=args.paths,
+                               horizons=args.horizons,
+                               seed=args.seed, workers=args.workers)
+    except ValueError as e:
+        logger.error(f"Simulation not run: {e}")
+        return
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result.to_dict(), f, indent=2)
+    logger.info(f"Margin-at-risk saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Per-source circuit breakers and latency history, persisted between runs
+A source that keeps failing is skipped without waiting for its timeout, with
+an occasional half-open probe; timeouts follow each source's observed latency.
+"""
+
+import json
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+HEALTH_FILE = Path(__file__).parent / "source_health.json"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a request to a source whose breaker is open"""
+
+
+def source_key(url: str) -> str:
+    """Sources are identified by scheme, host and path - query strings (symbols,
+    date ranges) vary per request but hit the same endpoint"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+class SourceHealth:
+    """Success, latency and failure history for every source URL.
+
+    Breaker states: 'closed' (requests flow), 'open' (requests are refused
+    until the cool-down passes) and 'half_open' (one probe request is let
+    through; success closes the breaker, failure re-opens it with a doubled
+    cool-down). A probe that is interrupted, or gives no verdict within
+    PROBE_TIMEOUT, puts the breaker back to 'open' so the next request can
+    probe again. The history is written to source_health.json by save();
+    'half_open' belongs to one process and is never persisted.
+    """
+
+    FAILURE_THRESHOLD = 3          # consecutive failures that open the breaker
+    COOLDOWN = 3600                # first open period, seconds
+    MAX_COOLDOWN = 24 * 3600
+    PROBE_TIMEOUT = 120            # seconds a half-open probe may take to settle
+    HISTORY = 50                   # latency samples kept per source
+    MIN_SAMPLES = 5                # before this, callers' default timeouts apply
+    TIMEOUT_FACTOR = 2.0           # adaptive timeout = p95 latency x factor
+    MIN_TIMEOUT = 3.0
+    MAX_TIMEOUT = 30.0
+
+    def __init__(self, path: Path = HEALTH_FILE):
+        self.path = Path(path)
+        self.sources: Dict[str, Dict[str, Any]] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    sources = json.load(f)
+                # Files written before half_open was kept out of them
+                for source in sources.values():
+                    if source.get('state') == 'half_open':
+                        source['state'] = 'open'
+                return sources
+            except Exception as e:
+                logger.warning(f"Failed to load source health history: {e}")
+        return {}
+
+    def save(self):
+        """Write the history to disk if anything changed"""
+        if not self._dirty:
+            return
+        try:
+            # A probe in flight is this process's business: persist it as open
+            sources = {key: dict(source, state='open') if source['state'] == 'half_open' else source
+                       for key, source in self.sources.items()}
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(sources, f, indent=2)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Failed to save source health history: {e}")
+
+    def _source(self, url: str) -> Dict[str, Any]:
+        return self.sources.setdefault(source_key(url), {
+            'state': 'closed',
+            'successes': 0,
+            'failures': 0,
+            'consecutive_failures': 0,
+            'cooldown': self.COOLDOWN,
+            'opened_at': None,
+            'latencies': [],
+            'last_success': None,
+            'last_error': None
+        })
+
+    # ------------------------------------------------------------- breaker
+    def check(self, url: str):
+        """Raise CircuitOpenError unless a request to url may go ahead now"""
+        source = self._source(url)
+        if source['state'] == 'closed':
+            return
+        if source['state'] == 'half_open':
+            if time.time() - source.get('probe_started', 0) < self.PROBE_TIMEOUT:
+                raise CircuitOpenError(f"{source_key(url)}: probe already in flight")
+            logger.warning(f"Probe of {source_key(url)} never settled - probing again")
+            source['state'] = 'open'
+        waited = time.time() - (source['opened_at'] or 0)
+        if waited < source['cooldown']:
+            raise CircuitOpenError(f"{source_key(url)}: breaker open for another "
+                                   f"{(source['cooldown'] - waited) / 60:.0f} min")
+        # Cool-down over: let exactly one probe through
+        source['state'] = 'half_open'
+        source['probe_started'] = time.time()
+        logger.info(f"Circuit half-open, probing {source_key(url)}")
+
+    def release(self, url: str):
+        """The request to url ended without a verdict (cancelled, or cut by the
+        run deadline): a half-open breaker goes back to open, cool-down unchanged,
+        so the next request probes again"""
+        source = self._source(url)
+        if source['state'] == 'half_open':
+            source['state'] = 'open'
+            logger.info(f"Probe of {source_key(url)} interrupted - breaker back to open")
+
+    def record_success(self, url: str, latency: float):
+        source = self._source(url)
+        if source['state'] != 'closed':
+            logger.info(f"Circuit closed for {source_key(url)} after successful probe")
+        source.update(state='closed', consecutive_failures=0, cooldown=self.COOLDOWN, opened_at=None,
+                      last_success=datetime.now().isoformat())
+        source['successes'] += 1
+        self._add_latency(source, latency)
+        self._dirty = True
+
+    def record_failure(self, url: str, error: str, latency: Optional[float] = None,
+                       timed_out: bool = False):
+        source = self._source(url)
+        source['failures'] += 1
+        source['consecutive_failures'] += 1
+        source['last_error'] = f"{datetime.now().isoformat()} {error}"[:200]
+        if timed_out and latency is not None:
+            # A timeout is a lower bound on latency; keeping it lets p95 grow
+            self._add_latency(source, latency)
+
+        if source['state'] == 'half_open':
+            source['cooldown'] = min(source['cooldown'] * 2, self.MAX_COOLDOWN)
+            self._open(url, source)
+        elif source['state'] == 'closed' and source['consecutive_failures'] >= self.FAILURE_THRESHOLD:
+            self._open(url, source)
+        self._dirty = True
+
+    def _open(self, url: str, source: Dict[str, Any]):
+        source['state'] = 'open'
+        source['opened_at'] = time.time()
+        logger.warning(f"Circuit open for {source_key(url)} after {source['consecutive_failures']} "
+                       f"consecutive failures - skipping for {source['cooldown'] / 60:.0f} min")
+
+    # ------------------------------------------------------------- latency
+    def _add_latency(self, source: Dict[str, Any], latency: float):
+        source['latencies'] = (source['latencies'] + [round(latency, 3)])[-self.HISTORY:]
+
+    def percentile(self, url: str, q: float) -> Optional[float]:
+        """q-th percentile (0-100) of recent latencies, None with too few samples"""
+        samples: List[float] = sorted(self._source(url)['latencies'])
+        if len(samples) < self.MIN_SAMPLES:
+            return None
+        rank = min(len(samples) - 1, max(0, int(round(q / 100 * (len(samples) - 1)))))
+        return samples[rank]
+
+    def timeout(self, url: str, default: float) -> float:
+        """Timeout for the next request: p95 x TIMEOUT_FACTOR once enough
+        samples exist, otherwise the caller's default"""
+        p95 = self.percentile(url, 95)
+        if p95 is None:
+            return default
+        return min(self.MAX_TIMEOUT, max(self.MIN_TIMEOUT, p95 * self.TIMEOUT_FACTOR))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Batched Yahoo Finance chart client
+Fetches many symbols in one concurrent pass and parses the chart JSON
+directly - no yfinance, no pandas.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?interval={interval}&range={range}"
+CHART_PERIOD_URL = ("https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+                    "?interval={interval}&period1={period1}&period2={period2}")
+
+
+class QuoteSeries(NamedTuple):
+    """Close prices for one symbol, oldest first, with missing bars dropped"""
+    symbol: str
+    timestamps: Tuple[int, ...]  # unix seconds
+    closes: Tuple[float, ...]
+    currency: str = ''
+
+    @property
+    def last(self) -> Optional[float]:
+        return self.closes[-1] if self.closes else None
+
+    @property
+    def previous(self) -> Optional[float]:
+        return self.closes[-2] if len(self.closes) >= 2 else None
+
+
+def parse_chart(symbol: str, content: str) -> Optional[QuoteSeries]:
+    """Parse a v8/finance/chart response into a QuoteSeries"""
+    try:
+        result = json.loads(content)['chart']['result'][0]
+        timestamps = result.get('timestamp') or []
+        closes = result['indicators']['quote'][0].get('close') or []
+        currency = result.get('meta', {}).get('currency', '') or ''
+    except (ValueError, KeyError, IndexError, TypeError) as e:
+        logger.warning(f"Yahoo chart for {symbol} not parseable: {e}")
+        return None
+
+    points = [(int(t), float(c)) for t, c in zip(timestamps, closes) if c is not None and c == c]
+    if not points:
+        return None
+    return QuoteSeries(
+        symbol=symbol,
+        timestamps=tuple(t for t, _ in points),
+        closes=tuple(c for _, c in points),
+        currency=currency
+    )
+
+
+class YahooChartClient:
+    """Fetch Yahoo chart series for a batch of symbols concurrently.
+
+    fetch_text is the caller's transport (normally DataFetcher.fetch_url), so
+    requests pick up the shared session, validator cache and urllib fallback.
+    With concurrency set, at most that many requests are in flight at once.
+    """
+
+    def __init__(self, fetch_text: Callable[[str, int], Awaitable[Optional[str]]],
+                 concurrency: Optional[int] = None):
+        self.fetch_text = fetch_text
+        self.limit = asyncio.Semaphore(concurrency) if concurrency else None
+
+    async def fetch(self, symbols: Iterable[str], range_: str = "5d",
+                    interval: str = "1d", timeout: int = 10,
+                    since: Optional[Dict[str, Optional[int]]] = None) -> Dict[str, Optional[QuoteSeries]]:
+        """Return {symbol: QuoteSeries or None} for every requested symbol.
+
+        since maps a symbol to the unix timestamp of its last stored bar; those
+        symbols only request bars from that point on, the rest get range_.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        since = since or {}
+        results = await asyncio.gather(
+            *(self._fetch_symbol(symbol, range_, interval, timeout, since.get(symbol)) for symbol in symbols)
+        )
+        return dict(zip(symbols, results))
+
+    async def _fetch_symbol(self, symbol: str, range_: str, interval: str,
+                            timeout: int, period1: Optional[int] = None) -> Optional[QuoteSeries]:
+        if period1:
+            url = CHART_PERIOD_URL.format(symbol=symbol, interval=interval,
+                                          period1=int(period1), period2=int(time.time()))
+        else:
+            url = CHART_URL.format(symbol=symbol, interval=interval, range=range_)
+        try:
+            if self.limit:
+                async with self.limit:
+                    content = await self.fetch_text(url, timeout)
+            else:
+                content = await self.fetch_text(url, timeout)
+        except Exception as e:
+            logger.warning(f"Yahoo chart fetch failed for {symbol}: {e}")
+            return None
+        if not content:
+            return None
+        return parse_chart(symbol, content)